@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from jsonschema import ValidationError
 
 
 class TranslationError(ValueError):
@@ -7,3 +8,32 @@ class TranslationError(ValueError):
 
 class SchemaError(ValueError):
     pass
+
+
+class ContentValidationError(ValidationError):
+    """
+    Errors of all the invalid rows of a survey, as a list of
+    `(row number, jsonschema.ValidationError)` tuples.
+
+    It is also the `jsonschema.ValidationError` of the first invalid row,
+    with the same `message`, `path`, etc., as raised by `jsonschema.validate()`
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        _, first_error = errors[0]
+        super().__init__(
+            first_error.message,
+            validator=first_error.validator,
+            path=first_error.path,
+            schema_path=first_error.schema_path,
+            instance=first_error.instance,
+            validator_value=first_error.validator_value,
+            schema=first_error.schema,
+        )
+
+    def __str__(self):
+        return '\n'.join(
+            'row {}: {}'.format(row_number, error.message)
+            for row_number, error in self.errors
+        )
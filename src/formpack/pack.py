@@ -9,9 +9,18 @@ from formpack.schema.fields import CopyField
 from .version import FormVersion, AnalysisForm
 from .reporting import Export, AutoReport
 from .utils.expand_content import expand_content
+from .utils.field_merge import FieldMerge
+from .utils.ordered_collection import LRUDict
 from .utils.replace_aliases import replace_aliases
+from .utils.xform_tools import XFormCache
 from .constants import UNSPECIFIED_TRANSLATION
 
+# Number of version ranges whose merged fields are kept by a `FormPack`
+FIELDS_CACHE_SIZE = 8
+# Number of merged choice lists kept by a `FormPack` for merged fields to
+# share them
+MERGED_CHOICES_CACHE_SIZE = 1024
+
 
 class FormPack:
     def __init__(
@@ -25,6 +34,7 @@ class FormPack:
         asset_type=None,
         submissions_xml=None,
         default_image_max_pixels=None,
+        xform_cache=None,
     ):
         """
         :param versions: list. Versions of the asset. It must be sorted in ascending order. From oldest to newest.
@@ -32,6 +42,10 @@ class FormPack:
         :param id_string: The human readable id of the form.
         :param default_version_id_key: string. The name of the field in submissions which stores the version ID
         :param default_image_max_pixels: string. (numeric) When not None, questions type=image get assigned max-pixels parameter
+        :param xform_cache: Cache of the XForms compiled by
+            `FormVersion.to_xml()`. Defaults to a new in-memory `XFormCache`
+            for this form pack; pass the same cache to several form packs
+            for them to share their compiled XForms.
         """
         # @TODO: Complete the signature for __init__
 
@@ -43,6 +57,9 @@ class FormPack:
             versions = [versions]
 
         self.versions = OrderedDict()
+        # Same versions, by index, to resolve negative or positive indexes
+        # without copying `self.versions`
+        self._version_list = []
 
         # the name of the field in submissions which stores the version ID
         self.default_version_id_key = default_version_id_key
@@ -50,6 +67,9 @@ class FormPack:
         self.id_string = id_string
         self.root_node_name = root_node_name
         self.default_image_max_pixels = default_image_max_pixels
+        if xform_cache is None:
+            xform_cache = XFormCache()
+        self.xform_cache = xform_cache
 
         self.title = title
         self.strict_schema = strict_schema
@@ -58,6 +78,24 @@ class FormPack:
 
         self.analysis_form = None
 
+        # Choice lists of all the versions, by content hash, so that versions
+        # with the same choices share them (see `FormChoice`)
+        self.shared_choices = {}
+        # Choice lists merged by `_combine_field_choices()`, so that fields
+        # sharing choice lists also share their merged lists
+        self._merged_choices = LRUDict(MERGED_CHOICES_CACHE_SIZE)
+
+        # Merged fields returned by `get_fields_for_versions()`, as
+        # `(fields, copy fields)` tuples by version ids
+        self._fields_cache = LRUDict(FIELDS_CACHE_SIZE)
+        # Merges of the fields of versions, by version ids, to be extended
+        # with the fields of the next version (see `_merge_fields()`)
+        self._field_merges = LRUDict(FIELDS_CACHE_SIZE)
+        # Version id keys and translations of all the versions, updated
+        # every time a version is loaded
+        self._version_id_keys = []
+        self._translations = []
+
         self.load_all_versions(versions)
 
     # FIXME: Find a safe way to use this. Wrapping with try/except isn't enough
@@ -70,21 +108,11 @@ class FormPack:
         # if no parameter is passed, default to 'all'
         if _versions is None:
             _versions = self.versions
-        _id_keys = []
-        for version in self.versions.values():
-            _id_key = version.version_id_key
-            if _id_key not in _id_keys:
-                _id_keys.append(_id_key)
-        return _id_keys
+        return list(self._version_id_keys)
 
     @property
     def available_translations(self):
-        translations = []
-        for version in self.versions.values():
-            for translation in version.translations:
-                if translation not in translations:
-                    translations.append(translation)
-        return translations
+        return list(self._translations)
 
     def lookup(self, prop, default=None):
         # can't use a one liner because sometimes self.prop is None
@@ -96,7 +124,7 @@ class FormPack:
     def __getitem__(self, index):
         try:
             if isinstance(index, int):
-                return tuple(self.versions.values())[index]
+                return self._version_list[index]
             else:
                 return self.versions[index]
         except KeyError:
@@ -116,6 +144,17 @@ class FormPack:
         # returns stats in the format [ key="value" ]
         return '\n\t'.join('%s="%s"' % item for item in _stats.items())
 
+    def load_submissions_xml(self, xml, version=-1, instance_tag=None):
+        """
+        Stream the submissions of one version from instance XML, see
+        `FormVersion.load_submissions_xml()`.
+
+        :param version: int or str. Index or id of the version, the newest
+            one by default
+        :return: iterator of dicts
+        """
+        return self[version].load_submissions_xml(xml, instance_tag)
+
     def load_all_versions(self, versions):
         for schema in versions:
             self.load_version(deepcopy(schema))
@@ -180,7 +219,29 @@ class FormPack:
         if form_version.title and not self.title:
             self.title = form_version.version_title
 
+        self._clear_fields_cache()
         self.versions[form_version.id] = form_version
+        self._version_list.append(form_version)
+
+        if form_version.version_id_key not in self._version_id_keys:
+            self._version_id_keys.append(form_version.version_id_key)
+        for translation in form_version.translations:
+            if translation not in self._translations:
+                self._translations.append(translation)
+
+    def _clear_fields_cache(self):
+        """
+        Forget merged fields before a new version is loaded, but the merge
+        of all the versions loaded so far, to merge the fields of the new
+        one incrementally
+        """
+        version_ids = tuple(self.versions)
+        field_merge = self._field_merges.get(version_ids)
+        self._fields_cache.clear()
+        self._field_merges.clear()
+        self._merged_choices.clear()
+        if field_merge is not None:
+            self._field_merges[version_ids] = field_merge
 
     def extend_survey(self, analysis_form: Dict) -> None:
         self.analysis_form = AnalysisForm(self, analysis_form)
@@ -203,8 +264,7 @@ class FormPack:
             out.append(line)
         return ''.join(out)
 
-    @staticmethod
-    def _combine_field_choices(old_field, new_field):
+    def _combine_field_choices(self, old_field, new_field):
         """
         Update `new_field.choice` so that it contains everything from
         `old_field.choice`. In the event of a conflict, `new_field.choice`
@@ -217,7 +277,7 @@ class FormPack:
         try:
             old_choice = old_field.choice
             new_choice = new_field.choice
-            new_field.merge_choice(old_choice)
+            new_field.merge_choice(old_choice, self._merged_choices)
         except AttributeError:
             pass
 
@@ -245,104 +305,61 @@ class FormPack:
             if isinstance(data_types, str):
                 data_types = [data_types]
 
-        # tmp2 is a 2 dimensions list of `field`.
-        # First dimension is the position of fields where they should be in the latest version
-        # Second dimension is their position in the stack at the same position.
-        # For example:
-        #      ```
-        #      latest_version = [field1, field3]
-        #      version_just_before = [field2, field3]
-        #      ```
-        #
-        # Index 0 of tmp2d will be `[field1, field2]`
-        tmp2d = []
-        # This dict is used to remember final position of each field. Its keys
-        # are the combination of field and section names and the values are
-        # tuples of coordinates in tmp2d.
-        # Keeping example above:
-        #       `positions[f'{section.name}_{field1.name}']` would be `(0, 0)`
-        #       `positions[f'{section.name}_{field2.name}']` would be `(0, 1)`
-        positions = {}
-
-        # Create the initial field mappings from the first form version
-        versions_desc = list(reversed(self._get_versions(versions).values()))
-
-        # Copy fields need to be pushed at the end. So let's process them separately.
-        copy_fields = []
-        index = 0
-        for section in versions_desc[0].sections.values():
-            for field_name, field_object in section.fields.items():
-                section_field_name = f'{section.name}_{field_name}'
-                if isinstance(field_object, CopyField):
-                    copy_fields.append(field_object)
-                else:
-                    positions[section_field_name] = (index, 0)
-                    tmp2d.append([field_object])
-                    index += 1
-
-        for version in versions_desc[1:]:
-            index = 0
-            for section_name, section in version.sections.items():
-                for field_name, field_object in section.fields.items():
-                    section_field_name = f'{section_name}_{field_name}'
-                    if not isinstance(field_object, CopyField):
-                        if section_field_name in positions:
-                            position = positions[section_field_name]
-                            latest_field_object = tmp2d[position[0]][
-                                position[1]
-                            ]
-                            # Because versions_desc are ordered from latest to oldest,
-                            # we use current field object as the old one and the one already
-                            # in position as the latest one.
-                            new_object = self._combine_field_choices(
-                                field_object, latest_field_object
-                            )
-                            tmp2d[position[0]][position[1]] = new_object
-                        else:
-                            try:
-                                current_index_list = tmp2d[index]
-                                current_index_list.append(field_object)
-                            except IndexError:
-                                tmp2d.append([field_object])
-                                # set index with upper bound of the tmp2d list
-                                # in case index is greater than it.
-                                # it can happen when current version has more items than newest one.
-                                index = len(tmp2d) - 1
-
-                            positions[section_field_name] = (
-                                index,
-                                len(tmp2d[index]) - 1,
-                            )
-
-                        index += 1
-
-        all_fields = []
-
-        # We need to flatten the 2d list before returning it.
-        # First, we want to show existing fields (index 0 of each dimension)
-        for first_dimension in tmp2d:
-            field = first_dimension[0]
-            if data_types:
-                if field.data_type in data_types:
-                    all_fields.append(field)
-                    first_dimension.pop(0)
-            else:
-                all_fields.append(field)
-                first_dimension.pop(0)
-
-        # Then flatten tmp2d
-        for first_dimension in tmp2d:
-            for field in first_dimension:
-                if data_types:
-                    if field.data_type in data_types:
-                        all_fields.append(field)
-                else:
-                    all_fields.append(field)
-
-        # Finally, add copy fields at the end
-        all_fields += copy_fields
-
-        return all_fields
+        versions = self._get_versions(versions)
+        version_ids = tuple(versions)
+        merged_fields = self._fields_cache.get(version_ids)
+        if merged_fields is None:
+            merged_fields = self._fields_cache[version_ids] = (
+                self._merge_fields(versions)
+            )
+
+        all_fields, copy_fields = merged_fields
+        if data_types:
+            all_fields = [
+                field for field in all_fields if field.data_type in data_types
+            ]
+
+        # Finally, add copy fields of the newest version at the end
+        return all_fields + copy_fields
+
+    def _merge_fields(self, versions):
+        """
+        Merge the fields of `versions` for `get_fields_for_versions()`, in
+        the order documented in `formpack.utils.field_merge`.
+
+        The merge of the same versions but the newest one is reused when
+        there is one, e.g. after loading a new version, so that only the
+        fields of the newest version are merged again.
+
+        :param versions: OrderedDict. Versions by id, from oldest to newest
+        :return: tuple. The merged fields, and the copy fields of the newest
+            version
+        """
+        version_ids = tuple(versions)
+        field_merge = self._field_merges.pop(version_ids[:-1], None)
+        if field_merge is None:
+            field_merge = FieldMerge(self._combine_field_choices)
+            new_versions = list(versions.values())
+        else:
+            new_versions = [versions[version_ids[-1]]]
+
+        for version in new_versions:
+            field_merge.add_version(
+                ((section_name, field_name), field)
+                for section_name, section in version.sections.items()
+                for field_name, field in section.fields.items()
+                # Copy fields are added at the end
+                if not isinstance(field, CopyField)
+            )
+        self._field_merges[version_ids] = field_merge
+
+        copy_fields = [
+            field
+            for section in new_versions[-1].sections.values()
+            for field in section.fields.values()
+            if isinstance(field, CopyField)
+        ]
+        return field_merge.get_fields(), copy_fields
 
     def to_dict(self, **kwargs):
         out = {
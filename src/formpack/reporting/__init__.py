@@ -1,3 +1,3 @@
 # coding: utf-8
-from .autoreport import AutoReport
+from .autoreport import AutoReport, AutoReportPartial  # noqa
 from .export import Export  # noqa
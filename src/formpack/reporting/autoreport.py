@@ -1,11 +1,40 @@
 # coding: utf-8
 import logging
-from collections import defaultdict
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
 
 from ..constants import UNSPECIFIED_TRANSLATION
-from ..submission import FormSubmission
+from ..schema.fields import DateField, SubmissionTimeCopyField
+from ..utils.accumulators import (
+    DEFAULT_SKETCH_SIZE,
+    SplitAccumulator,
+    SplitterIndex,
+    accumulator_from_dict,
+)
+from ..utils.dates import parse_iso8601
+from ..utils.iterator import iter_repeat_instances
 from ..utils.ordered_collection import OrderedCounter
 
+# How answers to fields inside repeat groups are counted:
+# - once per instance of the repeat group;
+REPEAT_MODE_INSTANCE = 'instance'
+# - once per submission, each distinct value given in any of its instances
+#   being counted once.
+REPEAT_MODE_SUBMISSION = 'submission'
+REPEAT_MODES = (REPEAT_MODE_INSTANCE, REPEAT_MODE_SUBMISSION)
+
+# Periods of time a report can be bucketed by, with the function giving the
+# (ISO-8601) start of the period a date falls in
+BUCKET_INTERVALS = {
+    'day': lambda day: day.isoformat(),
+    # Weeks start on Mondays
+    'week': lambda day: (day - timedelta(days=day.weekday())).isoformat(),
+    'month': lambda day: day.isoformat()[:7],
+    'year': lambda day: day.isoformat()[:4],
+}
+
 
 class AutoReportStats:
     def __init__(
@@ -20,168 +49,468 @@ class AutoReportStats:
         return self.stats
 
 
+class AutoReportPartial:
+    """
+    Intermediate results of an `AutoReport`: one accumulator per field, and
+    the submission counts.
+
+    Partials computed over separate sets of submissions can be merged, e.g.
+    to build a report from sharded submissions or to update a cached report
+    with new submissions only. Merging partials in the order their
+    submissions were read gives exactly the same stats as reading all the
+    submissions at once.
+
+    A partial can be serialized to a JSON-compatible dict with `to_dict()`
+    and loaded back with `AutoReportPartial.from_dict()`.
+    """
+
+    def __init__(
+        self,
+        field_names,
+        metrics,
+        split_by=None,
+        submissions_count=0,
+        submission_counts_by_version=None,
+        splitters_rank=None,
+        splitter_index=None,
+        repeat_mode=REPEAT_MODE_INSTANCE,
+    ):
+        """
+        :param field_names: list. Names of the fields to get stats on, in
+            the order of the report.
+        :param metrics: dict. Accumulator of each field, by field name.
+        :param split_by: str. Name of the field the report is split by, if
+            any.
+        :param splitter_index: SplitterIndex. Shared by the accumulators of
+            a split report.
+        :param repeat_mode: str. How answers to fields inside repeat groups
+            are counted, see `REPEAT_MODES`.
+        """
+        self.field_names = list(field_names)
+        self.metrics = metrics
+        self.split_by = split_by
+        self.submissions_count = submissions_count
+        self.submission_counts_by_version = (
+            submission_counts_by_version or OrderedCounter()
+        )
+        # Only used when the report is split, to find the most used values
+        # of the `split_by` field
+        self.splitters_rank = splitters_rank or OrderedCounter()
+        self.splitter_index = splitter_index
+        self.repeat_mode = repeat_mode
+
+    def merge(self, other):
+        """
+        Add the results of `other` to this partial.
+
+        :param other: AutoReportPartial. A partial of the same report
+        :return: AutoReportPartial. This partial
+        """
+        if (
+            other.field_names != self.field_names
+            or other.split_by != self.split_by
+        ):
+            raise ValueError(
+                'Cannot merge partials of reports on different fields'
+            )
+        if other.repeat_mode != self.repeat_mode:
+            raise ValueError(
+                'Cannot merge partials of reports counting repeat groups '
+                'differently'
+            )
+
+        self.submissions_count += other.submissions_count
+        self.submission_counts_by_version.update(
+            other.submission_counts_by_version
+        )
+        self.splitters_rank.update(other.splitters_rank)
+        for field_name, accumulator in self.metrics.items():
+            accumulator.merge(other.metrics[field_name])
+
+        return self
+
+    def to_dict(self):
+        return {
+            'field_names': self.field_names,
+            'split_by': self.split_by,
+            'repeat_mode': self.repeat_mode,
+            'submissions_count': self.submissions_count,
+            'submission_counts_by_version': [
+                list(item)
+                for item in self.submission_counts_by_version.items()
+            ],
+            'splitters_rank': [
+                list(item) for item in self.splitters_rank.items()
+            ],
+            'metrics': {
+                field_name: accumulator.to_dict()
+                for field_name, accumulator in self.metrics.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data['split_by'] is None:
+            splitter_index = None
+            metrics = {
+                field_name: accumulator_from_dict(accumulator)
+                for field_name, accumulator in data['metrics'].items()
+            }
+        else:
+            # Accumulators of a split report share the same splitter indexes
+            splitter_index = SplitterIndex()
+            metrics = {
+                field_name: SplitAccumulator.from_dict(
+                    accumulator, splitter_index
+                )
+                for field_name, accumulator in data['metrics'].items()
+            }
+
+        return cls(
+            data['field_names'],
+            metrics,
+            split_by=data['split_by'],
+            submissions_count=data['submissions_count'],
+            submission_counts_by_version=OrderedCounter(
+                dict(map(tuple, data['submission_counts_by_version']))
+            ),
+            splitters_rank=OrderedCounter(
+                dict(map(tuple, data['splitters_rank']))
+            ),
+            splitter_index=splitter_index,
+            repeat_mode=data.get('repeat_mode', REPEAT_MODE_INSTANCE),
+        )
+
+
+def _get_repeat_paths(field):
+    """
+    Return the paths of the repeat groups `field` is in, from the outermost
+    one to the innermost one
+    """
+    repeat_paths = []
+    section = field.section
+    while section is not None and section.parent is not None:
+        repeat_paths.append(section.path)
+        section = section.parent
+    repeat_paths.reverse()
+    return tuple(repeat_paths)
+
+
+def _add_repeated_answers(
+    entry, path, repeat_paths, parse_values, accumulator, repeat_mode, *args
+):
+    """
+    Feed `accumulator` with the answers to a field inside repeat groups,
+    walking the instances of the groups in `entry` without flattening them.
+
+    :param args: Extra arguments of `accumulator.add()` and
+        `accumulator.add_missing()`, i.e. the splitter index of `entry` for
+        disaggregated reports.
+    """
+    per_submission = repeat_mode == REPEAT_MODE_SUBMISSION
+    # Distinct values of all the instances, in order of first appearance
+    submission_values = {}
+
+    for instance in iter_repeat_instances(entry, repeat_paths):
+        raw_value = instance.get(path)
+        if raw_value is None:
+            if not per_submission:
+                accumulator.add_missing(*args)
+            continue
+
+        try:
+            values = parse_values(raw_value)
+        except ValueError as e:
+            logging.warning(str(e), exc_info=True)
+            # Treat the bad value as a blank response
+            if not per_submission:
+                accumulator.add_missing(*args)
+        else:
+            if per_submission:
+                submission_values.update(dict.fromkeys(values))
+            else:
+                accumulator.add(values, *args)
+
+    if per_submission:
+        if submission_values:
+            accumulator.add(tuple(submission_values), *args)
+        else:
+            accumulator.add_missing(*args)
+
+
+# Report being computed by a worker process of
+# `AutoReport.get_partial(workers=...)`, and the options of
+# `AutoReport._read_submissions()`, set by `_init_worker()`
+_worker_state = {}
+
+
+def _init_worker(version_ids, version_id_keys, options):
+    # Workers only read submissions: they get the fields to read them with
+    # in `options`, but neither the form pack nor its versions
+    _worker_state.update(
+        autoreport=AutoReport(None, version_ids, version_id_keys),
+        options=options,
+    )
+
+
+def _get_chunk_partial(submissions):
+    autoreport = _worker_state['autoreport']
+    return autoreport._read_submissions(
+        submissions, **_worker_state['options']
+    )
+
+
 class AutoReport:
-    def __init__(self, formpack, form_versions):
+    # Number of submissions sent at once to each worker process
+    CHUNK_SIZE = 1000
+    # `multiprocessing` context the worker processes are started with,
+    # defaulting to the one of the platform
+    MP_CONTEXT = None
+
+    def __init__(self, formpack, form_versions, version_id_keys=None):
+        """
+        :param formpack: FormPack, or `None` for reports only reading
+            submissions with given fields, in worker processes
+        :param form_versions: dict. Versions of the report, by id
+        :param version_id_keys: list. Version id keys of the submissions,
+            defaulting to the ones of `formpack`
+        """
         self.formpack = formpack
         self.versions = form_versions
+        self._version_id_keys = version_id_keys
 
-    def _get_version_id_from_submission(self, submission):
+    def _get_version_id_from_submission(
+        self, submission, version_id_keys=None
+    ):
         """
         Get the version ID from the provided submission, or `None` if not found.
 
         :param dict submission: An individual data submission.
+        :param list version_id_keys: Optional. The version ID keys of the
+            form pack, to avoid looking them up for every submission.
         :rtype: str or NoneType
         """
-        version_id_keys = set(self.formpack.version_id_keys()).intersection(
-            set(submission.keys())
-        )
-        if len(version_id_keys) == 0:
+        if version_id_keys is None:
+            version_id_keys = self.formpack.version_id_keys()
+
+        found_keys = [key for key in version_id_keys if key in submission]
+        if len(found_keys) == 0:
             return None
-        elif len(version_id_keys) > 1:
+        elif len(found_keys) > 1:
             possible_versions_dict = {
-                v_id_ky: submission[v_id_ky] for v_id_ky in version_id_keys
+                v_id_ky: submission[v_id_ky] for v_id_ky in found_keys
             }
             raise ValueError(
                 f'Submission version ambiguous. '
                 f'Multiple possible version ID keys: {possible_versions_dict}'
             )
-        version_id_key = version_id_keys.pop()
 
-        version_id = submission.get(version_id_key)
-        return version_id
+        return submission.get(found_keys[0])
 
-    def _calculate_stats(self, submissions, fields, versions, lang):
+    def _get_fields(self, fields=(), split_by=None):
+        """
+        Return the fields to get stats on, and the field to split the report
+        by (or `None`)
+        """
+        all_fields = self.formpack.get_fields_for_versions(self.versions)
+        all_fields = [field for field in all_fields if field.has_stats]
+
+        fields = set(fields)
+        if not fields:
+            fields = all_fields
+        else:
+            fields.add(split_by)
+            fields = [field for field in all_fields if field.name in fields]
+
+        if not split_by:
+            return fields, None
+
+        try:
+            split_by_field = next(f for f in fields if f.name == split_by)
+        except StopIteration:
+            raise ValueError(
+                'No field matching name "%s" ' 'for split_by' % split_by
+            )
+
+        if _get_repeat_paths(split_by_field):
+            raise ValueError(
+                'Cannot split_by "%s", which is inside a repeat group'
+                % split_by
+            )
+
+        fields = [f for f in fields if f != split_by_field]
+        return fields, split_by_field
 
-        metrics = {field.name: OrderedCounter() for field in fields}
+    @staticmethod
+    def _get_readers(fields, metrics):
+        """
+        Resolve, once per report, what is needed to read the answers to each
+        field: its path, the paths of the repeat groups it is in, its value
+        parser and its accumulator
+        """
+        return [
+            (
+                field.path,
+                _get_repeat_paths(field),
+                field.parse_values,
+                metrics[field.name],
+            )
+            for field in fields
+        ]
 
-        submissions_count = 0
-        submission_counts_by_version = OrderedCounter()
+    def _iter_submissions(self, submissions):
+        """
+        Yield `(version_id, submission)` for each submission of the versions
+        of the report, skipping the others
+        """
+        versions = self.versions
+        version_id_keys = self._version_id_keys
+        if version_id_keys is None:
+            version_id_keys = self.formpack.version_id_keys()
 
         for entry in submissions:
+            version_id = self._get_version_id_from_submission(
+                entry, version_id_keys
+            )
+            if version_id in versions:
+                yield version_id, entry
 
-            version_id = self._get_version_id_from_submission(entry)
-            if version_id not in versions:
-                continue
+    def _get_submission_reader(self, fields, split_by_field, partial):
+        """
+        Return a function `read(entry, version_id)` adding the answers of one
+        submission to `partial`
+        """
+        if split_by_field:
+            return self._get_disaggregated_stats_reader(
+                fields, split_by_field, partial
+            )
+        return self._get_stats_reader(fields, partial)
 
-            submissions_count += 1
-            submission_counts_by_version[version_id] += 1
+    def _get_stats_reader(self, fields, partial):
 
-            # TODO: do we really need FormSubmission ?
-            entry = FormSubmission(entry).data
-            for field in fields:
-                if field.has_stats:
-                    counter = metrics[field.name]
-                    raw_value = entry.get(field.path)
-                    if raw_value is not None:
-                        try:
-                            values = list(field.parse_values(raw_value))
-                        except ValueError as e:
-                            # TODO: Remove try/except when
-                            # https://github.com/kobotoolbox/formpack/issues/151
-                            # is fixed?
-                            logging.warning(str(e), exc_info=True)
-                            # Treat the bad value as a blank response
-                            counter[None] += 1
-                        else:
-                            counter.update(values)
-                            counter['__submissions__'] += 1
-                    else:
-                        counter[None] += 1
-
-        def stats_generator():
-            for field in fields:
-                yield (
-                    field,
-                    field.get_labels(lang)[0],
-                    field.get_stats(metrics[field.name], lang=lang),
-                )
+        # Resolve everything the reader needs once, so that each submission
+        # is processed in a single pass over this list
+        readers = self._get_readers(fields, partial.metrics)
+        repeat_mode = partial.repeat_mode
+        submission_counts_by_version = partial.submission_counts_by_version
 
-        return AutoReportStats(
-            self,
-            stats_generator(),
-            submissions_count,
-            submission_counts_by_version,
-        )
+        def read(entry, version_id):
+            partial.submissions_count += 1
+            submission_counts_by_version[version_id] += 1
 
-    def _disaggregate_stats(
-        self, submissions, fields, versions, lang, split_by_field
-    ):
+            for path, repeat_paths, parse_values, accumulator in readers:
+                if repeat_paths:
+                    _add_repeated_answers(
+                        entry,
+                        path,
+                        repeat_paths,
+                        parse_values,
+                        accumulator,
+                        repeat_mode,
+                    )
+                    continue
+
+                raw_value = entry.get(path)
+                if raw_value is None:
+                    accumulator.add_missing()
+                    continue
+
+                try:
+                    values = parse_values(raw_value)
+                except ValueError as e:
+                    # TODO: Remove try/except when
+                    # https://github.com/kobotoolbox/formpack/issues/151
+                    # is fixed?
+                    logging.warning(str(e), exc_info=True)
+                    # Treat the bad value as a blank response
+                    accumulator.add_missing()
+                else:
+                    accumulator.add(values)
+
+        return read
+
+    def _get_disaggregated_stats_reader(self, fields, split_by_field, partial):
 
         # We want only the most used values so we build a separate counter
         # for it to filter them
-        splitters_rank = OrderedCounter()
-        # Extract the split_by field from the values to get stats on
-
-        # total number of submissions
-        submissions_count = 0
-        submission_counts_by_version = OrderedCounter()
+        splitters_rank = partial.splitters_rank
 
-        fields = [f for f in fields if f != split_by_field]
+        submission_counts_by_version = partial.submission_counts_by_version
 
-        # Then we map fields, values and splitters:
+        # Then we map fields, values and splitters (see `SplitAccumulator`):
         #          {field_name1: {
-        #                  'value1': OrderedCounter(
-        #                      (splitter1, x),
-        #                      (splitter2, y)
+        #                  'value1': {
+        #                      splitter1_index: x,
+        #                      splitter2_index: y,
         #                       ...
-        #                  ),
+        #                  },
         #                  value2: ...
         #              },
         #              field_name2...},
         #         ...}
         #
-        metrics = {f.name: defaultdict(OrderedCounter) for f in fields}
-
-        for sbmssn in submissions:
-
-            # Skip unrequested versions
-            version_id = self._get_version_id_from_submission(sbmssn)
-            if version_id not in versions:
-                continue
-
+        # All the accumulators share the same `SplitterIndex`, so each
+        # splitter is looked up once per submission.
+        get_splitter_index = partial.splitter_index.get_index
+        readers = self._get_readers(fields, partial.metrics)
+        repeat_mode = partial.repeat_mode
+        split_by_path = split_by_field.path
+        parse_splitter = split_by_field.parse_values
+
+        def read(entry, version_id):
             # TODO: change this to use __version__
 
-            submissions_count += 1
-            submission_counts_by_version.update([version_id])
-
-            # TODO: do we really need FormSubmission ?
-
-            # since we are going to pop one entry, we make a copy
-            # of it to avoid side effect
-            entry = dict(FormSubmission(sbmssn).data)
-            splitter = entry.pop(split_by_field.path, None)
-
-            for field in fields:
-
-                if field.has_stats:
-
-                    raw_value = entry.get(field.path)
-
-                    if raw_value is not None:
-                        values = field.parse_values(raw_value)
-                    else:
-                        values = (None,)
-
-                    value_metrics = metrics[field.name]
-
-                    for value in values:
-                        counters = value_metrics[value]
-                        counters[splitter] += 1
+            partial.submissions_count += 1
+            submission_counts_by_version[version_id] += 1
 
-                        if value is not None:
-                            counters['__submissions__'] += 1
+            splitter = entry.get(split_by_path)
+            splitter_index = get_splitter_index(splitter)
+
+            for path, repeat_paths, parse_values, accumulator in readers:
+                if repeat_paths:
+                    _add_repeated_answers(
+                        entry,
+                        path,
+                        repeat_paths,
+                        parse_values,
+                        accumulator,
+                        repeat_mode,
+                        splitter_index,
+                    )
+                    continue
+
+                raw_value = entry.get(path)
+                if raw_value is None:
+                    accumulator.add_missing(splitter_index)
+                    continue
+
+                try:
+                    values = parse_values(raw_value)
+                except ValueError as e:
+                    logging.warning(str(e), exc_info=True)
+                    # Treat the bad value as a blank response
+                    accumulator.add_missing(splitter_index)
+                else:
+                    accumulator.add(values, splitter_index)
 
             # collect stats for the split_by field
             if splitter is not None:
-                values = split_by_field.parse_values(splitter)
+                try:
+                    values = parse_splitter(splitter)
+                except ValueError as e:
+                    logging.warning(str(e), exc_info=True)
+                    values = (None,)
             else:
                 values = (None,)
 
             splitters_rank.update(values)
 
+        return read
+
+    def _get_top_splitters(self, partial, split_by_field, lang):
         # keep the 5 most encountered split_by value
         top_splitters = []
-        for val, _ in splitters_rank.most_common(6):
+        for val, _ in partial.splitters_rank.most_common(6):
             if val is None:
                 continue
             if hasattr(split_by_field, 'get_translation'):
@@ -196,48 +525,381 @@ class AutoReport:
         # TODO: Figure out a better way of reproducibly ordering values.
         top_splitters.sort(key=lambda val_: val_[0])
 
-        def stats_generator():
-            for field in fields:
-                stats = field.get_disaggregated_stats(
-                    metrics[field.name], lang=lang, top_splitters=top_splitters
-                )
-                yield (field, field.get_labels(lang)[0], stats)
+        return top_splitters
 
-        return AutoReportStats(
-            self,
-            stats_generator(),
-            submissions_count,
-            submission_counts_by_version,
+    def _get_bucket_field(self, bucket_by):
+        """
+        Return the date or datetime field to bucket the report by
+        """
+        if bucket_by == SubmissionTimeCopyField.FIELD_NAME:
+            return SubmissionTimeCopyField()
+
+        all_fields = self.formpack.get_fields_for_versions(self.versions)
+        try:
+            bucket_field = next(f for f in all_fields if f.name == bucket_by)
+        except StopIteration:
+            raise ValueError(
+                'No field matching name "%s" for bucket_by' % bucket_by
+            )
+
+        if (
+            not isinstance(bucket_field, DateField)
+            or bucket_field.data_type == 'time'
+            or _get_repeat_paths(bucket_field)
+        ):
+            raise ValueError(
+                'Cannot bucket_by "%s", which is not a date or datetime field '
+                'outside of repeat groups' % bucket_by
+            )
+
+        return bucket_field
+
+    @staticmethod
+    def _get_bucket_getter(bucket_field, bucket_interval):
+        """
+        Return a function giving the bucket of a submission, i.e. the start
+        of the `bucket_interval` its `bucket_field` value falls in, or `None`
+        if it has no valid value
+        """
+        path = bucket_field.path
+        get_bucket = BUCKET_INTERVALS[bucket_interval]
+
+        def get_submission_bucket(entry):
+            raw_value = entry.get(path)
+            if raw_value is None:
+                return None
+            try:
+                value = parse_iso8601(raw_value)
+            except (TypeError, ValueError) as e:
+                logging.warning(str(e))
+                return None
+            if isinstance(value, datetime):
+                value = value.date()
+            return get_bucket(value)
+
+        return get_submission_bucket
+
+    def _new_partial(
+        self,
+        fields,
+        split_by_field,
+        sketch_size=None,
+        repeat_mode=REPEAT_MODE_INSTANCE,
+    ):
+        field_names = [field.name for field in fields]
+
+        if split_by_field:
+            splitter_index = SplitterIndex()
+            return AutoReportPartial(
+                field_names,
+                {
+                    field.name: SplitAccumulator(splitter_index)
+                    for field in fields
+                },
+                split_by=split_by_field.name,
+                splitter_index=splitter_index,
+                repeat_mode=repeat_mode,
+            )
+
+        return AutoReportPartial(
+            field_names,
+            {
+                # One typed accumulator per field,
+                # see `FormField.get_stats_accumulator()`
+                field.name: field.get_stats_accumulator(sketch_size)
+                for field in fields
+            },
+            repeat_mode=repeat_mode,
         )
 
-    def get_stats(
+    def _read_submissions(
+        self,
+        submissions,
+        fields,
+        split_by_field,
+        sketch_size=None,
+        repeat_mode=REPEAT_MODE_INSTANCE,
+        bucket_field=None,
+        bucket_interval=None,
+    ):
+        """
+        Read `submissions` in a single pass, in the current process.
+
+        :return: AutoReportPartial, or a dict of `AutoReportPartial` by
+            bucket, in order of first appearance, if `bucket_field` is set
+        """
+        if bucket_field is None:
+            partial = self._new_partial(
+                fields, split_by_field, sketch_size, repeat_mode
+            )
+            read = self._get_submission_reader(fields, split_by_field, partial)
+            for version_id, entry in self._iter_submissions(submissions):
+                read(entry, version_id)
+            return partial
+
+        get_bucket = self._get_bucket_getter(bucket_field, bucket_interval)
+        partials = {}
+        # Reader of the partial of each bucket
+        readers = {}
+        for version_id, entry in self._iter_submissions(submissions):
+            bucket = get_bucket(entry)
+            try:
+                read = readers[bucket]
+            except KeyError:
+                partial = partials[bucket] = self._new_partial(
+                    fields, split_by_field, sketch_size, repeat_mode
+                )
+                read = readers[bucket] = self._get_submission_reader(
+                    fields, split_by_field, partial
+                )
+            read(entry, version_id)
+
+        return partials
+
+    @staticmethod
+    def _merge_partials(partial, other):
+        """
+        Merge the results of `other` into `partial`, both being either an
+        `AutoReportPartial` or a dict of them by bucket
+        """
+        if isinstance(partial, AutoReportPartial):
+            return partial.merge(other)
+
+        for bucket, bucket_partial in other.items():
+            if bucket in partial:
+                partial[bucket].merge(bucket_partial)
+            else:
+                partial[bucket] = bucket_partial
+        return partial
+
+    def _read_submissions_in_parallel(self, submissions, workers, **options):
+        """
+        Same as `_read_submissions()`, but submissions are read by chunks of
+        `CHUNK_SIZE` in `workers` processes. Chunk partials are merged in
+        the order of the submissions, so that the result is exactly the
+        same as the one of `_read_submissions()`.
+        """
+        submissions = iter(submissions)
+        chunks = iter(lambda: list(islice(submissions, self.CHUNK_SIZE)), [])
+        # Start from the (empty) result of no submissions
+        partial = self._read_submissions((), **options)
+
+        # Send the workers what they need to read submissions only, not the
+        # form pack with its versions and caches
+        version_ids = dict.fromkeys(self.versions)
+        version_id_keys = self.formpack.version_id_keys()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=self.MP_CONTEXT,
+            initializer=_init_worker,
+            initargs=(version_ids, version_id_keys, options),
+        ) as executor:
+            # Do not send more chunks than the workers can handle, not to
+            # load all the submissions in memory at once
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_get_chunk_partial, chunk))
+                if len(pending) >= 2 * workers:
+                    self._merge_partials(partial, pending.popleft().result())
+
+            while pending:
+                self._merge_partials(partial, pending.popleft().result())
+
+        return partial
+
+    def get_partial(
         self,
         submissions,
         fields=(),
-        lang=UNSPECIFIED_TRANSLATION,
         split_by=None,
+        workers=None,
+        approximate=False,
+        sketch_size=DEFAULT_SKETCH_SIZE,
+        repeat_mode=REPEAT_MODE_INSTANCE,
+        bucket_by=None,
+        bucket_interval='day',
     ):
+        """
+        Read `submissions` and return the intermediate results of the report,
+        as an `AutoReportPartial` which can be merged with other partials
+        of the same report before getting the final stats with
+        `get_stats_from_partial()`.
+
+        :param submissions: iterable. Submissions to read
+        :param fields: list. Names of the fields to get stats on. Default to
+            all fields.
+        :param split_by: str. Name of the field to disaggregate stats by.
+        :param workers: int. Number of processes to read the submissions
+            with. Default to reading them in the current process.
+        :param approximate: bool. If true, text and numeric fields keep at
+            most `sketch_size` distinct values each, so that memory does not
+            grow with the number of submissions. Their stats are then
+            approximate, and report the bounds of their errors (see
+            `formpack.utils.accumulators`). Not supported for disaggregated
+            reports.
+        :param sketch_size: int. The larger, the more accurate approximate
+            stats are.
+        :param repeat_mode: str. How answers to fields inside repeat groups
+            are counted: `'instance'` counts one answer per instance of the
+            group, `'submission'` counts one answer per submission, made of
+            the distinct values of all its instances.
+        :param bucket_by: str. Name of a date or datetime field, or
+            `'_submission_time'`, to compute the report separately for each
+            period of time, still reading the submissions once.
+        :param bucket_interval: str. Length of the periods of time when
+            `bucket_by` is set, one of `BUCKET_INTERVALS`.
+        :return: AutoReportPartial or, if `bucket_by` is set, an OrderedDict
+            of `AutoReportPartial` by bucket. Buckets are the ISO-8601 start
+            of their period (e.g. `'2016-03-14'` for a day or a week, which
+            start on Mondays, `'2016-03'` for a month), sorted from old to
+            new, with the bucket of submissions without a valid value,
+            `None`, last.
+        """
+        if repeat_mode not in REPEAT_MODES:
+            raise ValueError(
+                'repeat_mode must be one of: %s' % ', '.join(REPEAT_MODES)
+            )
+        if bucket_interval not in BUCKET_INTERVALS:
+            raise ValueError(
+                'bucket_interval must be one of: %s'
+                % ', '.join(BUCKET_INTERVALS)
+            )
 
-        all_fields = self.formpack.get_fields_for_versions(self.versions)
-        all_fields = [field for field in all_fields if field.has_stats]
+        fields, split_by_field = self._get_fields(fields, split_by)
 
-        fields = set(fields)
-        if not fields:
-            fields = all_fields
+        if approximate and split_by_field:
+            raise ValueError(
+                'Approximate stats are not supported with split_by'
+            )
+
+        options = {
+            'fields': fields,
+            'split_by_field': split_by_field,
+            'sketch_size': sketch_size if approximate else None,
+            'repeat_mode': repeat_mode,
+        }
+        if bucket_by:
+            options['bucket_field'] = self._get_bucket_field(bucket_by)
+            options['bucket_interval'] = bucket_interval
+
+        if workers is not None and workers > 1:
+            partial = self._read_submissions_in_parallel(
+                submissions, workers, **options
+            )
         else:
-            fields.add(split_by)
-            fields = [field for field in all_fields if field.name in fields]
+            partial = self._read_submissions(submissions, **options)
 
-        if split_by:
-            try:
-                split_by_field = next(f for f in fields if f.name == split_by)
-            except StopIteration:
-                raise ValueError(
-                    'No field matching name "%s" ' 'for split_by' % split_by
-                )
+        if not bucket_by:
+            return partial
+
+        # Sort buckets from old to new, submissions without a bucket last
+        return OrderedDict(
+            sorted(
+                partial.items(),
+                key=lambda item: (item[0] is None, item[0] or ''),
+            )
+        )
+
+    def get_stats_from_partial(self, partial, lang=UNSPECIFIED_TRANSLATION):
+        """
+        Compute the final stats of the report from a (possibly merged)
+        `AutoReportPartial`. The partial is left untouched, so that more
+        results can be merged into it later.
 
-            return self._disaggregate_stats(
-                submissions, fields, self.versions, lang, split_by_field
+        :param partial: AutoReportPartial
+        :param lang: str
+        :return: AutoReportStats
+        """
+        fields_by_name = {
+            field.name: field
+            for field in self.formpack.get_fields_for_versions(self.versions)
+        }
+        fields = [fields_by_name[name] for name in partial.field_names]
+        split_by_field = fields_by_name.get(partial.split_by)
+        metrics = partial.metrics
+
+        if split_by_field:
+            top_splitters = self._get_top_splitters(
+                partial, split_by_field, lang
             )
 
-        return self._calculate_stats(submissions, fields, self.versions, lang)
+            def stats_generator():
+                for field in fields:
+                    stats = field.get_disaggregated_stats(
+                        metrics[field.name],
+                        lang=lang,
+                        top_splitters=top_splitters,
+                    )
+                    yield (field, field.get_labels(lang)[0], stats)
+
+        else:
+
+            def stats_generator():
+                for field in fields:
+                    yield (
+                        field,
+                        field.get_labels(lang)[0],
+                        field.get_stats(metrics[field.name], lang=lang),
+                    )
+
+        return AutoReportStats(
+            self,
+            stats_generator(),
+            partial.submissions_count,
+            OrderedCounter(partial.submission_counts_by_version),
+        )
+
+    def get_stats(
+        self,
+        submissions,
+        fields=(),
+        lang=UNSPECIFIED_TRANSLATION,
+        split_by=None,
+        workers=None,
+        approximate=False,
+        sketch_size=DEFAULT_SKETCH_SIZE,
+        repeat_mode=REPEAT_MODE_INSTANCE,
+        bucket_by=None,
+        bucket_interval='day',
+    ):
+        """
+        Compute the stats of the report over `submissions`.
+
+        :param submissions: iterable. Submissions to read
+        :param fields: list. Names of the fields to get stats on. Default to
+            all fields.
+        :param lang: str
+        :param split_by: str. Name of the field to disaggregate stats by.
+        :param workers: int. Number of processes to read the submissions
+            with, see `get_partial()`. The stats are the same whatever the
+            number of workers.
+        :param approximate: bool. Compute approximate stats in bounded
+            memory, see `get_partial()`.
+        :param sketch_size: int
+        :param repeat_mode: str. How answers to fields inside repeat groups
+            are counted, see `get_partial()`.
+        :param bucket_by: str. Name of a date or datetime field, or
+            `'_submission_time'`, to get the stats of each period of time in
+            a single pass over the submissions, see `get_partial()`.
+        :param bucket_interval: str. One of `'day'`, `'week'`, `'month'` or
+            `'year'`.
+        :return: AutoReportStats or, if `bucket_by` is set, an OrderedDict
+            of `AutoReportStats` by bucket
+        """
+        partial = self.get_partial(
+            submissions,
+            fields,
+            split_by,
+            workers,
+            approximate,
+            sketch_size,
+            repeat_mode,
+            bucket_by,
+            bucket_interval,
+        )
+        if bucket_by:
+            return OrderedDict(
+                (bucket, self.get_stats_from_partial(bucket_partial, lang))
+                for bucket, bucket_partial in partial.items()
+            )
+        return self.get_stats_from_partial(partial, lang)
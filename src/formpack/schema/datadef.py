@@ -1,7 +1,28 @@
 # coding: utf-8
+import sys
 from collections import OrderedDict
 
 from ..constants import UNSPECIFIED_TRANSLATION, UNTRANSLATED
+from ..utils.json_hash import json_hash
+
+
+def as_hierarchy_tuple(hierarchy):
+    """
+    Return `hierarchy` as a tuple, as is if it already is one so that it can
+    be shared by all the objects of a same level
+    """
+    if isinstance(hierarchy, tuple):
+        return hierarchy
+    return tuple(hierarchy)
+
+
+def get_hierarchy_path(levels, last):
+    """
+    Return the interned path of `last` below `levels`, e.g.
+    `group_tree/group_nest/How_many_eggs_are_in_the_nest`. Paths are interned
+    because they are repeated by every version of a form.
+    """
+    return sys.intern('/'.join([info.name for info in levels] + [last.name]))
 
 
 class FormDataDef:
@@ -9,7 +30,11 @@ class FormDataDef:
     Any object composing a form. It's only used with a subclass.
     """
 
+    __slots__ = ('name', 'labels', 'has_stats')
+
     def __init__(self, name, labels=None, has_stats=False, *args, **kwargs):
+        if type(name) is str:
+            name = sys.intern(name)
         self.name = name
         self.labels = labels or {}
         self.has_stats = has_stats
@@ -39,7 +64,7 @@ class FormDataDef:
 
 
 class FormGroup(FormDataDef):  # useful to get __repr__
-    pass
+    __slots__ = ()
 
 
 class FormSection(FormDataDef):
@@ -47,6 +72,8 @@ class FormSection(FormDataDef):
     The tabular representation of a repeatable group of fields
     """
 
+    __slots__ = ('fields', 'parent', 'children', '_hierarchy', 'path')
+
     def __init__(
         self,
         name='submissions',
@@ -67,9 +94,18 @@ class FormSection(FormDataDef):
         self.parent = parent
         self.children = list(children)
 
-        self.hierarchy = list(hierarchy) + [self]
+        # Levels above this section, see `hierarchy`
+        self._hierarchy = as_hierarchy_tuple(hierarchy)
         # do not include the root section in the path
-        self.path = '/'.join(info.name for info in self.hierarchy[1:])
+        self.path = get_hierarchy_path(self._hierarchy[1:], self)
+
+    @property
+    def hierarchy(self):
+        """
+        All the levels from the root section down to this section, mixing
+        groups and sections
+        """
+        return self._hierarchy + (self,)
 
     @classmethod
     def from_json_definition(
@@ -89,38 +125,78 @@ class FormSection(FormDataDef):
 
 
 class FormChoice(FormDataDef):
+    __slots__ = ('options',)
+
     def __init__(self, name, *args, **kwargs):
         super().__init__(name, *args, **kwargs)
         self.name = name
         self.options = OrderedDict()
 
     @classmethod
-    def all_from_json_definition(cls, definition, translation_list):
-        all_choices = {}
+    def all_from_json_definition(
+        cls, definition, translation_list, shared_choices=None
+    ):
+        """
+        Return a `FormChoice` for each choice list of `definition`, by list
+        name.
+
+        :param shared_choices: dict. Choice lists already built, e.g. for the
+            other versions of a form, by content hash. Lists with the same
+            content are reused instead of being built again, and new lists
+            are added to it. Shared lists must not be modified in place, see
+            `FormChoiceField.merge_choice()`.
+        """
+        # Name and label of each option, by list name
+        all_options = {}
         for choice_definition in definition:
             choice_name = choice_definition.get('name')
             choice_key = choice_definition.get('list_name')
             if not choice_name or not choice_key:
                 continue
 
-            if choice_key not in all_choices:
-                all_choices[choice_key] = FormChoice(choice_key)
-            choices = all_choices[choice_key]
-
-            option = choices.options[choice_name] = {}
-
             # apparently choices dont need a label if they have an image
             if 'label' in choice_definition:
                 _label = choice_definition['label']
             else:
                 _label = choice_definition.get('image')
+            all_options.setdefault(choice_key, []).append(
+                (choice_name, _label)
+            )
+
+        all_choices = {}
+        for choice_key, options in all_options.items():
+            if shared_choices is None:
+                all_choices[choice_key] = cls._from_options(
+                    choice_key, options, translation_list
+                )
+                continue
+
+            content_hash = json_hash(
+                [choice_key, translation_list, options], size=38
+            )
+            try:
+                choices = shared_choices[content_hash]
+            except KeyError:
+                choices = shared_choices[content_hash] = cls._from_options(
+                    choice_key, options, translation_list
+                )
+            all_choices[choice_key] = choices
+
+        return all_choices
+
+    @classmethod
+    def _from_options(cls, choice_key, options, translation_list):
+        choices = cls(choice_key)
+        for choice_name, _label in options:
             if isinstance(_label, str):
                 _label = [_label]
             elif _label is None:
                 _label = []
-            option['labels'] = OrderedDict(zip(translation_list, _label))
-            option['name'] = choice_name
-        return all_choices
+            choices.options[choice_name] = {
+                'labels': OrderedDict(zip(translation_list, _label)),
+                'name': choice_name,
+            }
+        return choices
 
     @property
     def translations(self):
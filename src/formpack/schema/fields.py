@@ -1,17 +1,28 @@
 # coding: utf-8
 import math
 import statistics
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
 from functools import partial
 from operator import itemgetter
 
-from dateutil import parser
-
 from ..constants import UNSPECIFIED_TRANSLATION
-from ..utils import singlemode
-from ..utils.ordered_collection import OrderedDefaultdict
+from ..utils.accumulators import (
+    ApproximateNumericAccumulator,
+    ChoiceAccumulator,
+    CountAccumulator,
+    FrequencyAccumulator,
+    HeavyHittersAccumulator,
+    NumericAccumulator,
+)
+from ..utils.dates import parse_datetime
+from ..utils.numbers import try_get_number, try_get_numbers
 from ..utils.string import list_to_csv
-from .datadef import FormChoice, FormDataDef
+from .datadef import (
+    FormChoice,
+    FormDataDef,
+    as_hierarchy_tuple,
+    get_hierarchy_path,
+)
 
 
 class FormField(FormDataDef):
@@ -19,6 +30,22 @@ class FormField(FormDataDef):
     A form field definition knowing how to find and format data
     """
 
+    __slots__ = (
+        'data_type',
+        'section',
+        'can_format',
+        'tags',
+        'analysis_question',
+        # Only set on analysis questions
+        'source',
+        'settings',
+        'language',
+        'source_field',
+        'choices',
+        '_hierarchy',
+        'path',
+    )
+
     def __init__(
         self,
         name,
@@ -45,8 +72,11 @@ class FormField(FormDataDef):
             self.settings = kwargs.get('settings')
             self.language = kwargs['language']
 
-        hierarchy = list(hierarchy) if hierarchy is not None else [None]
-        self.hierarchy = hierarchy + [self]
+        # Levels above this field, shared by all the fields of a same group
+        # when given as a tuple, see `hierarchy`
+        self._hierarchy = (
+            (None,) if hierarchy is None else as_hierarchy_tuple(hierarchy)
+        )
 
         # warning: the order of the super() call matters
         super().__init__(name, labels, *args, **kwargs)
@@ -57,7 +87,15 @@ class FormField(FormDataDef):
             self.has_stats = data_type != 'note' and not self.analysis_question
 
         # do not include the root section in the path
-        self.path = '/'.join(info.name for info in self.hierarchy[1:])
+        self.path = get_hierarchy_path(self._hierarchy[1:], self)
+
+    @property
+    def hierarchy(self):
+        """
+        All the levels from the root section down to this field, mixing
+        groups and sections
+        """
+        return self._hierarchy + (self,)
 
     def get_labels(
         self,
@@ -294,27 +332,43 @@ class FormField(FormDataDef):
 
         return {self.name: val}
 
+    def get_stats_accumulator(self, sketch_size=None):
+        """
+        Return a new accumulator collecting what `get_stats()` needs for this
+        field, as a `formpack.utils.accumulators.CountAccumulator` instance
+
+        :param sketch_size: int. If provided, fields which can have an
+            unbounded number of distinct values use an approximate
+            accumulator keeping at most `sketch_size` of them.
+        """
+        return CountAccumulator()
+
     def get_stats(self, metrics, lang=UNSPECIFIED_TRANSLATION, limit=100):
 
-        not_provided = metrics.pop(None, 0)
-        provided = metrics.pop('__submissions__', 0)
+        not_provided = metrics.not_provided
+        provided = metrics.provided
 
-        return {
+        stats = {
             'total_count': not_provided + provided,
             'not_provided': not_provided,
             'provided': provided,
             'show_graph': False,
         }
+        stats.update(metrics.get_error_bounds())
+
+        return stats
 
     def get_disaggregated_stats(
         self, metrics, top_splitters, lang=UNSPECIFIED_TRANSLATION, limit=100
     ):
+        """
+        :param metrics: formpack.utils.accumulators.SplitAccumulator
+        :param top_splitters: list. The most common values of the split_by
+            field, as (value, translation) tuples
+        """
 
-        not_provided = 0
-        provided = 0
-        for val, counter in metrics.items():
-            not_provided += counter.pop(None, 0)
-            provided += counter.pop('__submissions__', 0)
+        not_provided = metrics.not_provided
+        provided = metrics.provided
 
         return {
             'total_count': not_provided + provided,
@@ -324,7 +378,7 @@ class FormField(FormDataDef):
         }
 
     def parse_values(self, raw_values):
-        yield raw_values
+        return (raw_values,)
 
     @staticmethod
     def try_get_number(val):
@@ -332,28 +386,10 @@ class FormField(FormDataDef):
         Attempt to convert string values to integers or floats. If the value is
         `inf` or `nan` or not a valid integer or float then return the string
         value instead.
-        """
 
-        str_val = val
-
-        try:
-            val = int(val)
-        except ValueError:
-            pass
-        else:
-            return val
-
-        try:
-            val = float(val)
-        except ValueError:
-            pass
-
-        # The floats `+/-inf` and `nan` cause XLS exports to fail, therefore
-        # return the string value instead.
-        if isinstance(val, float) and not math.isfinite(val):
-            return str_val
-
-        return val
+        See `formpack.utils.numbers`, which memoizes conversions.
+        """
+        return try_get_number(val)
 
 
 class ExtendedFormField(FormField):
@@ -363,6 +399,8 @@ class ExtendedFormField(FormField):
     code.
     """
 
+    __slots__ = ()
+
     def _get_percentage(self, value, total):
         """
         Calculate value percentage according to total
@@ -411,8 +449,8 @@ class ExtendedFormField(FormField):
 
 
         :param stats: dict {'total_count': <int>, 'provided': <int>, 'show_graph': <bool>, 'not_provided': <int>}
-        :param metrics: defaultdict {'field value': OrderedCounter('value1', 'value2', ..., 'value3')}
-        :param top_splitters: list 5 most commons values among OrderedCounter collections
+        :param metrics: SplitAccumulator
+        :param top_splitters: list 5 most commons values of the split_by field
         :param lang: string
         :return: defaultdict
 
@@ -457,6 +495,8 @@ class ExtendedFormField(FormField):
 
 
 class TextField(ExtendedFormField):
+    __slots__ = ()
+
     def get_disaggregated_stats(
         self, metrics, top_splitters, lang=UNSPECIFIED_TRANSLATION, limit=100
     ):
@@ -489,6 +529,11 @@ class TextField(ExtendedFormField):
         args = lang, group_sep, hierarchy_in_labels, multiple_select
         return [self._get_label(*args)]
 
+    def get_stats_accumulator(self, sketch_size=None):
+        if sketch_size:
+            return HeavyHittersAccumulator(sketch_size)
+        return FrequencyAccumulator()
+
     def get_stats(self, metrics, lang=UNSPECIFIED_TRANSLATION, limit=100):
 
         stats = super().get_stats(metrics, lang, limit)
@@ -522,6 +567,8 @@ class TextField(ExtendedFormField):
 
 
 class QualField(TextField):
+    __slots__ = ('_choices_by_uuid',)
+
     SUPPLEMENTAL_DETAILS_FIELD = '_supplementalDetails'
 
     def _get_label(self, *args, **kwargs):
@@ -553,12 +600,32 @@ class QualField(TextField):
 
         return ''
 
+    def _get_choices_by_uuid(self):
+        """
+        Return a dict of `self.choices` by UUID, the first one winning in case
+        of duplicates. It is rebuilt if `self.choices` is replaced.
+        """
+        choices = getattr(self, 'choices', ())
+        try:
+            source, choices_by_uuid = self._choices_by_uuid
+        except AttributeError:
+            source = None
+        if source is not choices:
+            choices_by_uuid = {}
+            for choice in choices:
+                choices_by_uuid.setdefault(choice['uuid'], choice)
+            self._choices_by_uuid = (choices, choices_by_uuid)
+        return choices_by_uuid
+
 
 class QualNumField(QualField):
     """
     Perhaps this should subclass `NumField` instead, but that has no benefit as
     long as analysis questions are excluded from the auto report
     """
+
+    __slots__ = ()
+
     def format(self, val, xls_types_as_text=True, *args, **kwargs):
         if val is None:
             val = ''
@@ -570,6 +637,8 @@ class QualNumField(QualField):
 
 
 class QualSelectMultipleField(QualField):
+    __slots__ = ('_cells_templates',)
+
     def get_labels(
         self,
         lang=UNSPECIFIED_TRANSLATION,
@@ -630,37 +699,60 @@ class QualSelectMultipleField(QualField):
         silently.
         """
         _zero, _one = ('0', '1') if xls_types_as_text else (0, 1)
-        _empty = dict.fromkeys(
-            self.get_value_names(multiple_select=multiple_select), _zero
-        )
-        if multiple_select in ('both', 'summary'):
-            _empty[self.name] = ''
+        _empty = self._get_cells_template(multiple_select, _zero)
         if not val or not isinstance(val, list):
             return _empty.copy()
 
-        known_uuids = {choice['uuid'] for choice in self.choices}
+        choices_by_uuid = self._get_choices_by_uuid()
         cells = _empty.copy()
 
         if multiple_select in ('both', 'summary'):
             res = []
             for v in val:
-                for choice in self.choices:
-                    if choice['uuid'] == v:
-                        label = choice['labels'].get(lang) or \
-                            choice['labels']['_default']
-                        res.append(label)
-                        break
+                choice = choices_by_uuid.get(v)
+                if choice is not None:
+                    label = choice['labels'].get(lang) or \
+                        choice['labels']['_default']
+                    res.append(label)
             cells[self.name] = ' '.join(res)
 
         if multiple_select in ('both', 'details'):
             for choice_val in val:
-                if choice_val in known_uuids:
+                if choice_val in choices_by_uuid:
                     cells[self.name + '/' + choice_val] = _one
 
         return cells
 
+    def _get_cells_template(self, multiple_select, filler):
+        """
+        Return the cells of `format()` without any choice selected, built once
+        per `multiple_select` mode and filler (and rebuilt if `self.choices`
+        is replaced). Templates must be copied before being filled in.
+        """
+        choices = getattr(self, 'choices', ())
+        try:
+            source, templates = self._cells_templates
+        except AttributeError:
+            source = None
+        if source is not choices:
+            templates = {}
+            self._cells_templates = (choices, templates)
+
+        key = (multiple_select, filler)
+        try:
+            return templates[key]
+        except KeyError:
+            template = templates[key] = dict.fromkeys(
+                self.get_value_names(multiple_select=multiple_select), filler
+            )
+            if multiple_select in ('both', 'summary'):
+                template[self.name] = ''
+            return template
+
 
 class QualSelectOneField(QualField):
+    __slots__ = ()
+
     def get_value_from_entry(self, entry):
         """
         The shape of `entry` is dictated by
@@ -671,17 +763,19 @@ class QualSelectOneField(QualField):
             return ''
         assert isinstance(val, dict)
         chosen_response = val['uuid']
-        for choice in self.choices:
-            if choice['uuid'] == chosen_response:
-                # hard-coded `_default` language because qualitative
-                # analysis does not yet support translated labels
-                return choice['labels']['_default']
+        choice = self._get_choices_by_uuid().get(chosen_response)
+        if choice is not None:
+            # hard-coded `_default` language because qualitative
+            # analysis does not yet support translated labels
+            return choice['labels']['_default']
         # return unaltered value if no matching choice could be found; it could
         # contain an error message
         return val
 
 
 class QualTagsField(QualField):
+    __slots__ = ()
+
     def get_value_from_entry(self, entry):
         val = super().get_value_from_entry(entry)
         return list_to_csv(val)
@@ -693,6 +787,9 @@ class QualNameSplittingTransxField(QualField):
     changed to match the improved structure of `analysis_form`, and this `name`
     splitting logic should be trashed.
     """
+
+    __slots__ = ()
+
     def get_value_from_entry(self, entry):
         name_parts = self.name.split('/')
         # must have at least the source question path and `transcript_??` or
@@ -733,18 +830,24 @@ class QualNameSplittingTransxField(QualField):
 
 
 class QualTranscriptField(QualNameSplittingTransxField):
+    __slots__ = ()
+
     def _get_label(self, *args, **kwargs):
         source_label = self.source_field._get_label(*args, **kwargs)
         return f'{source_label} - transcript ({self.language})'
 
 
 class QualTranslationField(QualNameSplittingTransxField):
+    __slots__ = ()
+
     def _get_label(self, *args, **kwargs):
         source_label = self.source_field._get_label(*args, **kwargs)
         return f'{source_label} - translation ({self.language})'
 
 
 class QualMetadataField(QualField):
+    __slots__ = ()
+
     @property
     def value_field(self):
         raise NotImplementedError()
@@ -769,18 +872,24 @@ class QualMetadataField(QualField):
 
 
 class QualVerificationField(QualMetadataField):
+    __slots__ = ()
+
     @property
     def value_field(self):
         return 'verified'
 
 
 class QualSourceField(QualMetadataField):
+    __slots__ = ()
+
     @property
     def value_field(self):
         return 'source'
 
 
 class MediaField(TextField):
+    __slots__ = ()
+
     def get_labels(self, include_media_url=False, *args, **kwargs):
         label = self._get_label(*args, **kwargs)
         if include_media_url:
@@ -818,11 +927,22 @@ class MediaField(TextField):
 
 
 class AuditField(MediaField):
+    __slots__ = ()
+
     def get_value_from_entry(self, entry):
         return entry.get('meta/' + self.path)
 
 
 class DateField(ExtendedFormField):
+    __slots__ = ()
+
+    def get_stats_accumulator(self, sketch_size=None):
+        # Only dates get a frequency table, times are just counted. There
+        # are too few distinct dates to need an approximate accumulator
+        if self.data_type != 'date':
+            return CountAccumulator()
+        return FrequencyAccumulator()
+
     def get_stats(self, metrics, lang=UNSPECIFIED_TRANSLATION, limit=100):
         """
         Return total count for all, and freq and % for 'date' date types
@@ -879,7 +999,7 @@ class DateField(ExtendedFormField):
 
         _date = val
         try:
-            _date = parser.parse(val)
+            _date = parse_datetime(val)
         except ValueError:
             pass
         else:
@@ -889,6 +1009,8 @@ class DateField(ExtendedFormField):
 
 
 class DateTimeField(DateField):
+    __slots__ = ()
+
     def format(self, val, xls_types_as_text=True, *args, **kwargs):
         if val is None:
             val = ''
@@ -898,7 +1020,7 @@ class DateTimeField(DateField):
 
         _date = val
         try:
-            _date = parser.parse(val)
+            _date = parse_datetime(val)
         except ValueError:
             pass
 
@@ -906,33 +1028,37 @@ class DateTimeField(DateField):
 
 
 class NumField(FormField):
-    def flatten_dataset(self, dataset):
-        """
-        Generate sorted numbers as listed in the given metrics counter
+    __slots__ = ()
 
-        Cast the value to the propoer datatype in caste it's been provided
-        as text.
-        """
-        for value, freq in sorted(dataset.items()):
-            for x in range(freq):
-                yield value
+    def get_stats_accumulator(self, sketch_size=None):
+        if sketch_size:
+            return ApproximateNumericAccumulator(sketch_size)
+        return NumericAccumulator()
 
     def get_stats(self, metrics, lang=UNSPECIFIED_TRANSLATION, limit=100):
 
         stats = super().get_stats(metrics, lang, limit)
 
-        stats.update({'median': '*', 'mean': '*', 'mode': '*', 'stdev': '*'})
+        stats.update(self._get_numeric_stats(metrics))
+
+        return stats
+
+    @staticmethod
+    def _get_numeric_stats(accumulator):
+        """
+        Return the mean, median, standard deviation and mode of the values
+        recorded by a `NumericAccumulator`, or '*' when they are undefined
+        """
+        stats = {'median': '*', 'mean': '*', 'mode': '*', 'stdev': '*'}
 
         try:
             # require a non empty dataset
-            stats['mean'] = statistics.mean(self.flatten_dataset(metrics))
-            stats['median'] = statistics.median(self.flatten_dataset(metrics))
+            stats['mean'] = accumulator.mean()
+            stats['median'] = accumulator.median()
             # requires at least 2 values in the dataset
-            stats['stdev'] = statistics.stdev(
-                self.flatten_dataset(metrics), xbar=stats['mean']
-            )
+            stats['stdev'] = accumulator.stdev(xbar=stats['mean'])
             # requires a non empty dataset and a unique mode
-            stats['mode'] = singlemode(self.flatten_dataset(metrics))
+            stats['mode'] = accumulator.mode()
         except statistics.StatisticsError:
             pass
 
@@ -947,52 +1073,23 @@ class NumField(FormField):
             metrics, top_splitters, lang, limit
         )
 
-        substats = OrderedDict()
-
-        # transpose the metrics data structure to look like
-        # {splitter1: [x, y, z], splitter2...}}
-        inversed_metrics = OrderedDefaultdict(list)
-
-        for val, counter in metrics.items():
-            if val is None:
-                continue
-            for splitter, count in counter.items():
-                inversed_metrics[splitter].extend([val] * count)
-
-        for splitter, values in inversed_metrics.items():
+        substats = tuple(
+            (splitter, self._get_numeric_stats(accumulator))
+            for splitter, accumulator in metrics.get_numeric_accumulators()
+        )
 
-            val_stats = substats[splitter] = {
-                'median': '*',
-                'mean': '*',
-                'mode': '*',
-                'stdev': '*',
-            }
-
-            try:
-                # require a non empty dataset
-                val_stats['mean'] = statistics.mean(values)
-                val_stats['median'] = statistics.median(values)
-                # requires at least 2 values in the dataset
-                val_stats['stdev'] = statistics.stdev(
-                    values, xbar=val_stats['mean']
-                )
-                # requires a non empty dataset and a unique mode
-                val_stats['mode'] = singlemode(values)
-            except statistics.StatisticsError:
-                pass
-
-        stats.update({'values': tuple(substats.items())[:limit]})
+        stats.update({'values': substats[:limit]})
 
         return stats
 
     def parse_values(self, raw_values):
         if self.data_type == 'integer':
-            yield int(raw_values)
-        else:
-            value = float(raw_values)
-            if not math.isfinite(value):
-                raise ValueError(f'Non-finite float value: {raw_values!r}')
-            yield value
+            return (int(raw_values),)
+
+        value = float(raw_values)
+        if not math.isfinite(value):
+            raise ValueError(f'Non-finite float value: {raw_values!r}')
+        return (value,)
 
     def format(self, val, xls_types_as_text=True, *args, **kwargs):
         if val is None:
@@ -1009,6 +1106,8 @@ class CopyField(FormField):
     Just copy the data over. No translation. No manipulation
     """
 
+    __slots__ = ()
+
     def __init__(self, name, hierarchy=(None,), section=None, *args, **kwargs):
         super().__init__(
             name,
@@ -1030,6 +1129,7 @@ class CopyField(FormField):
 
 
 class IdCopyField(CopyField):
+    __slots__ = ()
 
     FIELD_NAME = '_id'
 
@@ -1052,6 +1152,7 @@ class IdCopyField(CopyField):
 
 
 class SubmissionTimeCopyField(CopyField):
+    __slots__ = ()
 
     FIELD_NAME = '_submission_time'
 
@@ -1072,7 +1173,7 @@ class SubmissionTimeCopyField(CopyField):
 
         _date = val
         try:
-            _date = parser.parse(val)
+            _date = parse_datetime(val)
         except ValueError:
             pass
 
@@ -1080,6 +1181,7 @@ class SubmissionTimeCopyField(CopyField):
 
 
 class NotesCopyField(CopyField):
+    __slots__ = ()
 
     FIELD_NAME = '_notes'
 
@@ -1099,6 +1201,7 @@ class NotesCopyField(CopyField):
 
 
 class TagsCopyField(CopyField):
+    __slots__ = ()
 
     FIELD_NAME = '_tags'
 
@@ -1120,6 +1223,7 @@ class TagsCopyField(CopyField):
 
 
 class ValidationStatusCopyField(CopyField):
+    __slots__ = ()
 
     # `FIELD_NAME` specifies both the name of the field in the source data and
     # the label to be used for the field in exports
@@ -1144,6 +1248,8 @@ class ValidationStatusCopyField(CopyField):
 
 
 class FormGPSField(FormField):
+    __slots__ = ()
+
     def __init__(
         self,
         name,
@@ -1246,11 +1352,10 @@ class FormGPSField(FormField):
             val = ''
 
         values = [val, '', '', '', '']
-        for i, value in enumerate(val.split(), 1):
-            if not xls_types_as_text:
-                values[i] = self.try_get_number(value)
-            else:
-                values[i] = value
+        coordinates = val.split()
+        if not xls_types_as_text:
+            coordinates = try_get_numbers(coordinates)
+        values[1:len(coordinates) + 1] = coordinates
 
         return dict(zip(self.get_value_names(), values))
 
@@ -1260,6 +1365,13 @@ class FormChoiceField(ExtendedFormField):
     Same as FormField, but link the data to a FormChoice
     """
 
+    __slots__ = (
+        'choice',
+        'or_other',
+        '_choice_cache',
+        '_choice_cache_source',
+    )
+
     def __init__(
         self,
         name,
@@ -1274,15 +1386,47 @@ class FormChoiceField(ExtendedFormField):
     ):
         self.choice = choice or FormChoice(name)
         self.or_other = or_other
+        # Lookup tables derived from the options, see `_get_choice_cache()`
+        self._choice_cache = {}
+        self._choice_cache_source = None
         super().__init__(
             name, labels, data_type, hierarchy, section, *args, **kwargs
         )
 
-    def get_translation(self, val, lang=UNSPECIFIED_TRANSLATION):
+    def _get_choice_cache(self):
+        """
+        Return the dict lookup tables derived from the options of the choice
+        list are cached in. It is emptied whenever the options are replaced,
+        e.g. by `merge_choice()`.
+        """
+        options = self.choice.options
+        if options is not self._choice_cache_source:
+            self._choice_cache = {}
+            self._choice_cache_source = options
+        return self._choice_cache
+
+    def _get_option_labels(self, lang=UNSPECIFIED_TRANSLATION):
+        """
+        Return a flat dict of the label in `lang` of each option, by option
+        name, leaving out options without a label in `lang`. It is built once
+        per language.
+        """
+        cache = self._get_choice_cache()
         try:
-            translation = self.choice.options[val]['labels'][lang]
+            return cache['labels', lang]
         except KeyError:
-            return val
+            pass
+
+        option_labels = cache['labels', lang] = {}
+        for option_name, option in self.choice.options.items():
+            try:
+                option_labels[option_name] = option['labels'][lang]
+            except KeyError:
+                continue
+        return option_labels
+
+    def get_translation(self, val, lang=UNSPECIFIED_TRANSLATION):
+        translation = self._get_option_labels(lang).get(val)
 
         if translation is None:
             return val
@@ -1307,6 +1451,10 @@ class FormChoiceField(ExtendedFormField):
 
         return {self.name: self.try_get_number(val)}
 
+    def get_stats_accumulator(self, sketch_size=None):
+        # The number of distinct values is bounded by the choice list
+        return ChoiceAccumulator(self.choice.options)
+
     def get_stats(self, metrics, lang=UNSPECIFIED_TRANSLATION, limit=100):
 
         stats = super().get_stats(metrics, lang, limit)
@@ -1346,18 +1494,40 @@ class FormChoiceField(ExtendedFormField):
 
         return stats
 
-    def merge_choice(self, choice):
+    def merge_choice(self, choice, merged_choices=None):
         """
         Update `new_field.choice` so that it contains everything from
         `old_field.choice`. In the event of a conflict, `new_field.choice`
         wins. If either field does not have a `choice` attribute, do
         nothing
 
+        The field gets a new `FormChoice`: choice lists may be shared by
+        several fields and versions, and are never modified in place.
+
         :param choice: formpack.schema.datadef.FormChoice
+        :param merged_choices: dict. Choice lists already merged, by ids of
+            the lists they were merged from, so that fields sharing the same
+            lists also share the merged one. The lists are kept along with
+            the merged one for their ids to remain valid.
         """
-        combined_options = choice.options.copy()
-        combined_options.update(self.choice.options)
-        self.choice.options = combined_options
+        if choice is self.choice:
+            return
+
+        if merged_choices is None:
+            merged_choices = {}
+        key = (id(choice), id(self.choice))
+        try:
+            merged_choice = merged_choices[key][-1]
+        except KeyError:
+            combined_options = choice.options.copy()
+            combined_options.update(self.choice.options)
+            merged_choice = FormChoice(self.choice.name)
+            merged_choice.options = combined_options
+            merged_choices[key] = (choice, self.choice, merged_choice)
+
+        self.choice = merged_choice
+        # Cached lookup tables are stale
+        self._choice_cache = {}
 
 
 class FormChoiceFieldWithMultipleSelect(FormChoiceField):
@@ -1365,6 +1535,8 @@ class FormChoiceFieldWithMultipleSelect(FormChoiceField):
     Same as FormChoiceField, but you can select several answer
     """
 
+    __slots__ = ()
+
     def _get_option_label(
         self,
         lang=UNSPECIFIED_TRANSLATION,
@@ -1435,7 +1607,36 @@ class FormChoiceFieldWithMultipleSelect(FormChoiceField):
         data = (self.name, self.data_type)
         return "<FormChoiceFieldWithMultipleSelect name='%s' type='%s'>" % data
 
-    # maybe try to cache those
+    def _get_cells_template(self, multiple_select, filler):
+        """
+        Return the cells of `format()`, all filled with `filler`. Templates
+        are built once per `multiple_select` mode and filler, and must be
+        copied before being filled in.
+        """
+        cache = self._get_choice_cache()
+        key = ('template', multiple_select, filler)
+        try:
+            return cache[key]
+        except KeyError:
+            template = cache[key] = dict.fromkeys(
+                self.get_value_names(multiple_select=multiple_select), filler
+            )
+            return template
+
+    def _get_option_columns(self):
+        """
+        Return the name of the details column of each option, by option name
+        """
+        cache = self._get_choice_cache()
+        try:
+            return cache['columns']
+        except KeyError:
+            option_columns = cache['columns'] = {
+                option_name: self.name + '/' + option_name
+                for option_name in self.choice.options
+            }
+            return option_columns
+
     def format(
         self,
         val,
@@ -1459,24 +1660,12 @@ class FormChoiceFieldWithMultipleSelect(FormChoiceField):
         if val is None:
             # If the value is missing, do not imply that any response was
             # received: fill with empty strings instead of zeros
-            return dict.fromkeys(
-                self.get_value_names(multiple_select=multiple_select), ''
-            )
+            return self._get_cells_template(multiple_select, '').copy()
 
-        cells = dict.fromkeys(
-            self.get_value_names(multiple_select=multiple_select), _zero
-        )
+        cells = self._get_cells_template(multiple_select, _zero).copy()
         if multiple_select in ('both', 'summary'):
-            res = []
-            for v in val.split():
-                try:
-                    label = self.choice.options[v]['labels'][lang]
-                except KeyError:
-                    label = None
-                if label:
-                    res.append(label)
-                else:
-                    res.append(v)
+            option_labels = self._get_option_labels(lang)
+            res = [option_labels.get(v) or v for v in val.split()]
 
             if len(res) == 1 and not xls_types_as_text:
                 _res = self.try_get_number(res[0])
@@ -1485,14 +1674,18 @@ class FormChoiceFieldWithMultipleSelect(FormChoiceField):
             cells[self.name] = _res
 
         if multiple_select in ('both', 'details'):
+            option_columns = self._get_option_columns()
             for choice in val.split():
-                cells[self.name + '/' + choice] = _one
+                try:
+                    cells[option_columns[choice]] = _one
+                except KeyError:
+                    # Unknown choice, e.g. "other"
+                    cells[self.name + '/' + choice] = _one
 
         return cells
 
     def parse_values(self, raw_values):
-        for x in raw_values.split():
-            yield x
+        return raw_values.split()
 
 
 class FormLiteracyTestField(FormChoiceFieldWithMultipleSelect):
@@ -1510,6 +1703,8 @@ class FormLiteracyTestField(FormChoiceFieldWithMultipleSelect):
         11-  Values of words read incorrectly (as in a typical multiple select)
     '''
 
+    __slots__ = ('parameters_in_use',)
+
     PREPENDED_PARAMETERS = [
         # Tuples of (name, label)
         ('word_at_flash', 'Word at flash'),
@@ -55,7 +55,7 @@ class FormSubmission:
 
     @classmethod
     def from_xml(cls, xml, version=None):
-        xmljson = OrderedDict(parse_xmljson_to_data(xml, [], []))
+        xmljson = OrderedDict(parse_xmljson_to_data(xml))
         return cls(xmljson, version)
 
 
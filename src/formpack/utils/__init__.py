@@ -7,3 +7,4 @@ from .xform_tools import (
     get_version_identifiers,
     normalize_data_type,
 )
+from .xform_tools import iter_xml_submissions  # noqa
@@ -0,0 +1,891 @@
+# -*- coding: utf-8 -*-
+"""
+Typed accumulators used by `AutoReport` to collect statistics about one
+field in a single pass over the submissions.
+
+Each field picks the accumulator it needs with `get_stats_accumulator()`, so
+that only what its `get_stats()` actually uses is kept in memory: a field
+which only reports how many answers were provided does not keep a counter of
+every distinct answer.
+
+Accumulators filled from different sets of submissions can be combined with
+`merge()`. Merging them in the order their submissions were read gives the
+exact same result, including the order in which values were first seen, as
+reading all the submissions with a single accumulator. `to_dict()` and
+`accumulator_from_dict()` (de)serialize them to JSON-compatible structures.
+
+Fields with an unbounded number of distinct answers (free text, decimal
+numbers) also have approximate accumulators, which keep at most
+`sketch_size` values and report the bounds of their errors with
+`get_error_bounds()`.
+"""
+import math
+from collections import Counter, OrderedDict
+from fractions import Fraction
+from heapq import nlargest
+from operator import itemgetter
+from statistics import StatisticsError
+
+from .statistics import sqrt_of_fraction
+
+DEFAULT_SKETCH_SIZE = 1000
+
+
+class CountAccumulator:
+    """
+    Count provided and not provided answers, ignoring the values themselves
+    """
+
+    kind = 'count'
+
+    def __init__(self):
+        self.provided = 0
+        self.not_provided = 0
+
+    @property
+    def total_count(self):
+        return self.provided + self.not_provided
+
+    def add(self, values):
+        """
+        Record one answer.
+
+        :param values: tuple. The parsed values of the answer, as returned by
+            `FormField.parse_values()`
+        """
+        self.provided += 1
+
+    def add_missing(self):
+        """
+        Record a blank (or unparsable) answer
+        """
+        self.not_provided += 1
+
+    def merge(self, other):
+        """
+        Add everything `other` has accumulated to this accumulator.
+
+        :param other: CountAccumulator. An accumulator of the same type
+        :return: CountAccumulator. This accumulator
+        """
+        if other.kind != self.kind:
+            raise TypeError(
+                f'Cannot merge a {other.kind} accumulator '
+                f'into a {self.kind} accumulator'
+            )
+        self.provided += other.provided
+        self.not_provided += other.not_provided
+        self._merge_values(other)
+        return self
+
+    def _merge_values(self, other):
+        pass
+
+    def get_error_bounds(self):
+        """
+        Return the bounds of the errors of the stats computed from this
+        accumulator, to be added to them. Exact accumulators have none.
+        """
+        return {}
+
+    def to_dict(self):
+        return {
+            'type': self.kind,
+            'provided': self.provided,
+            'not_provided': self.not_provided,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = cls()
+        accumulator.provided = data['provided']
+        accumulator.not_provided = data['not_provided']
+        return accumulator
+
+
+class FrequencyAccumulator(CountAccumulator):
+    """
+    Count how many times each value has been answered.
+
+    Values are kept in order of first appearance, which is used to break ties
+    in `most_common()`.
+    """
+
+    kind = 'frequency'
+
+    def __init__(self):
+        super().__init__()
+        self.counter = Counter()
+
+    def add(self, values):
+        self.provided += 1
+        counter = self.counter
+        for value in values:
+            counter[value] += 1
+
+    def _merge_values(self, other):
+        self.counter.update(other.counter)
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['counts'] = [list(item) for item in self.counter.items()]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = super().from_dict(data)
+        accumulator.counter.update(dict(map(tuple, data['counts'])))
+        return accumulator
+
+    def items(self):
+        return self.counter.items()
+
+    def most_common(self, n=None):
+        return self.counter.most_common(n)
+
+
+class ChoiceAccumulator(CountAccumulator):
+    """
+    Count answers of a choice question in an integer array indexed by choice.
+
+    Slots are allocated for all the choices of the list up front; values
+    which are not part of the list (e.g. answers to a removed choice) get a
+    new slot the first time they are seen.
+    """
+
+    kind = 'choice'
+
+    def __init__(self, choices=()):
+        super().__init__()
+        self.slots = {}
+        self.names = []
+        for name in choices:
+            self._get_slot(name)
+        self.counts = [0] * len(self.names)
+        # Slots in order of first appearance
+        self.order = []
+
+    def _get_slot(self, name):
+        try:
+            return self.slots[name]
+        except KeyError:
+            slot = self.slots[name] = len(self.names)
+            self.names.append(name)
+            return slot
+
+    def add(self, values):
+        self.provided += 1
+        slots = self.slots
+        counts = self.counts
+        for value in values:
+            try:
+                slot = slots[value]
+            except KeyError:
+                slot = self._get_slot(value)
+                counts.append(0)
+            if not counts[slot]:
+                self.order.append(slot)
+            counts[slot] += 1
+
+    def _merge_values(self, other):
+        counts = self.counts
+        for name, count in other.items():
+            slot = self._get_slot(name)
+            if slot == len(counts):
+                counts.append(0)
+            if not counts[slot]:
+                self.order.append(slot)
+            counts[slot] += count
+
+    def to_dict(self):
+        data = super().to_dict()
+        data.update(
+            {
+                'choices': self.names,
+                'counts': self.counts,
+                'order': self.order,
+            }
+        )
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = super().from_dict(data)
+        for name in data['choices']:
+            accumulator._get_slot(name)
+        accumulator.counts = list(data['counts'])
+        accumulator.order = list(data['order'])
+        return accumulator
+
+    def items(self):
+        names = self.names
+        counts = self.counts
+        return [(names[slot], counts[slot]) for slot in self.order]
+
+    def most_common(self, n=None):
+        if n is None:
+            return sorted(self.items(), key=itemgetter(1), reverse=True)
+        return nlargest(n, self.items(), key=itemgetter(1))
+
+
+class NumericAccumulator(CountAccumulator):
+    """
+    Keep a histogram of numeric answers, along with exact running sums of
+    the values and of their squares.
+
+    The mean and standard deviation are computed from the running sums, the
+    median and mode from the histogram, without expanding it back into the
+    full dataset. Results are the same as the ones of the `statistics`
+    module, except for the standard deviation, which is the correctly
+    rounded square root of the exact variance and may thus differ from the
+    one of `statistics.stdev()` in its last bit.
+    """
+
+    kind = 'numeric'
+
+    def __init__(self):
+        super().__init__()
+        self.histogram = Counter()
+        self.count = 0
+        # Integers are summed as is, floats as integer ratios grouped by
+        # denominator, like `statistics` does
+        self._int_sum = 0
+        self._int_sum_of_squares = 0
+        self._ratio_sums = {}
+        self._ratio_sums_of_squares = {}
+        # Sum of the infinite and NaN values, if any
+        self._non_finite_sum = None
+
+    def add(self, values):
+        self.provided += 1
+        for value in values:
+            self.add_value(value)
+
+    def add_value(self, value, count=1):
+        """
+        Record `count` occurrences of `value`, without counting them as
+        answers
+        """
+        self.histogram[value] += count
+        self.count += count
+        if type(value) is int:
+            self._int_sum += value * count
+            self._int_sum_of_squares += value * value * count
+            return
+
+        try:
+            numerator, denominator = value.as_integer_ratio()
+        except (OverflowError, ValueError):
+            if self._non_finite_sum is None:
+                self._non_finite_sum = value
+            else:
+                self._non_finite_sum += value
+            return
+
+        ratio_sums = self._ratio_sums
+        ratio_sums[denominator] = (
+            ratio_sums.get(denominator, 0) + numerator * count
+        )
+        squares = self._ratio_sums_of_squares
+        squares[denominator] = (
+            squares.get(denominator, 0) + numerator * numerator * count
+        )
+
+    def _merge_values(self, other):
+        self.histogram.update(other.histogram)
+        self.count += other.count
+        self._int_sum += other._int_sum
+        self._int_sum_of_squares += other._int_sum_of_squares
+        for denominator, numerator in other._ratio_sums.items():
+            self._ratio_sums[denominator] = (
+                self._ratio_sums.get(denominator, 0) + numerator
+            )
+        squares = self._ratio_sums_of_squares
+        for denominator, numerator in other._ratio_sums_of_squares.items():
+            squares[denominator] = squares.get(denominator, 0) + numerator
+        if other._non_finite_sum is not None:
+            if self._non_finite_sum is None:
+                self._non_finite_sum = other._non_finite_sum
+            else:
+                self._non_finite_sum += other._non_finite_sum
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['histogram'] = [list(item) for item in self.histogram.items()]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = super().from_dict(data)
+        for value, count in data['histogram']:
+            accumulator.add_value(value, count)
+        return accumulator
+
+    def items(self):
+        return self.histogram.items()
+
+    @staticmethod
+    def _value_at(sorted_items, index):
+        """
+        Return the value at `index` in the dataset described by the sorted
+        histogram items `sorted_items`
+        """
+        seen = 0
+        for value, count in sorted_items:
+            seen += count
+            if seen > index:
+                return value
+        raise IndexError(index)
+
+    def _get_sums(self):
+        """
+        Return the exact sums of the values and of their squares
+        """
+        total = Fraction(self._int_sum)
+        for denominator, numerator in self._ratio_sums.items():
+            total += Fraction(numerator, denominator)
+        total_of_squares = Fraction(self._int_sum_of_squares)
+        for denominator, numerator in self._ratio_sums_of_squares.items():
+            total_of_squares += Fraction(numerator, denominator * denominator)
+        return total, total_of_squares
+
+    def mean(self):
+        if not self.count:
+            raise StatisticsError('mean requires at least one data point')
+        if self._non_finite_sum is not None:
+            return self._non_finite_sum
+
+        total, _ = self._get_sums()
+        mean = total / self.count
+        if mean.denominator == 1 and not self._ratio_sums:
+            return int(mean)
+        return float(mean)
+
+    def median(self):
+        n = self.count
+        if not n:
+            raise StatisticsError('no median for empty data')
+
+        sorted_items = sorted(self.histogram.items())
+        middle = n // 2
+        if n % 2 == 1:
+            return self._value_at(sorted_items, middle)
+        return (
+            self._value_at(sorted_items, middle - 1)
+            + self._value_at(sorted_items, middle)
+        ) / 2
+
+    def stdev(self, xbar=None):
+        """
+        :param xbar: ignored, the exact mean being used instead. Accepted
+            for compatibility with `statistics.stdev()`
+        """
+        n = self.count
+        if n < 2:
+            raise StatisticsError('stdev requires at least two data points')
+        if self._non_finite_sum is not None:
+            return math.nan
+
+        total, total_of_squares = self._get_sums()
+        sum_of_squares = total_of_squares - total * total / n
+        return sqrt_of_fraction(sum_of_squares / (n - 1))
+
+    def mode(self):
+        if not self.histogram:
+            raise StatisticsError('no mode for empty data')
+
+        highest = max(self.histogram.values())
+        modes = [
+            value
+            for value, count in self.histogram.items()
+            if count == highest
+        ]
+        if len(modes) > 1:
+            raise StatisticsError('no unique mode')
+        return modes[0]
+
+
+class HeavyHittersSketch:
+    """
+    Count the most frequent values of a stream while keeping at most
+    `size` of them, with the Misra-Gries algorithm.
+
+    Counts are lower bounds of the actual counts, underestimated by at most
+    `error`, which is never more than the number of values read divided by
+    `size + 1`. Every value read more often than that is kept.
+    """
+
+    def __init__(self, size=DEFAULT_SKETCH_SIZE):
+        self.size = size
+        self.counter = Counter()
+        self.error = 0
+
+    def add(self, value):
+        counter = self.counter
+        if value in counter:
+            counter[value] += 1
+        elif len(counter) < self.size:
+            counter[value] = 1
+        else:
+            self._decrement(1)
+
+    def _decrement(self, amount):
+        counter = self.counter
+        for value, count in list(counter.items()):
+            if count > amount:
+                counter[value] = count - amount
+            else:
+                del counter[value]
+        self.error += amount
+
+    def merge(self, other):
+        self.counter.update(other.counter)
+        self.error += other.error
+        if len(self.counter) > self.size:
+            counts = sorted(self.counter.values(), reverse=True)
+            self._decrement(counts[self.size])
+
+    def to_dict(self):
+        return {
+            'size': self.size,
+            'counts': [list(item) for item in self.counter.items()],
+            'error': self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['size'])
+        sketch.counter.update(dict(map(tuple, data['counts'])))
+        sketch.error = data['error']
+        return sketch
+
+
+class QuantileSketch:
+    """
+    Estimate quantiles of a stream of numbers while keeping
+    O(`size` * log(count / `size`)) of them, with a hierarchy of compactors
+    (as in the KLL sketch, but deterministic).
+
+    Values of level `h` stand for `2 ** h` values each. When a level holds
+    `size` values, they are sorted and every other one is promoted to the
+    next level. The rank of any value estimated from the sketch is off by at
+    most `rank_error`, which never exceeds `count`.
+    """
+
+    def __init__(self, size=DEFAULT_SKETCH_SIZE):
+        self.size = size
+        self.levels = [[]]
+        # Which half of the values the next compaction of each level keeps,
+        # alternated to avoid a systematic bias
+        self.offsets = [0]
+        self.count = 0
+        self.rank_error = 0
+
+    def add(self, value):
+        level = self.levels[0]
+        level.append(value)
+        self.count += 1
+        if len(level) >= self.size:
+            self._compact()
+
+    def _compact(self):
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) >= self.size:
+                level.sort()
+                # Keep a value on this level if there is an odd number of
+                # them, so that the total weight does not change
+                kept = [level.pop()] if len(level) % 2 else []
+                promoted = level[self.offsets[height]::2]
+                self.offsets[height] ^= 1
+                self.levels[height] = kept
+                if height + 1 == len(self.levels):
+                    self.levels.append([])
+                    self.offsets.append(0)
+                self.levels[height + 1].extend(promoted)
+                self.rank_error = min(self.rank_error + 2**height, self.count)
+            height += 1
+
+    def quantile(self, q):
+        """
+        Return the value whose rank is the closest to `q * count`
+        """
+        if not self.count:
+            raise StatisticsError('no quantile for empty data')
+
+        weighted = sorted(
+            (value, 2**height)
+            for height, level in enumerate(self.levels)
+            for value in level
+        )
+        target = q * self.count
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen > target:
+                return value
+        return weighted[-1][0]
+
+    def merge(self, other):
+        for height, level in enumerate(other.levels):
+            if height == len(self.levels):
+                self.levels.append([])
+                self.offsets.append(0)
+            self.levels[height].extend(level)
+        self.count += other.count
+        self.rank_error = min(self.rank_error + other.rank_error, self.count)
+        self._compact()
+
+    def to_dict(self):
+        return {
+            'size': self.size,
+            'levels': self.levels,
+            'offsets': self.offsets,
+            'count': self.count,
+            'rank_error': self.rank_error,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['size'])
+        sketch.levels = [list(level) for level in data['levels']]
+        sketch.offsets = list(data['offsets'])
+        sketch.count = data['count']
+        sketch.rank_error = data['rank_error']
+        return sketch
+
+
+class HeavyHittersAccumulator(CountAccumulator):
+    """
+    Approximate `FrequencyAccumulator`, keeping at most `sketch_size` values
+    (see `HeavyHittersSketch`)
+    """
+
+    kind = 'heavy_hitters'
+
+    def __init__(self, sketch_size=DEFAULT_SKETCH_SIZE):
+        super().__init__()
+        self.sketch = HeavyHittersSketch(sketch_size)
+
+    def add(self, values):
+        self.provided += 1
+        add = self.sketch.add
+        for value in values:
+            add(value)
+
+    def _merge_values(self, other):
+        self.sketch.merge(other.sketch)
+
+    def items(self):
+        return self.sketch.counter.items()
+
+    def most_common(self, n=None):
+        return self.sketch.counter.most_common(n)
+
+    def get_error_bounds(self):
+        return {'approximate': True, 'frequency_error': self.sketch.error}
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['sketch'] = self.sketch.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = super().from_dict(data)
+        accumulator.sketch = HeavyHittersSketch.from_dict(data['sketch'])
+        return accumulator
+
+
+class ApproximateNumericAccumulator(CountAccumulator):
+    """
+    Approximate `NumericAccumulator`, keeping at most `sketch_size` values
+    for the median (see `QuantileSketch`) and for the mode (see
+    `HeavyHittersSketch`).
+
+    The mean and standard deviation are computed from running moments
+    (Welford's algorithm), in floating point arithmetic. The median is off
+    by at most `rank_error` positions in the sorted dataset. The mode is
+    only returned when the sketch guarantees it is unique.
+    """
+
+    kind = 'approximate_numeric'
+
+    def __init__(self, sketch_size=DEFAULT_SKETCH_SIZE):
+        super().__init__()
+        self.count = 0
+        self._mean = 0.0
+        # Sum of squares of differences from the mean
+        self._m2 = 0.0
+        self.quantiles = QuantileSketch(sketch_size)
+        self.heavy_hitters = HeavyHittersSketch(sketch_size)
+
+    def add(self, values):
+        self.provided += 1
+        for value in values:
+            self.count += 1
+            delta = value - self._mean
+            self._mean += delta / self.count
+            self._m2 += delta * (value - self._mean)
+            self.quantiles.add(value)
+            self.heavy_hitters.add(value)
+
+    def _merge_values(self, other):
+        count = self.count + other.count
+        if count:
+            delta = other._mean - self._mean
+            self._m2 += (
+                other._m2 + delta * delta * self.count * other.count / count
+            )
+            self._mean += delta * other.count / count
+        self.count = count
+        self.quantiles.merge(other.quantiles)
+        self.heavy_hitters.merge(other.heavy_hitters)
+
+    def mean(self):
+        if not self.count:
+            raise StatisticsError('mean requires at least one data point')
+        return self._mean
+
+    def median(self):
+        return self.quantiles.quantile(0.5)
+
+    def stdev(self, xbar=None):
+        if self.count < 2:
+            raise StatisticsError('stdev requires at least two data points')
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def mode(self):
+        top = self.heavy_hitters.counter.most_common(2)
+        if not top:
+            raise StatisticsError('no mode for empty data')
+
+        # Any other value may have been read up to `error` more times than
+        # counted
+        runner_up = top[1][1] if len(top) > 1 else 0
+        if top[0][1] <= runner_up + self.heavy_hitters.error:
+            raise StatisticsError('no unique mode')
+        return top[0][0]
+
+    def get_error_bounds(self):
+        return {
+            'approximate': True,
+            'median_rank_error': self.quantiles.rank_error,
+        }
+
+    def to_dict(self):
+        data = super().to_dict()
+        data.update(
+            {
+                'count': self.count,
+                'mean': self._mean,
+                'm2': self._m2,
+                'quantiles': self.quantiles.to_dict(),
+                'heavy_hitters': self.heavy_hitters.to_dict(),
+            }
+        )
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = super().from_dict(data)
+        accumulator.count = data['count']
+        accumulator._mean = data['mean']
+        accumulator._m2 = data['m2']
+        accumulator.quantiles = QuantileSketch.from_dict(data['quantiles'])
+        accumulator.heavy_hitters = HeavyHittersSketch.from_dict(
+            data['heavy_hitters']
+        )
+        return accumulator
+
+
+class SplitterIndex:
+    """
+    Dense indexes of the values of the field a disaggregated report is split
+    by ("splitters"), shared by all the `SplitAccumulator`s of the report so
+    that each splitter is looked up once per submission, not once per field.
+    """
+
+    def __init__(self, splitters=()):
+        self.splitters = []
+        self.indexes = {}
+        for splitter in splitters:
+            self.get_index(splitter)
+
+    def get_index(self, splitter):
+        try:
+            return self.indexes[splitter]
+        except KeyError:
+            index = self.indexes[splitter] = len(self.splitters)
+            self.splitters.append(splitter)
+            return index
+
+
+class SplitAccumulator:
+    """
+    Count, for each value of a field, how many times it has been answered
+    along with each value of the field a disaggregated report is split by.
+
+    `metrics` maps each value, in order of first appearance, to a dict of
+    counts by splitter index (see `SplitterIndex`), also in order of first
+    appearance.
+    """
+
+    kind = 'split'
+
+    def __init__(self, splitter_index=None):
+        if splitter_index is None:
+            splitter_index = SplitterIndex()
+        self.splitter_index = splitter_index
+        self.metrics = {}
+
+    def add(self, values, splitter_index):
+        """
+        Record one answer.
+
+        :param values: tuple. The parsed values of the answer
+        :param splitter_index: int. The index of the value of the split_by
+            field in the same submission
+        """
+        metrics = self.metrics
+        for value in values:
+            try:
+                counts = metrics[value]
+            except KeyError:
+                counts = metrics[value] = {}
+            counts[splitter_index] = counts.get(splitter_index, 0) + 1
+
+    def add_missing(self, splitter_index):
+        self.add((None,), splitter_index)
+
+    @property
+    def provided(self):
+        return sum(
+            sum(counts.values())
+            for value, counts in self.metrics.items()
+            if value is not None
+        )
+
+    @property
+    def not_provided(self):
+        """
+        Number of answers recorded without a value for the split_by field
+        """
+        none_index = self.splitter_index.indexes.get(None)
+        if none_index is None:
+            return 0
+        return sum(
+            counts.get(none_index, 0) for counts in self.metrics.values()
+        )
+
+    def items(self):
+        """
+        Yield each value with a new dict of its counts by splitter, leaving
+        out answers without a value for the split_by field
+        """
+        splitters = self.splitter_index.splitters
+        for value, counts in self.metrics.items():
+            counter = OrderedDict()
+            for index, count in counts.items():
+                splitter = splitters[index]
+                if splitter is not None:
+                    counter[splitter] = count
+            yield value, counter
+
+    def get_numeric_accumulators(self):
+        """
+        Return one `NumericAccumulator` by splitter, recording the values
+        answered along with it, leaving out blank answers and answers
+        without a value for the split_by field.
+
+        :return: list of `(splitter, accumulator)` tuples, in order of first
+            appearance of the splitters
+        """
+        splitters = self.splitter_index.splitters
+        accumulators = {}
+        for value, counts in self.metrics.items():
+            if value is None:
+                continue
+            for index, count in counts.items():
+                try:
+                    accumulator = accumulators[index]
+                except KeyError:
+                    accumulator = accumulators[index] = NumericAccumulator()
+                accumulator.add_value(value, count)
+
+        return [
+            (splitters[index], accumulator)
+            for index, accumulator in accumulators.items()
+            if splitters[index] is not None
+        ]
+
+    def merge(self, other):
+        if other.kind != self.kind:
+            raise TypeError(
+                f'Cannot merge a {other.kind} accumulator '
+                f'into a {self.kind} accumulator'
+            )
+
+        # Map indexes of `other` to the ones of this accumulator
+        get_index = self.splitter_index.get_index
+        indexes = [
+            get_index(splitter)
+            for splitter in other.splitter_index.splitters
+        ]
+        metrics = self.metrics
+        for value, other_counts in other.metrics.items():
+            try:
+                counts = metrics[value]
+            except KeyError:
+                counts = metrics[value] = {}
+            for other_index, count in other_counts.items():
+                index = indexes[other_index]
+                counts[index] = counts.get(index, 0) + count
+
+        return self
+
+    def to_dict(self):
+        splitters = self.splitter_index.splitters
+        return {
+            'type': self.kind,
+            'metrics': [
+                [value, [[splitters[i], count] for i, count in counts.items()]]
+                for value, counts in self.metrics.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data, splitter_index=None):
+        accumulator = cls(splitter_index)
+        get_index = accumulator.splitter_index.get_index
+        for value, counts in data['metrics']:
+            accumulator.metrics[value] = {
+                get_index(splitter): count for splitter, count in counts
+            }
+        return accumulator
+
+
+ACCUMULATOR_CLASSES = {
+    cls.kind: cls
+    for cls in (
+        CountAccumulator,
+        FrequencyAccumulator,
+        ChoiceAccumulator,
+        NumericAccumulator,
+        HeavyHittersAccumulator,
+        ApproximateNumericAccumulator,
+        SplitAccumulator,
+    )
+}
+
+
+def accumulator_from_dict(data):
+    """
+    Rebuild an accumulator from the output of its `to_dict()` method
+    """
+    try:
+        cls = ACCUMULATOR_CLASSES[data['type']]
+    except KeyError:
+        raise ValueError(f'Unknown accumulator type: {data.get("type")!r}')
+    return cls.from_dict(data)
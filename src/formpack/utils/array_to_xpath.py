@@ -19,6 +19,8 @@ SPACE_PADDING = {
 def _case_fn(args):
     if len(args) < 1:
         raise ValueError('empty @case expression')
+    # pop from a copy: `args` belongs to the content being converted
+    args = list(args)
 
     def _pop_arg():
         return False if len(args) == 0 else args.pop()
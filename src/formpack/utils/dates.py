@@ -0,0 +1,106 @@
+# coding: utf-8
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+from dateutil import parser, tz
+
+# Strict ISO-8601 dates and datetimes, as produced by ODK/Enketo, e.g.
+# `2016-03-14`, `2016-03-14T14:15:48.000-04:00` or `2017-12-27T20:58:25`
+ISO8601_REGEX = re.compile(
+    r'(?P<year>[0-9]{4})-(?P<month>[0-9]{2})-(?P<day>[0-9]{2})'
+    r'(?:[T ](?P<hour>[0-9]{2}):(?P<minute>[0-9]{2})'
+    r'(?::(?P<second>[0-9]{2})(?:[.,](?P<fraction>[0-9]{1,9}))?)?'
+    r'(?P<tz>Z|[+-][0-9]{2}(?::?[0-9]{2})?)?)?'
+)
+
+# Number of distinct values whose parsing is memoized by `parse_datetime()`.
+# Submissions of a same batch often share their dates (e.g. `today`)
+PARSE_CACHE_SIZE = 1024
+
+
+def _get_tzinfo(offset):
+    """
+    Return the `dateutil` timezone of a `Z`, `±HH`, `±HHMM` or `±HH:MM`
+    offset, like `dateutil.parser.parse()` does
+    """
+    if offset == 'Z':
+        return tz.tzutc()
+    sign = -1 if offset[0] == '-' else 1
+    offset = offset[1:].replace(':', '')
+    seconds = int(offset[:2]) * 3600 + int(offset[2:] or 0) * 60
+    return tz.tzoffset(None, sign * seconds)
+
+
+def _datetime_from_match(match):
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        # Keep microseconds, truncating nanoseconds
+        int(fraction[:6].ljust(6, '0')) if fraction else 0,
+        tzinfo=_get_tzinfo(offset) if offset else None,
+    )
+
+
+def parse_iso8601(value):
+    """
+    Parse a strict ISO-8601 date or datetime string.
+
+    :param value: str
+    :return: date if `value` has no time part, datetime otherwise. Datetimes
+        are timezone aware if `value` has an offset.
+    :raises ValueError: if `value` is not a valid ISO-8601 date or datetime
+    """
+    match = ISO8601_REGEX.fullmatch(value)
+    if match is None:
+        raise ValueError(f'Invalid ISO-8601 date: {value!r}')
+
+    if match['hour'] is None:
+        return date(int(match['year']), int(match['month']), int(match['day']))
+
+    return _datetime_from_match(match)
+
+
+def _is_utc(offset):
+    return offset is not None and not offset.strip('Z+-0:')
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_datetime(value):
+    match = ISO8601_REGEX.fullmatch(value)
+    # `dateutil` returns the local timezone for UTC dates on servers running
+    # in UTC, so leave them to it to get the very same result
+    if match is not None and not _is_utc(match['tz']):
+        try:
+            return _datetime_from_match(match)
+        except ValueError:
+            # Out of range values, e.g. `2021-02-30`
+            pass
+
+    try:
+        return parser.parse(value)
+    except ValueError:
+        # Remember unparsable values too, e.g. blank ones
+        return None
+
+
+def parse_datetime(value):
+    """
+    Parse a date or datetime string the same way `dateutil.parser.parse()`
+    does, only faster: strict ISO-8601 values are parsed with a regular
+    expression, `dateutil` being the fallback for any other format, and
+    results are memoized.
+
+    :param value: str
+    :return: datetime
+    :raises ValueError: if `value` cannot be parsed
+    """
+    result = _parse_datetime(value)
+    if result is None:
+        raise ValueError(f'Unknown date format: {value!r}')
+    return result
@@ -6,11 +6,13 @@
 import re
 from collections import OrderedDict
 from copy import deepcopy
+from functools import lru_cache
 from typing import (
     Any,
     Dict,
     List,
     Optional,
+    Pattern,
     Set,
     Tuple,
     Union,
@@ -31,6 +33,67 @@ REMOVE_EMPTY_STRINGS = True
 # asset content
 SCHEMA_VERSION = '1'
 
+# e.g. `label::English` or `hint::English`
+TRANSLATED_COLUMN_REGEX = re.compile(r'^([^:]+)\s*::?\s*([^:]+)$')
+HXL_TAG_REGEX = re.compile(r'([\#\+][a-zA-Z][a-zA-Z0-9_]*)')
+OR_OTHER_REGEX = re.compile(r'\s+(or.other)$')
+SELECT_OR_OTHER_REGEX = re.compile('select_(one|multiple)(_or_other)')
+# Select types are looked up in `selects` with the part before the list name
+SELECT_REGEX = re.compile(r'^(.+?)\s+(\S+)$')
+
+
+@lru_cache(maxsize=None)
+def _get_media_column_regexes(
+    media_column_names: Tuple[str, ...],
+) -> Tuple[Pattern, Pattern]:
+    """
+    Return the compiled regular expressions matching translated media
+    columns, e.g. `media::image::English` or `image::English`, and
+    untranslated ones, e.g. `media::image` or `image`
+    """
+    re_media_column_names = '|'.join(media_column_names)
+    return (
+        re.compile(
+            rf'^(media\s*::?\s*)?({re_media_column_names})\s*::?\s*([^:]+)$'
+        ),
+        re.compile(rf'^(media\s*::?\s*)?({re_media_column_names})$'),
+    )
+
+
+def _match_special_col(column_name: str) -> Optional[Dict[str, str]]:
+    """
+    Return how to expand a media column or a column with ':'s, as a dict of
+    the `column` it belongs to, its `translation`, and its `coltype` and
+    `media` type for media columns, or `None` if it is not special
+    """
+    translated_media_column_regex, media_column_regex = (
+        _get_media_column_regexes(MEDIA_COLUMN_NAMES)
+    )
+    mtch = translated_media_column_regex.match(column_name)
+    if mtch:
+        matched = mtch.groups()
+        media_type = matched[1]
+        return {
+            'column': 'media::{}'.format(media_type),
+            'coltype': 'media',
+            'media': media_type,
+            'translation': matched[2],
+        }
+    mtch = media_column_regex.match(column_name)
+    if mtch:
+        media_type = mtch.groups()[1]
+        return {
+            'column': 'media::{}'.format(media_type),
+            'coltype': 'media',
+            'media': media_type,
+            'translation': UNTRANSLATED,
+        }
+    mtch = TRANSLATED_COLUMN_REGEX.match(column_name)
+    if mtch:
+        matched = mtch.groups()
+        return {'column': matched[0], 'translation': matched[1]}
+    return None
+
 
 def _expand_translatable_content(
     content: Dict[str, List[Any]],
@@ -74,7 +137,7 @@ def _expand_tags(
     for tag_col in tag_cols_and_seps.keys():
         tags_str = row.pop(tag_col, None)
         if tags_str and isinstance(tags_str, str):
-            for tag in re.findall(r'([\#\+][a-zA-Z][a-zA-Z0-9_]*)', tags_str):
+            for tag in HXL_TAG_REGEX.findall(tags_str):
                 tags.append(f'hxl:{tag}')
     if tags:
         row['tags'] = tags
@@ -103,16 +166,25 @@ def expand_content_in_place(content: Dict[str, List[Any]]) -> None:
 
     survey_content = content.get('survey', [])
     _metas = []
+    _others = []
+    # Forms use a handful of distinct types, expand each one once
+    expanded_types = {}
 
     for row in survey_content:
         if 'name' in row and row['name'] is None:
             del row['name']
+        if 'type' in row and row['type'] in META_TYPES:
+            _metas.append(row)
+        else:
+            _others.append(row)
         if 'type' in row:
             _type = row['type']
-            if _type in META_TYPES:
-                _metas.append(row)
             if isinstance(_type, str):
-                row.update(_expand_type_to_dict(row['type']))
+                expanded_type = expanded_types.get(_type)
+                if expanded_type is None:
+                    expanded_type = _expand_type_to_dict(_type)
+                    expanded_types[_type] = expanded_type
+                row.update(expanded_type)
             elif isinstance(_type, dict):
                 # legacy {'select_one': 'xyz'} format might
                 # still be on kobo-prod
@@ -137,16 +209,13 @@ def expand_content_in_place(content: Dict[str, List[Any]]) -> None:
                 _expand_translatable_content(content, row, key, vals)
 
         if REMOVE_EMPTY_STRINGS:
-            row_copy = dict(row)
-            for key, val in row_copy.items():
-                if val == '':
-                    del row[key]
+            for key in [key for key, val in row.items() if val == '']:
+                del row[key]
 
     # for now, prepend meta questions to the beginning of the survey
     # eventually, we may want to create a new "sheet" with these fields
-    for row in _metas[::-1]:
-        survey_content.remove(row)
-        survey_content.insert(0, row)
+    if _metas:
+        survey_content[:] = _metas + _others
 
     for row in content.get('choices', []):
         for key, vals in iter(specials.items()):
@@ -208,30 +277,26 @@ def _get_special_survey_cols(
         'hint::English',
     For more examples, see tests.
     """
-    RE_MEDIA_COLUMN_NAMES = '|'.join(MEDIA_COLUMN_NAMES)
-
-    uniq_cols = OrderedDict()
     special = OrderedDict()
 
     known_translated_cols = _get_known_translated_cols(
         content.get('translated')
     )
-
-    def _pluck_uniq_cols(sheet_name: str) -> None:
-        for row in content.get(sheet_name, []):
-            # we don't want to expand columns which are already known
-            # to be parsed and translated in a previous iteration
-            _cols = [r for r in row.keys() if r not in known_translated_cols]
-
-            uniq_cols.update(OrderedDict.fromkeys(_cols))
+    # we don't want to expand columns which are already known
+    # to be parsed and translated in a previous iteration
+    skipped_cols = set(known_translated_cols)
+    uniq_cols = OrderedDict.fromkeys(
+        col
+        for sheet_name in ('survey', 'choices')
+        for row in content.get(sheet_name, [])
+        for col in row
+        if col not in skipped_cols
+    )
 
     def _mark_special(**kwargs: str) -> None:
         column_name = kwargs.pop('column_name')
         special[column_name] = kwargs
 
-    _pluck_uniq_cols('survey')
-    _pluck_uniq_cols('choices')
-
     for column_name in uniq_cols.keys():
         if column_name in ['label', 'hint']:
             _mark_special(
@@ -245,55 +310,20 @@ def _get_special_survey_cols(
             continue
         if column_name.startswith('body:'):
             continue
-        mtch = re.match(
-            rf'^(media\s*::?\s*)?({RE_MEDIA_COLUMN_NAMES})\s*::?\s*([^:]+)$',
-            column_name,
-        )
-        if mtch:
-            matched = mtch.groups()
-            media_type = matched[1]
-            translation = matched[2]
-            _mark_special(
-                column_name=column_name,
-                column='media::{}'.format(media_type),
-                coltype='media',
-                media=media_type,
-                translation=translation,
-            )
+        column_info = _match_special_col(column_name)
+        if column_info is None:
             continue
-        mtch = re.match(
-            rf'^(media\s*::?\s*)?({RE_MEDIA_COLUMN_NAMES})$', column_name
-        )
-        if mtch:
-            matched = mtch.groups()
-            media_type = matched[1]
-            _mark_special(
-                column_name=column_name,
-                column='media::{}'.format(media_type),
-                coltype='media',
-                media=media_type,
-                translation=UNTRANSLATED,
-            )
-            continue
-        mtch = re.match(r'^([^:]+)\s*::?\s*([^:]+)$', column_name)
-        if mtch:
+        special[column_name] = column_info
+        if 'coltype' not in column_info:
             # example: label::x, constraint_message::x, hint::x
-            matched = mtch.groups()
-            column_shortname = matched[0]
-            _mark_special(
-                column_name=column_name,
-                column=column_shortname,
-                translation=matched[1],
-            )
-
             # also add the empty column if it exists
+            column_shortname = column_info['column']
             if column_shortname in uniq_cols:
                 _mark_special(
                     column_name=column_shortname,
                     column=column_shortname,
                     translation=UNTRANSLATED,
                 )
-            continue
     translations, translated_cols = _get_translations_from_special_cols(
         special,
         content.get('translations', []),
@@ -303,26 +333,23 @@ def _get_special_survey_cols(
 
 
 def _expand_type_to_dict(type_str: str) -> Dict[str, Union[str, bool]]:
-    SELECT_PATTERN = r'^({select_type})\s+(\S+)$'
     out = {}
-    match = re.search(r'\s+(or.other)$', type_str)
+    match = OR_OTHER_REGEX.search(type_str)
     if match:
         type_str = type_str.replace(match.groups()[0], '').strip()
         out[OR_OTHER_COLUMN] = True
-    match = re.search('select_(one|multiple)(_or_other)', type_str)
+    match = SELECT_OR_OTHER_REGEX.search(type_str)
     if match:
         type_str = type_str.replace('_or_other', '')
         out[OR_OTHER_COLUMN] = True
     if type_str in ['select_one', 'select_multiple']:
         out['type'] = type_str
         return out
-    for select_type in selects.keys():
-        match = re.match(
-            SELECT_PATTERN.format(select_type=select_type), type_str
-        )
-        if match:
-            (type_, list_name) = match.groups()
-            matched_type = selects[select_type]
+    match = SELECT_REGEX.match(type_str)
+    if match:
+        (type_, list_name) = match.groups()
+        matched_type = selects.get(type_)
+        if matched_type is not None:
             out['type'] = matched_type
             ref_field_name = 'select_from_list_name'
             if 'from_file' in matched_type:
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Merge of the fields of several versions of a form into a single list, as
+used by `FormPack.get_fields_for_versions()` to build the columns of exports
+and the questions of reports.
+
+Fields are identified by a hashable key, e.g. `(section name, field name)`:
+a field moved to another section gets a new identity, its answers being
+stored under another path in the submissions.
+
+The merged fields come in a stable order:
+
+1. the fields of the newest version, in their order;
+2. then the fields only found in older versions. Each of them follows the
+   field which preceded it in the newest version having it, ahead of what
+   followed that field in newer versions. Fields landing at the same place
+   keep the order of their versions, from newest to oldest.
+
+Versions are added from oldest to newest with `FieldMerge.add_version()`,
+in a time proportional to the size of the added version, so that merging a
+whole version history is linear in the total number of fields.
+"""
+
+
+class _Node:
+    __slots__ = ('field', 'version', 'parent', 'children')
+
+    def __init__(self, field, version, parent=None):
+        self.field = field
+        # Number of the newest version having this field
+        self.version = version
+        # Field preceding this one in that version, `None` for the root
+        self.parent = parent
+        # Fields following this one, from the oldest version to the newest,
+        # as keys of a dict to be moved around in constant time
+        self.children = {}
+
+
+class FieldMerge:
+    def __init__(self, combine=None):
+        """
+        :param combine: callable. Called with the current field and the newer
+            field of a same identity when a version is added, it returns the
+            field to keep. The newer one is kept if it is `None`
+        """
+        self.combine = combine
+        self.version_count = 0
+        self._root = _Node(None, 0)
+        self._nodes = {}
+        self._newest = []
+
+    def add_version(self, fields):
+        """
+        Add a version newer than all the versions already added.
+
+        :param fields: iterable of `(identity, field)` tuples, in the order
+            of the version
+        """
+        self.version_count += 1
+        version = self.version_count
+        root = self._root
+        root.version = version
+
+        newest = []
+        parent = root
+        for identity, field in fields:
+            node = self._nodes.get(identity)
+            if node is None:
+                node = self._nodes[identity] = _Node(field, version)
+            else:
+                if self.combine is not None:
+                    field = self.combine(node.field, field)
+                node.field = field
+                node.version = version
+                del node.parent.children[node]
+            node.parent = parent
+            parent.children[node] = None
+            newest.append(node)
+            parent = node
+
+        self._newest = newest
+
+    def get_fields(self):
+        """
+        Return the merged fields, in the order described in this module.
+
+        :return: list
+        """
+        fields = [node.field for node in self._newest]
+        newest_version = self.version_count
+
+        # Depth-first walk of the fields, each one being followed by the
+        # fields of older versions which came after it, and then by the one
+        # which came after it in its own version
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.version < newest_version:
+                fields.append(node.field)
+            children = list(node.children)
+            if children and children[-1].version == node.version:
+                stack.append(children.pop())
+            stack.extend(children)
+
+        return fields
@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 import re
 from collections import defaultdict, OrderedDict
-from copy import deepcopy
-from functools import reduce
 
 from .array_to_xpath import array_to_xpath
 from .replace_aliases import SELECT_TYPES
@@ -58,12 +56,29 @@ def flatten_content_in_place(
     return None
 
 
+def copy_content_for_flattening(content):
+    """
+    Copy `content` deep enough to flatten the copy without altering
+    `content`: sheets and their rows are copied, but not the values of the
+    rows, which flattening replaces instead of modifying them
+    """
+    content_copy = content.copy()
+    for sheet_name, sheet in content_copy.items():
+        if isinstance(sheet, list):
+            content_copy[sheet_name] = [
+                row.copy() if isinstance(row, dict) else row for row in sheet
+            ]
+        elif isinstance(sheet, dict):
+            content_copy[sheet_name] = sheet.copy()
+    return content_copy
+
+
 def flatten_content(survey_content, in_place=False, **opts):
     if in_place:
         flatten_content_in_place(survey_content, **opts)
         return None
     else:
-        survey_content_copy = deepcopy(survey_content)
+        survey_content_copy = copy_content_for_flattening(survey_content)
         flatten_content_in_place(survey_content_copy, **opts)
         return survey_content_copy
 
@@ -139,19 +154,17 @@ def translated_col_list(columns, translations, translated):
     ):
         raise ValueError('cannot have translations with no translated')
 
-    def _for_each_t(col):
-        return lambda arr, _tr: arr + [
-            col if (_tr is None) else '{}::{}'.format(col, _tr)
-        ]
-
-    def _expand_translateds(arr, col):
+    translated = set(translated)
+    cols = []
+    for col in columns:
         if col in translated:
-            arr += reduce(_for_each_t(col), translations, [])
+            cols.extend(
+                col if (_tr is None) else '{}::{}'.format(col, _tr)
+                for _tr in translations
+            )
         else:
-            arr.append(col)
-        return arr
-
-    return reduce(_expand_translateds, columns, [])
+            cols.append(col)
+    return cols
 
 
 def _flatten_translated_fields(
@@ -160,47 +173,57 @@ def _flatten_translated_fields(
     translated_cols,
     col_order=False,
     strip_empty_vals_from_named_translations=True,
+    known_cols=None,
 ):
+    """
+    :param col_order: list. Columns to update with the ones of the row:
+        missing translated columns are inserted before their untranslated
+        column if it is there, or appended, and columns the row does not
+        have are removed
+    :param known_cols: set. The columns of `col_order`, which callers
+        flattening many rows with the same columns can build once
+    """
     if len(translations) == 0:
         translations = [UNTRANSLATED]
 
     _placed_cols = set()
+    if col_order is not False and known_cols is None:
+        known_cols = set(col_order)
+    # Columns missing from `col_order`, in order of placement, with the
+    # column to insert them before, if any
+    _new_cols = {}
 
     def _place_col_in_order(col_, base_col=None):
         if col_order is False:
             return
-        if col_ in col_order:
-            if col_ not in _placed_cols:
-                _placed_cols.update([col_])
-            return
-        else:
-            if base_col in col_order:
-                _i = col_order.index(base_col)
-                col_order.insert(_i, col_)
-                _placed_cols.update([col_])
-            else:
-                col_order.append(col_)
-                _placed_cols.update([col_])
-
-    o_row = deepcopy(row)
-    translations_range = list(range(0, len(translations)))
-    for key in (k for k in translated_cols if k in row):
+        _placed_cols.add(col_)
+        if col_ not in known_cols and col_ not in _new_cols:
+            known_base = base_col in known_cols or base_col in _new_cols
+            _new_cols[col_] = base_col if known_base else None
+
+    row_translated_cols = [k for k in translated_cols if k in row]
+    # Check every column before altering the row, so that errors come with
+    # the row as it was
+    for key in row_translated_cols:
         items = row[key]
         if not isinstance(items, list):
             raise ValueError(
                 '"{}" column is not translated'.format(
                     key,
                 ),
-                o_row,
+                row,
             )
         if len(items) != len(translations):
             raise ValueError(
                 'Incorrect translation count: "{}"'.format(
                     key,
                 ),
-                o_row,
+                row,
             )
-        del row[key]
+
+    translations_range = list(range(0, len(translations)))
+    for key in row_translated_cols:
+        items = row.pop(key)
         for i in translations_range:
             _t = translations[i]
             try:
@@ -224,9 +247,32 @@ def _flatten_translated_fields(
                 row[_built_colname] = value
                 _place_col_in_order(_built_colname, key)
     _placed_cols.update(row.keys())
+    if _new_cols:
+        col_order[:] = _insert_new_cols(col_order, _new_cols)
     if col_order:
-        for col in (c for c in col_order if c not in _placed_cols):
-            col_order.remove(col)
+        col_order[:] = [c for c in col_order if c in _placed_cols]
+
+
+def _insert_new_cols(col_order, new_cols):
+    """
+    Return `col_order` with `new_cols` inserted, in a single pass.
+
+    :param new_cols: dict. New columns, in order, with the column to insert
+        each of them before, or `None` to append it
+    """
+    appended = []
+    inserted = defaultdict(list)
+    for col, base_col in new_cols.items():
+        if base_col is None:
+            appended.append(col)
+        else:
+            inserted[base_col].append(col)
+
+    cols = []
+    for col in col_order + appended:
+        cols.extend(inserted.get(col, ()))
+        cols.append(col)
+    return cols
 
 
 def _flatten_survey_row(row):
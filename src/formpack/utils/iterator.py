@@ -3,3 +3,43 @@
 
 def get_first_occurrence(obj):
     return next(iter(obj))
+
+
+def iter_repeat_instances(entry, repeat_paths):
+    """
+    Lazily yield the instances of a (possibly nested) repeat group of a
+    submission, without copying them.
+
+    :param entry: dict. The submission
+    :param repeat_paths: list. Paths of the repeat groups from the outermost
+        one to the innermost one, e.g.
+        `['group_tree', 'group_tree/group_nest']`
+    """
+    depth = len(repeat_paths)
+    if not depth:
+        yield entry
+        return
+
+    stack = [iter(_get_repeat_instances(entry, repeat_paths[0]))]
+    while stack:
+        try:
+            instance = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+
+        level = len(stack)
+        if level == depth:
+            yield instance
+        else:
+            stack.append(
+                iter(_get_repeat_instances(instance, repeat_paths[level]))
+            )
+
+
+def _get_repeat_instances(entry, path):
+    instances = entry.get(path) or ()
+    # A single instance may not have been wrapped in a list
+    if isinstance(instances, dict):
+        return (instances,)
+    return instances
@@ -3,9 +3,7 @@ import io
 import itertools
 from collections import OrderedDict
 
-import xlrd
-
-from .xls_to_ss_structure import xls_to_dicts, xlsx_to_dicts
+from .xls_to_ss_structure import is_xls_file, xls_to_dicts, xlsx_to_dicts
 from formpack.constants import (
     KOBO_LOCKING_RESTRICTIONS,
     KOBO_LOCK_COLUMN,
@@ -47,16 +45,12 @@ def get_kobo_locking_profiles(xls_file_object: io.BytesIO) -> list:
         }
     ]
     """
-    try:
-        survey_dict = xls_to_dicts(xls_file_object)
-    except xlrd.biffh.XLRDError:
-        # Do not call `xlsx_to_dicts()` inside here: if it fails, *this* xlrd
-        # exception is what appears as the first traceback, followed by "During
-        # handling of the above exception, another exception occurred", below
-        # which is finally the `xlsx_to_dicts()` error
-        survey_dict = None
-    if not survey_dict:
-        survey_dict = xlsx_to_dicts(xls_file_object)
+    # Only load the locking profiles sheet, of the format the file claims to be
+    if is_xls_file(xls_file_object):
+        to_dicts = xls_to_dicts
+    else:
+        to_dicts = xlsx_to_dicts
+    survey_dict = to_dicts(xls_file_object, sheet_names=[KOBO_LOCK_SHEET])
 
     if KOBO_LOCK_SHEET not in survey_dict:
         return
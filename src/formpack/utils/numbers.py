@@ -0,0 +1,80 @@
+# coding: utf-8
+import math
+import re
+from functools import lru_cache
+
+# Plain integers and floats, i.e. what most numeric answers look like. Longer
+# integers are left to `int()`, which may refuse to convert them
+MAX_INTEGER_DIGITS = 18
+INTEGER_REGEX = re.compile(rf'[+-]?[0-9]{{1,{MAX_INTEGER_DIGITS}}}')
+# Floats need a decimal point or an exponent, not to be confused with integers
+FLOAT_REGEX = re.compile(
+    r'[+-]?(?:(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?'
+    r'|[0-9]+[eE][+-]?[0-9]+)'
+)
+
+# Number of distinct strings whose conversion is memoized. Numeric columns,
+# and choice names, tend to repeat the same values over and over
+NUMBER_CACHE_SIZE = 4096
+
+
+def _get_number(val):
+    str_val = val
+
+    try:
+        val = int(val)
+    except ValueError:
+        pass
+    else:
+        return val
+
+    try:
+        val = float(val)
+    except ValueError:
+        pass
+
+    # The floats `+/-inf` and `nan` cause XLS exports to fail, therefore
+    # return the string value instead.
+    if isinstance(val, float) and not math.isfinite(val):
+        return str_val
+
+    return val
+
+
+@lru_cache(maxsize=NUMBER_CACHE_SIZE)
+def _get_number_from_str(val):
+    # Classify the string once, instead of letting `int()` and `float()`
+    # raise exceptions on anything that is not an integer
+    if INTEGER_REGEX.fullmatch(val):
+        return int(val)
+
+    if FLOAT_REGEX.fullmatch(val):
+        number = float(val)
+        return number if math.isfinite(number) else val
+
+    # Anything else, e.g. text or numbers with spaces or underscores
+    return _get_number(val)
+
+
+def try_get_number(val):
+    """
+    Attempt to convert string values to integers or floats. If the value is
+    `inf` or `nan` or not a valid integer or float then return the string
+    value instead.
+    """
+    if type(val) is str:
+        # Unsigned integers, the most common numeric answers, are converted
+        # faster than they are looked up in the cache
+        if val.isdecimal() and len(val) <= MAX_INTEGER_DIGITS:
+            return int(val)
+        return _get_number_from_str(val)
+    return _get_number(val)
+
+
+def try_get_numbers(values):
+    """
+    Same as `try_get_number()`, for a sequence of values at once
+
+    :return: list
+    """
+    return [try_get_number(val) for val in values]
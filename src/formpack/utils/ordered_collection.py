@@ -82,3 +82,30 @@ class OrderedDefaultdict(OrderedDict):
             self.default_factory,
             list(iter(self.items())),
         )
+
+
+class LRUDict(OrderedDict):
+    """
+    Dict which forgets its least recently used items beyond `maxsize` of
+    them. Items are used when they are set, or read with `get()`.
+    """
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __reduce__(self):  # for pickle support
+        return self.__class__, (self.maxsize,), None, None, iter(self.items())
+
+    def get(self, key, default=None):
+        try:
+            self.move_to_end(key)
+        except KeyError:
+            return default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
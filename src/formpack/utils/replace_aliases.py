@@ -3,6 +3,7 @@ import json
 import re
 from collections import defaultdict, OrderedDict
 from copy import deepcopy
+from functools import lru_cache
 
 from pyxform import aliases as pyxform_aliases
 from pyxform.question_type_dictionary import QUESTION_TYPE_DICT
@@ -20,8 +21,13 @@ TF_COLUMNS = [
 ]
 
 KOBO_SPECIFIC_SUB_PATTERN = r'^kobo(–|—)'
+KOBO_SPECIFIC_SUB_REGEX = re.compile(KOBO_SPECIFIC_SUB_PATTERN)
 KOBO_SPECIFIC_PREFERRED = 'kobo--'
 
+# Number of distinct type strings whose dealiasing is memoized by
+# `dealias_type()`. Select types include their list name, e.g. `select1 dogs`
+DEALIAS_CACHE_SIZE = 1024
+
 
 def aliases_to_ordered_dict(_d):
     """
@@ -96,6 +102,9 @@ selects = aliases_to_ordered_dict(selects_dict)
 # Python3: Cast to a list because it's merged into other dicts
 # (i.e `SELECT_SCHEMA` in validators.py)
 SELECT_TYPES = list(selects.keys())
+# Matches the longest select type alias a type string starts with, like
+# `startswith()` would when trying `SELECT_TYPES` in order
+SELECT_TYPES_REGEX = re.compile('|'.join(map(re.escape, SELECT_TYPES)))
 
 META_TYPES = [
     'start',
@@ -229,6 +238,13 @@ formpack_preferred_survey_headers = {
 survey_header_columns = _unpack_headers(
     pyxform_aliases.survey_header, formpack_preferred_survey_headers
 )
+# Aliased survey columns, with their position in `survey_header_columns` to
+# rename the columns of a row in the very same order
+_survey_header_renames = {
+    key: (index, val)
+    for index, (key, val) in enumerate(survey_header_columns.items())
+    if key != val
+}
 
 
 def kobo_specific_sub(key: str) -> str:
@@ -240,24 +256,34 @@ def kobo_specific_sub(key: str) -> str:
         `kobo–something` -> `kobo--something`,
         `kobo—something` -> `kobo--soemthing`
     """
-    return re.sub(KOBO_SPECIFIC_SUB_PATTERN, KOBO_SPECIFIC_PREFERRED, key)
+    return KOBO_SPECIFIC_SUB_REGEX.sub(KOBO_SPECIFIC_PREFERRED, key)
 
 
-def dealias_type(type_str, strict=False, allowed_types=None):
-    if allowed_types is None:
-        allowed_types = {}
-
-    if type_str in types.keys():
+@lru_cache(maxsize=DEALIAS_CACHE_SIZE)
+def _dealias_type(type_str):
+    if type_str in types:
         return types[type_str]
-    if type_str in allowed_types.keys():
-        return allowed_types[type_str]
-    for key in SELECT_TYPES:
-        if type_str.startswith(key):
-            return type_str.replace(key, selects[key])
+    match = SELECT_TYPES_REGEX.match(type_str)
+    if match:
+        key = match.group()
+        return type_str.replace(key, selects[key])
     if type_str in KNOWN_TYPES:
         return type_str
-    if strict:
+    return None
+
+
+def dealias_type(type_str, strict=False, allowed_types=None):
+    if (
+        allowed_types
+        and type_str not in types
+        and type_str in allowed_types
+    ):
+        return allowed_types[type_str]
+
+    dealiased_type = _dealias_type(type_str)
+    if dealiased_type is None and strict:
         raise ValueError('unknown type {}'.format([type_str]))
+    return dealiased_type
 
 
 def replace_aliases(content, in_place=False, allowed_types=None):
@@ -285,16 +311,15 @@ def replace_aliases_in_place(content, allowed_types=None):
                 if row[col] in pyxform_aliases.yes_no:
                     row[col] = pyxform_aliases.yes_no[row[col]]
 
-        for key, val in iter(survey_header_columns.items()):
-            if key in row and key != val:
-                row[val] = row[key]
-                del row[key]
+        aliased_keys = [key for key in row if key in _survey_header_renames]
+        if aliased_keys:
+            aliased_keys.sort(key=lambda key: _survey_header_renames[key][0])
+            for key in aliased_keys:
+                row[_survey_header_renames[key][1]] = row.pop(key)
 
-        for key, val in row.copy().items():
-            if re.search(KOBO_SPECIFIC_SUB_PATTERN, key) is not None:
-                new_key = kobo_specific_sub(key)
-                row[new_key] = val
-                del row[key]
+        kobo_keys = [key for key in row if KOBO_SPECIFIC_SUB_REGEX.match(key)]
+        for key in kobo_keys:
+            row[kobo_specific_sub(key)] = row.pop(key)
 
     for row in content.get('choices', []):
         if 'list name' in row:
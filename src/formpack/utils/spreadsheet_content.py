@@ -1,9 +1,9 @@
 # coding: utf-8
 import re
 from collections import OrderedDict
-from copy import deepcopy
 
 from .flatten_content import (
+    copy_content_for_flattening,
     _flatten_translated_fields,
     _flatten_survey_row,
     _flatten_tags,
@@ -33,6 +33,11 @@ ORDERS_BY_SHEET = {
     ],
 }
 
+_ORDER_REGEXES_BY_SHEET = {
+    sheet_name: [re.compile(order) for order in orders]
+    for sheet_name, orders in ORDERS_BY_SHEET.items()
+}
+
 
 def flatten_to_spreadsheet_content(
     content,
@@ -51,7 +56,7 @@ def flatten_to_spreadsheet_content(
     if remove_sheets is None:
         remove_sheets = []
     if not in_place:
-        content = deepcopy(content)
+        content = copy_content_for_flattening(content)
 
     translations = content.pop('translations', [])
     translated_cols = content.pop('translated', [])
@@ -61,13 +66,14 @@ def flatten_to_spreadsheet_content(
         [x for x in content.keys() if x not in remove_sheets]
     )
 
-    def _row_to_ordered_dict(row, dest):
+    def _row_to_ordered_dict(row, dest, known_cols):
         dest_keys = list(dest.keys())
         _flatten_translated_fields(
             row,
             translations,
             translated_cols,
             col_order=dest_keys,
+            known_cols=known_cols,
         )
         _flatten_survey_row(row)
         for key in dest_keys:
@@ -75,26 +81,21 @@ def flatten_to_spreadsheet_content(
         return dest
 
     def _sheet_to_ordered_dicts(sheet_name, rows):
-        all_cols = OrderedDict()
         if not isinstance(rows, list):
             return None
-        for row in rows:
-            all_cols.update(OrderedDict.fromkeys(row.keys()))
-        _all_cols = _order_cols(list(all_cols), sheet_name)
-
-        removed = remove_columns.get(sheet_name, [])
-        firsts = prioritized_columns.get(sheet_name, [])
-        firsts = [x for x in firsts if x in _all_cols]
-        lasts = deprioritized_columns.get(sheet_name, [])
-        lasts = [x for x in lasts if x in _all_cols]
-        _not_mids = firsts + lasts + removed
-        mids = [x for x in _all_cols if x not in _not_mids]
-
-        ordered_cols = translated_col_list(
-            (firsts + mids + lasts), translations, translated_cols
+        cols = _sheet_cols(
+            sheet_name,
+            rows,
+            firsts=prioritized_columns.get(sheet_name, []),
+            lasts=deprioritized_columns.get(sheet_name, []),
+            removed=remove_columns.get(sheet_name, []),
         )
+        ordered_cols = translated_col_list(cols, translations, translated_cols)
+        known_cols = set(ordered_cols)
         return [
-            _row_to_ordered_dict(row, OrderedDict.fromkeys(ordered_cols))
+            _row_to_ordered_dict(
+                row, OrderedDict.fromkeys(ordered_cols), known_cols
+            )
             for row in rows
         ]
 
@@ -117,6 +118,26 @@ def flatten_to_spreadsheet_content(
         return _od
 
 
+def _sheet_cols(sheet_name, rows, firsts, lasts, removed):
+    """
+    Return the columns of the rows of a sheet, in order: `firsts`, the
+    others in the order preferred for the sheet, then `lasts`, without the
+    `removed` ones
+    """
+    all_cols = OrderedDict()
+    for row in rows:
+        for col in row:
+            if col not in all_cols:
+                all_cols[col] = None
+
+    firsts = [x for x in firsts if x in all_cols]
+    lasts = [x for x in lasts if x in all_cols]
+    _not_mids = set(firsts + lasts + removed)
+    ordered_cols = _order_cols(list(all_cols), sheet_name)
+    mids = [x for x in ordered_cols if x not in _not_mids]
+    return firsts + mids + lasts
+
+
 def _order_sheet_names(sheet_names):
     _ordered = []
     for sht in SHEET_ORDER:
@@ -127,13 +148,20 @@ def _order_sheet_names(sheet_names):
 
 
 def _order_cols(cols, sheet_name=False):
-    _ordered = []
-    orders = ORDERS_BY_SHEET.get(sheet_name, ORDERS_BY_SHEET['survey'])
-    for _cre in orders:
-        _ms = []
-        for _c in cols:
-            if re.search(_cre, _c):
-                _ms.append(_c)
-                cols.remove(_c)
-        _ordered += _ms
-    return _ordered + cols
+    """
+    Return `cols` with the ones matching the patterns of `ORDERS_BY_SHEET`
+    first, in the order of the patterns, and then the other ones
+    """
+    orders = _ORDER_REGEXES_BY_SHEET.get(
+        sheet_name, _ORDER_REGEXES_BY_SHEET['survey']
+    )
+    _ordered = [[] for _cre in orders]
+    _others = []
+    for _c in cols:
+        for _i, _cre in enumerate(orders):
+            if _cre.search(_c):
+                _ordered[_i].append(_c)
+                break
+        else:
+            _others.append(_c)
+    return [_c for _ms in _ordered for _c in _ms] + _others
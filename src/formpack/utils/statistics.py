@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
+import math
 import statistics
+import sys
 
 
 def singlemode(data):
@@ -13,3 +15,30 @@ def singlemode(data):
             raise statistics.StatisticsError('no unique mode')
         else:
             return modes[0]
+
+
+# Enough bits for the integer square root to be correctly rounded once
+# converted to a float
+_SQRT_BIT_WIDTH = 2 * sys.float_info.mant_dig + 3
+
+
+def sqrt_of_fraction(fraction):
+    """
+    Return the square root of a (non-negative) `Fraction` as a correctly
+    rounded float, i.e. the same value `statistics.stdev()` returns for the
+    same exact variance.
+    """
+    n, m = fraction.numerator, fraction.denominator
+    shift = (n.bit_length() - m.bit_length() - _SQRT_BIT_WIDTH) // 2
+    if shift >= 0:
+        m <<= 2 * shift
+        denominator = 1
+    else:
+        n <<= -2 * shift
+        denominator = 1 << -shift
+    root = math.isqrt(n // m)
+    # Round to odd, so the final int-to-float conversion rounds correctly
+    root |= root * root * m != n
+    if shift > 0:
+        root <<= shift
+    return root / denominator
@@ -1,12 +1,18 @@
 # coding: utf-8
 import re
+from collections import OrderedDict
+from io import BytesIO
 
+from lxml import etree
 from pyquery import PyQuery
 from pyxform.builder import create_survey_element_from_dict
 from pyxform.xls2json import workbook_to_json
 
 from .flatten_content import flatten_content
 
+# Number of compiled XForms kept by an `XFormCache` by default
+XFORM_CACHE_SIZE = 128
+
 DATA_TYPE_ALIASES = (
     ('add select one prompt using', 'select_one'),
     ('select one from', 'select_one'),
@@ -32,6 +38,36 @@ DATA_TYPE_ALIASES = (
 )
 
 
+class XFormCache:
+    """
+    In-memory cache of compiled XForms, by key, which forgets the least
+    recently used ones beyond `maxsize` of them.
+
+    `FormVersion.to_xml()` only calls `get()` and sets items, so any object
+    providing them, e.g. an on-disk store, can be used instead.
+    """
+
+    def __init__(self, maxsize=XFORM_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._xforms = OrderedDict()
+
+    def __len__(self):
+        return len(self._xforms)
+
+    def get(self, key, default=None):
+        try:
+            self._xforms.move_to_end(key)
+        except KeyError:
+            return default
+        return self._xforms[key]
+
+    def __setitem__(self, key, xform):
+        self._xforms[key] = xform
+        self._xforms.move_to_end(key)
+        if len(self._xforms) > self.maxsize:
+            self._xforms.popitem(last=False)
+
+
 def formversion_pyxform(data):
     content = flatten_content(data)
     imported_survey_json = workbook_to_json(content)
@@ -58,22 +94,128 @@ def parse_xml_to_xmljson(node):
     return out
 
 
-def parse_xmljson_to_data(data, parent_tags=[], output=[]):
-    tag = data.get('tag')
-    new_parents = parent_tags + [tag]
-    if len(data.get('children', [])) > 0:
-        for child in data.get('children'):
-            parse_xmljson_to_data(child, new_parents, output)
-    else:
-        key = '/' + '/'.join(parent_tags) + '/' + tag
-        val = data.get('text')
-        output.append((key, val))
-    return output
+def parse_xmljson_to_data(data, parent_tags=()):
+    """
+    Lazily yield `(xpath, value)` tuples for the leaves of an xmljson
+    structure, as returned by `parse_xml_to_xmljson()`, in document order.
+
+    :param data: dict
+    :param parent_tags: tags of the elements above `data`, if any
+    """
+    # Nodes left to walk, with the path of their parent
+    stack = [(data, '/'.join(parent_tags))]
+    while stack:
+        node, parent_path = stack.pop()
+        tag = node.get('tag')
+        children = node.get('children', [])
+        if len(children) > 0:
+            path = f'{parent_path}/{tag}' if parent_path else tag
+            stack.extend((child, path) for child in reversed(children))
+        else:
+            yield f'/{parent_path}/{tag}', node.get('text')
 
 
 def parse_xml_to_data(xml_str):
     xmljson = parse_xml_to_xmljson(xml_str)
-    return parse_xmljson_to_data(xmljson)
+    return list(parse_xmljson_to_data(xmljson))
+
+
+def _is_instance_start(tag, depth, instance_tag):
+    """
+    Tell whether an element opens a submission: the root element, or the
+    elements tagged `instance_tag` if given
+    """
+    if instance_tag is None:
+        return depth == 1
+    return tag == instance_tag
+
+
+def _start_xml_answer(tag, path, containers, repeat_paths):
+    """
+    Enter an element of a submission, adding a dict to `containers` for the
+    answers of a new instance of a repeat
+    """
+    path.append(tag)
+    xpath = '/'.join(path)
+    if xpath in repeat_paths:
+        repeat_instance = {}
+        containers[-1].setdefault(xpath, []).append(repeat_instance)
+        containers.append(repeat_instance)
+
+
+def _end_xml_answer(element, path, containers, repeat_paths):
+    """
+    Leave an element of a submission, recording its answer if it has one
+    """
+    xpath = '/'.join(path)
+    if xpath in repeat_paths:
+        containers.pop()
+    elif len(element) == 0 and element.text:
+        containers[-1][xpath] = element.text
+    path.pop()
+    element.clear()
+
+
+def _free_xml_submission(element):
+    """
+    Free what was read so far, including previous submissions
+    """
+    element.clear()
+    while element.getprevious() is not None:
+        del element.getparent()[0]
+
+
+def iter_xml_submissions(source, repeat_paths=(), instance_tag=None):
+    """
+    Stream the submissions of an XML source into the flat dicts used by
+    exports, e.g. `{'group/question': 'answer'}`, where the instances of
+    repeats are lists of such dicts, e.g.
+    `{'repeat': [{'repeat/question': 'answer'}, …]}`.
+
+    Elements are read one at a time with `lxml.etree.iterparse()` and
+    discarded once read, so that large sources are never fully loaded.
+    Empty answers are left out.
+
+    :param source: a file name, a file object or bytes
+    :param repeat_paths: paths of the repeats, e.g. `('repeat',
+        'repeat/nested_repeat')`, without the root element
+    :param instance_tag: tag of the elements holding submissions, if the
+        root element of `source` wraps several of them. The root element is
+        the only submission otherwise
+    :return: iterator of `(attributes, submission)` tuples, where
+        `attributes` are the ones of the element holding the submission
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    repeat_paths = set(repeat_paths)
+
+    depth = 0
+    instance_depth = None
+    # Tags of the elements from the instance to the current one, excluded,
+    # and the dicts their answers go to
+    path = []
+    containers = []
+    for event, element in etree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            tag = etree.QName(element).localname
+            if instance_depth is not None:
+                _start_xml_answer(tag, path, containers, repeat_paths)
+            elif _is_instance_start(tag, depth, instance_tag):
+                instance_depth = depth
+                containers.append({})
+            continue
+
+        depth -= 1
+        if instance_depth is None:
+            continue
+        if depth >= instance_depth:
+            _end_xml_answer(element, path, containers, repeat_paths)
+            continue
+
+        yield dict(element.attrib), containers.pop()
+        instance_depth = None
+        _free_xml_submission(element)
 
 
 def normalize_data_type(data_type):
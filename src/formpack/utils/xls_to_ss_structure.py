@@ -8,8 +8,113 @@ import xlrd
 
 from .replace_aliases import kobo_specific_sub
 
+# Magic bytes of the OLE2 compound documents of XLS files, XLSX files being
+# ZIP archives
+XLS_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
 
-def xls_to_lists(xls_file_object, strip_empty_rows=True):
+
+def is_xls_file(file_object):
+    """
+    Tell whether a seekable file object is an XLS file, from its first bytes,
+    without moving its position
+    """
+    position = file_object.tell()
+    signature = file_object.read(len(XLS_SIGNATURE))
+    file_object.seek(position)
+    return signature == XLS_SIGNATURE
+
+
+def _iswhitespace(string):
+    return isinstance(string, str) and len(string.strip()) == 0
+
+
+def _xls_value_to_unicode(value, value_type, datemode):
+    """
+    Take a xls formatted value and try to make a unicode string
+    representation.
+    """
+    if value_type == xlrd.XL_CELL_BOOLEAN:
+        return 'TRUE' if value else 'FALSE'
+    elif value_type == xlrd.XL_CELL_NUMBER:
+        # Try to display as an int if possible.
+        int_value = int(value)
+        if int_value == value:
+            return str(int_value)
+        else:
+            return str(value)
+    elif value_type is xlrd.XL_CELL_DATE:
+        # Warn that it is better to single quote as a string.
+        # error_location = cellFormatString % (ss_row_idx, ss_col_idx)
+        # raise Exception(
+        #   "Cannot handle excel formatted date at " + error_location)
+        datetime_or_time_only = xlrd.xldate_as_tuple(value, datemode)
+        if datetime_or_time_only[:3] == (0, 0, 0):
+            # must be time only
+            return str(datetime.time(*datetime_or_time_only[3:]))
+        return str(datetime.datetime(*datetime_or_time_only))
+    else:
+        # ensure unicode and replace nbsp spaces with normal ones
+        # to avoid this issue:
+        # https://github.com/modilabs/pyxform/issues/83
+        return str(value).replace(chr(160), ' ')
+
+
+def _escape_newline_chars(cell):
+    return re.sub(r'\r', '\\\\r', re.sub(r'\n', '\\\\n', cell))
+
+
+def _xls_sheet_to_lists(sheet, datemode, strip_empty_rows=True):
+    result = []
+    nrows_range = list(range(0, sheet.nrows))
+    ncols_range = list(range(0, sheet.ncols))
+    for row in nrows_range:
+        row_results = []
+        row_empty = True
+        for col in ncols_range:
+            value = sheet.cell_value(row, col)
+            if isinstance(value, str):
+                value = _escape_newline_chars(value.strip())
+            if (value is not None) and (not _iswhitespace(value)):
+                value = _xls_value_to_unicode(
+                    value, sheet.cell_type(row, col), datemode
+                )
+            if value != '':
+                row_empty = False
+            if value == '':
+                value = None
+            row_results.append(value)
+        if not strip_empty_rows or not row_empty:
+            result.append(row_results)
+    return result
+
+
+def iter_xls_sheets(xls_file_object, strip_empty_rows=True, sheet_names=None):
+    """
+    Yield a `(sheetname, rows)` tuple for each sheet of an XLS file object,
+    or only for the sheets named in `sheet_names` if it is provided, where
+    `rows` is the list of the rows of the sheet, as lists of cell values.
+
+    XLS files need random access, but their sheets are loaded on demand and
+    unloaded once yielded.
+    """
+    workbook = xlrd.open_workbook(
+        file_contents=xls_file_object.read(), on_demand=True
+    )
+    try:
+        for sheet_index, sheet_name in enumerate(workbook.sheet_names()):
+            sheet_name = kobo_specific_sub(sheet_name)
+            if sheet_names is not None and sheet_name not in sheet_names:
+                continue
+            sheet = workbook.sheet_by_index(sheet_index)
+            yield sheet_name, _xls_sheet_to_lists(
+                sheet, workbook.datemode, strip_empty_rows=strip_empty_rows
+            )
+            workbook.unload_sheet(sheet_index)
+    finally:
+        workbook.release_resources()
+
+
+def xls_to_lists(xls_file_object, strip_empty_rows=True, sheet_names=None):
     """
     The goal: Convert an XLS file object to a python object.
 
@@ -17,77 +122,16 @@ def xls_to_lists(xls_file_object, strip_empty_rows=True):
     `convert_file_to_csv_string`, however this works as it is expected (does
     not add extra sheets or perform misc conversions which are a part of
     `pyxform.xls2json_backends.xls_to_dict`.)
-    """
 
-    def _iswhitespace(string):
-        return isinstance(string, str) and len(string.strip()) == 0
-
-    def xls_value_to_unicode(value, value_type):
-        """
-        Take a xls formatted value and try to make a unicode string
-        representation.
-        """
-        if value_type == xlrd.XL_CELL_BOOLEAN:
-            return 'TRUE' if value else 'FALSE'
-        elif value_type == xlrd.XL_CELL_NUMBER:
-            # Try to display as an int if possible.
-            int_value = int(value)
-            if int_value == value:
-                return str(int_value)
-            else:
-                return str(value)
-        elif value_type is xlrd.XL_CELL_DATE:
-            # Warn that it is better to single quote as a string.
-            # error_location = cellFormatString % (ss_row_idx, ss_col_idx)
-            # raise Exception(
-            #   "Cannot handle excel formatted date at " + error_location)
-            datetime_or_time_only = xlrd.xldate_as_tuple(
-                value, workbook.datemode
-            )
-            if datetime_or_time_only[:3] == (0, 0, 0):
-                # must be time only
-                return str(datetime.time(*datetime_or_time_only[3:]))
-            return str(datetime.datetime(*datetime_or_time_only))
-        else:
-            # ensure unicode and replace nbsp spaces with normal ones
-            # to avoid this issue:
-            # https://github.com/modilabs/pyxform/issues/83
-            return str(value).replace(chr(160), ' ')
-
-    def _escape_newline_chars(cell):
-        return re.sub(r'\r', '\\\\r', re.sub(r'\n', '\\\\n', cell))
-
-    def _sheet_to_lists(sheet):
-        result = []
-        nrows_range = list(range(0, sheet.nrows))
-        ncols_range = list(range(0, sheet.ncols))
-        for row in nrows_range:
-            row_results = []
-            row_empty = True
-            for col in ncols_range:
-                value = sheet.cell_value(row, col)
-                if isinstance(value, str):
-                    value = _escape_newline_chars(value.strip())
-                if (value is not None) and (not _iswhitespace(value)):
-                    value = xls_value_to_unicode(
-                        value, sheet.cell_type(row, col)
-                    )
-                if value != '':
-                    row_empty = False
-                if value == '':
-                    value = None
-                row_results.append(value)
-            if not strip_empty_rows or not row_empty:
-                result.append(row_results)
-        return result
-
-    workbook = xlrd.open_workbook(file_contents=xls_file_object.read())
-    ss_structure = OrderedDict()
-    for sheet in workbook.sheets():
-        sheet_name = kobo_specific_sub(sheet.name)
-        sheet_contents = _sheet_to_lists(sheet)
-        ss_structure[sheet_name] = sheet_contents
-    return ss_structure
+    Only the sheets named in `sheet_names`, if it is provided, are loaded.
+    """
+    return OrderedDict(
+        iter_xls_sheets(
+            xls_file_object,
+            strip_empty_rows=strip_empty_rows,
+            sheet_names=sheet_names,
+        )
+    )
 
 
 def _parsed_sheet(sheet_lists):
@@ -114,102 +158,126 @@ def _parsed_sheet(sheet_lists):
     return out_list
 
 
-def xls_to_dicts(xls_file_object, strip_empty_rows=True):
+def xls_to_dicts(xls_file_object, strip_empty_rows=True, sheet_names=None):
     """
     outputs an ordered dict of (sheetname, sheet_contents)
 
     where sheet_contents is a list of ordered_dicts
     """
-    lists = xls_to_lists(xls_file_object)
+    lists = xls_to_lists(xls_file_object, sheet_names=sheet_names)
     out = OrderedDict()
     for key, sheet in lists.items():
         out[key] = _parsed_sheet(sheet)
     return out
 
 
-def xlsx_to_lists(xls_file_object, strip_empty_rows=True):
+def _is_empty_xlsx_value(value):
+    if value is None:
+        return True
+    elif isinstance(value, str) and value.strip() == '':
+        return True
+    else:
+        return False
+
+
+def _xlsx_value_to_str(value):
     """
-    Convert an XLSX file object to a python object.
+    Take a xlsx formatted value and try to make a string representation.
     """
-    workbook = openpyxl.load_workbook(xls_file_object)
+    if value is True:
+        return 'TRUE'
+    elif value is False:
+        return 'FALSE'
+    elif isinstance(value, float) and value.is_integer():
+        # Try to display as an int if possible.
+        return str(int(value))
+    elif isinstance(value, (int, datetime.datetime, datetime.time)):
+        return str(value)
+    else:
+        # ensure unicode and replace nbsp spaces with normal ones
+        # to avoid this issue:
+        # https://github.com/modilabs/pyxform/issues/83
+        return str(value).replace(chr(160), ' ')
 
-    def is_empty(value):
-        if value is None:
-            return True
-        elif isinstance(value, str) and value.strip() == '':
-            return True
-        else:
-            return False
-
-    def xlsx_value_to_str(value):
-        """
-        Take a xlsx formatted value and try to make a string representation.
-        """
-        if value is True:
-            return 'TRUE'
-        elif value is False:
-            return 'FALSE'
-        elif isinstance(value, float) and value.is_integer():
-            # Try to display as an int if possible.
-            return str(int(value))
-        elif isinstance(value, (int, datetime.datetime, datetime.time)):
-            return str(value)
+
+def _iter_xlsx_sheet_rows(sheet):
+    """
+    Yield the rows of an XLSX sheet as ordered dicts of their non-empty
+    values, by column header
+    """
+    column_header_list = list()
+    # Empty sheets have no rows at all in read-only mode
+    header_row = next(sheet.iter_rows(max_row=1, values_only=True), ())
+    # zero-based column enumeration
+    for col_idx, column_header in enumerate(header_row):
+        if _is_empty_xlsx_value(column_header):
+            continue
         else:
-            # ensure unicode and replace nbsp spaces with normal ones
-            # to avoid this issue:
-            # https://github.com/modilabs/pyxform/issues/83
-            return str(value).replace(chr(160), ' ')
-
-    def xlsx_to_dict_normal_sheet(sheet):
-        column_header_list = list()
-        header_row = next(sheet.iter_rows(max_row=1, values_only=True))
-        # zero-based column enumeration
-        for col_idx, column_header in enumerate(header_row):
-            if is_empty(column_header):
+            clean_header = re.sub(r'( )+', ' ', column_header.strip())
+            column_header_list.append((col_idx, clean_header))
+
+    if not column_header_list:
+        return
+
+    # `max_col_idx` is zero-based, but `max_col` argument to `iter_rows()`
+    # is one-based
+    max_col_idx, _ = column_header_list[-1]
+    for row in sheet.iter_rows(
+        min_row=2, max_col=max_col_idx + 1, values_only=True
+    ):
+        row_dict = OrderedDict()
+        for col_idx, column_header in column_header_list:
+            # `row` returned by `iter_rows()` is a tuple, so zero-based
+            # access is used
+            value = row[col_idx]
+            if isinstance(value, str):
+                value = value.strip()
+            if not _is_empty_xlsx_value(value):
+                row_dict[column_header] = _xlsx_value_to_str(value)
+        yield row_dict
+
+
+def iter_xlsx_sheets(xlsx_file_object, sheet_names=None):
+    """
+    Stream an XLSX file object: yield a `(sheetname, rows)` tuple for each
+    sheet, or only for the sheets named in `sheet_names` if it is provided,
+    where `rows` lazily yields the rows of the sheet as ordered dicts.
+
+    The workbook is read in read-only mode and closed once all its sheets
+    have been yielded, so the rows of a sheet must be read before getting
+    the next one.
+    """
+    workbook = openpyxl.load_workbook(xlsx_file_object, read_only=True)
+    try:
+        for sheetname in workbook.sheetnames:
+            sheet = workbook[sheetname]
+            sheetname = kobo_specific_sub(sheetname)
+            if sheet_names is not None and sheetname not in sheet_names:
                 continue
-            else:
-                clean_header = re.sub(r'( )+', ' ', column_header.strip())
-                column_header_list.append((col_idx, clean_header))
-
-        result = []
-        if not column_header_list:
-            return result
-
-        # `max_col_idx` is zero-based, but `max_col` argument to `iter_rows()`
-        # is one-based
-        max_col_idx, _ = column_header_list[-1]
-        for row in sheet.iter_rows(
-            min_row=2, max_col=max_col_idx + 1, values_only=True
-        ):
-            row_dict = OrderedDict()
-            for col_idx, column_header in column_header_list:
-                # `row` returned by `iter_rows()` is a tuple, so zero-based
-                # access is used
-                value = row[col_idx]
-                if isinstance(value, str):
-                    value = value.strip()
-                if not is_empty(value):
-                    row_dict[column_header] = xlsx_value_to_str(value)
-            result.append(row_dict)
-
-        return result
+            # Read-only sheets trust the dimensions stored in the file,
+            # which some writers leave stale: read all the stored rows
+            sheet.reset_dimensions()
+            yield sheetname, _iter_xlsx_sheet_rows(sheet)
+    finally:
+        workbook.close()
+
 
+def xlsx_to_lists(xls_file_object, strip_empty_rows=True, sheet_names=None):
+    """
+    Convert an XLSX file object to a python object.
+    """
     result = OrderedDict()
-    for sheetname in workbook.sheetnames:
-        sheet = workbook[sheetname]
-        sheetname = kobo_specific_sub(sheetname)
-        result[sheetname] = xlsx_to_dict_normal_sheet(sheet)
+    for sheetname, rows in iter_xlsx_sheets(
+        xls_file_object, sheet_names=sheet_names
+    ):
+        result[sheetname] = list(rows)
 
     return result
 
 
-def xlsx_to_dicts(xlsx_file_object, strip_empty_rows=True):
+def xlsx_to_dicts(xlsx_file_object, strip_empty_rows=True, sheet_names=None):
     """
     outputs an ordered dict of (sheetname, sheet_contents)
     where sheet_contents is a list of ordered_dicts
     """
-    lists = xlsx_to_lists(xlsx_file_object)
-    out = OrderedDict()
-    for key, sheet in lists.items():
-        out[key] = sheet
-    return out
+    return xlsx_to_lists(xlsx_file_object, sheet_names=sheet_names)
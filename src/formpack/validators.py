@@ -1,6 +1,8 @@
 # coding: utf-8
-from jsonschema import validate
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
+from .errors import ContentValidationError
 from .utils.replace_aliases import (
     LABEL_OPTIONAL_TYPES,
     MAIN_TYPES,
@@ -54,24 +56,28 @@ LABEL_OPTIONAL_SCHEMA = {
 }
 
 
+END_SCHEMA = {
+    'properties': {
+        'type': {
+            'type': 'string',
+            'enum': [
+                'end_group',
+                'end_repeat',
+            ],
+        }
+    }
+}
+
+_ROW_SCHEMAS = [
+    SELECT_SCHEMA,
+    MAIN_SCHEMA,
+    LABEL_OPTIONAL_SCHEMA,
+    END_SCHEMA,
+]
+
 _ROW_SCHEMA = {
     'type': 'object',
-    'oneOf': [
-        SELECT_SCHEMA,
-        MAIN_SCHEMA,
-        LABEL_OPTIONAL_SCHEMA,
-        {
-            'properties': {
-                'type': {
-                    'type': 'string',
-                    'enum': [
-                        'end_group',
-                        'end_repeat',
-                    ],
-                }
-            }
-        },
-    ],
+    'oneOf': _ROW_SCHEMAS,
 }
 
 _ALL_ROW_COLUMNS = [
@@ -115,10 +121,72 @@ ROW_SCHEMA = {
 }
 
 
+# Same validator class as `jsonschema.validate()` uses for `ROW_SCHEMA`
+RowValidator = validator_for(ROW_SCHEMA)
+RowValidator.check_schema(ROW_SCHEMA)
+ROW_VALIDATOR = RowValidator(ROW_SCHEMA)
+
+
+def _get_validators_by_type():
+    """
+    Return validators of rows by type, each one checking a row against the
+    only schema of `_ROW_SCHEMAS` accepting its type, which is the same as
+    checking it against all of them with `oneOf`
+    """
+    schemas_by_type = {}
+    for schema in _ROW_SCHEMAS:
+        for type_ in schema['properties']['type']['enum']:
+            schemas_by_type.setdefault(type_, []).append(schema)
+
+    return {
+        type_: RowValidator(
+            {'type': 'object', 'allOf': [_ALL_PROPS, schemas[0]]}
+        )
+        for type_, schemas in schemas_by_type.items()
+        if len(schemas) == 1
+    }
+
+
+ROW_VALIDATORS_BY_TYPE = _get_validators_by_type()
+
+
+def _get_row_validator(row):
+    try:
+        return ROW_VALIDATORS_BY_TYPE[row['type']]
+    except (KeyError, TypeError):
+        # Rows without type, of unknown types or which are not even dicts
+        return ROW_VALIDATOR
+
+
+def _get_row_error(row):
+    if _get_row_validator(row).is_valid(row):
+        return None
+    # Invalid rows are checked again against the whole schema, for their
+    # errors to be the very ones `jsonschema.validate()` reports
+    return best_match(ROW_VALIDATOR.iter_errors(row))
+
+
 def validate_row(row, row_number):
-    validate(row, ROW_SCHEMA)
+    """
+    :raises jsonschema.ValidationError: if `row` is invalid
+    """
+    error = _get_row_error(row)
+    if error is not None:
+        raise error
 
 
 def validate_content(content):
+    """
+    Validate all the rows of the survey of `content`.
+
+    :raises ContentValidationError: with the errors of all the invalid rows.
+        It is a `jsonschema.ValidationError` too, the one of the first
+        invalid row
+    """
+    errors = []
     for i, row in enumerate(content['survey']):
-        validate_row(row, row_number=i)
+        error = _get_row_error(row)
+        if error is not None:
+            errors.append((i, error))
+    if errors:
+        raise ContentValidationError(errors)
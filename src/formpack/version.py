@@ -7,10 +7,10 @@ from pyxform import aliases as pyxform_aliases
 from .constants import UNTRANSLATED
 from .errors import SchemaError, TranslationError
 from .schema import FormChoice, FormField, FormGroup, FormSection
-from .submission import FormSubmission
-from .utils import normalize_data_type, parse_xml_to_xmljson
+from .utils import iter_xml_submissions, normalize_data_type
 from .utils.dft import dft_recurse
 from .utils.flatten_content import flatten_content
+from .utils.json_hash import json_hash
 from .utils.xform_tools import formversion_pyxform
 from .utils.xlsform_parameters import (
     parameters_dict_to_string,
@@ -227,7 +227,10 @@ class FormVersion(BaseForm):
         # specific question. They can have translatable labels.
         choices_definition = content.get('choices', ())
         field_choices = FormChoice.all_from_json_definition(
-            choices_definition, self.translations
+            choices_definition,
+            self.translations,
+            # Share identical choice lists with the other versions
+            shared_choices=getattr(form_pack, 'shared_choices', None),
         )
 
         # Extract fields data
@@ -240,7 +243,9 @@ class FormVersion(BaseForm):
         # Hierarchy contains all the levels, mixing groups and sections,
         # including the first and last ones while stacks are just an history of
         # previous levels, and for either groups or sections.
-        hierarchy = [section]
+        # It is a tuple shared by all the fields of a same level, rather than
+        # a list each field would copy.
+        hierarchy = (section,)
         group_stack = []
         section_stack = []
 
@@ -264,14 +269,14 @@ class FormVersion(BaseForm):
                 # We go up in one level of nesting, so we set the current group
                 # to be what used to be the parent group. We also remote one
                 # level in the hierarchy.
-                hierarchy.pop()
+                hierarchy = hierarchy[:-1]
                 group = group_stack.pop()
                 continue
 
             if data_type == 'end_repeat':
                 # We go up in one level of nesting, so we set the current section
                 # to be what used to be the parent section
-                hierarchy.pop()
+                hierarchy = hierarchy[:-1]
                 section = section_stack.pop()
                 continue
 
@@ -288,7 +293,7 @@ class FormVersion(BaseForm):
                 )
                 # We go down in one level on nesting, so save the parent group.
                 # Parent maybe None, in that case we are at the top level.
-                hierarchy.append(group)
+                hierarchy += (group,)
                 continue
 
             if data_type == 'begin_repeat':
@@ -303,7 +308,7 @@ class FormVersion(BaseForm):
                     translations=self.translations,
                 )
                 self.sections[section.name] = section
-                hierarchy.append(section)
+                hierarchy += (section,)
                 section_stack.append(parent_section)
                 parent_section.children.append(section)
                 continue
@@ -369,27 +374,47 @@ class FormVersion(BaseForm):
                     row['parameters'] = parameters_dict_to_string(rparams)
         return content
 
-    # TODO: find where to move that
-    def _load_submission_xml(self, xml):
-        raise NotImplementedError(
-            "This doesn't work now that submissions "
-            "are out of the class. Port it to Export."
-        )
-        _xmljson = parse_xml_to_xmljson(xml)
-        _rootatts = _xmljson.get('attributes', {})
-        _id_string = _rootatts.get('id_string')
-        _version_id = _rootatts.get('version')
-        if _id_string != self._get_id_string():
-            raise ValueError(
-                'submission id_string does not match: %s != %s'
-                % (self._get_id_string(), _id_string)
-            )
-        if _version_id != self.form_pack.id_string:
-            raise ValueError(
-                'mismatching version id %s != %s'
-                % (self.form_pack.id_string, _version_id)
-            )
-        self.submissions.append(FormSubmission.from_xml(_xmljson, self))
+    def load_submissions_xml(self, xml, instance_tag=None):
+        """
+        Stream the submissions of this version from instance XML, in the
+        format expected by `Export`: see `iter_xml_submissions()`. The id of
+        this version is added to submissions which do not have one.
+
+        Submissions are read lazily, so that they can be passed on to
+        `Export` as they are parsed, e.g.
+        `export.to_csv(version.load_submissions_xml('instances.xml'))`.
+
+        :param xml: a file name, a file object or bytes
+        :param instance_tag: tag of the elements holding submissions, if the
+            root element of `xml` wraps several of them
+        :return: iterator of dicts
+        :raises ValueError: if a submission belongs to another form or
+            version
+        """
+        repeat_paths = [
+            section.path
+            for section in self.sections.values()
+            if section.parent is not None
+        ]
+        id_string = self._get_id_string()
+        for attributes, submission in iter_xml_submissions(
+            xml, repeat_paths=repeat_paths, instance_tag=instance_tag
+        ):
+            _id_string = attributes.get('id', attributes.get('id_string'))
+            if None not in (id_string, _id_string) and _id_string != id_string:
+                raise ValueError(
+                    'submission id_string does not match: %s != %s'
+                    % (id_string, _id_string)
+                )
+            _version_id = attributes.get('version')
+            if _version_id is not None and _version_id != self.id:
+                raise ValueError(
+                    'mismatching version id %s != %s' % (self.id, _version_id)
+                )
+            # Let exports know which version the submission belongs to
+            if self.id is not None:
+                submission.setdefault(self.version_id_key, self.id)
+            yield submission
 
     def lookup(self, prop, default=None):
         result = getattr(self, prop, None)
@@ -436,24 +461,37 @@ class FormVersion(BaseForm):
 
     def to_xml(self, warnings=None):
         # todo: collect warnings from pyxform compilation when a list is passed
-        survey = formversion_pyxform(
-            self.to_dict(
-                remove_sheets=['translations', 'translated'],
-            )
+        content = self.to_dict(
+            remove_sheets=['translations', 'translated'],
         )
-        title = self._get_title()
-
-        if title is None:
-            raise ValueError('cannot create xml on a survey with no title.')
-
         # pyxform 3.0.0 has removed the ability to call `survey.update()`
         # https://github.com/XLSForm/pyxform/commit/6918b400d3cf6c9151db2104137afe2c52dd68e4
-        for k, v in {
+        survey_attributes = {
             'name': self.lookup('root_node_name', 'data'),
             'id_string': self.lookup('id_string'),
             'title': self.lookup('title'),
             'version': self.lookup('id'),
-        }.items():
+        }
+
+        if self._get_title() is None:
+            raise ValueError('cannot create xml on a survey with no title.')
+
+        # Identical versions compile to the same XForm, so key them by what
+        # they are compiled from. `content` includes the settings applied by
+        # `to_dict()`, e.g. `default_image_max_pixels`
+        xform_cache = getattr(self.form_pack, 'xform_cache', None)
+        if xform_cache is None:
+            # Form pack without a cache: compile without caching
+            xform_cache = {}
+        cache_key = json_hash([content, survey_attributes], size=38)
+        xml = xform_cache.get(cache_key)
+        if xml is not None:
+            return xml
+
+        survey = formversion_pyxform(content)
+        for k, v in survey_attributes.items():
             survey[k] = v
 
-        return survey._to_pretty_xml()  # .encode('utf-8')
+        xml = survey._to_pretty_xml()  # .encode('utf-8')
+        xform_cache[cache_key] = xml
+        return xml
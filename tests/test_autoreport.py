@@ -1,8 +1,12 @@
 # coding: utf-8
 import json
+import multiprocessing
 import unittest
 
+import pytest
+
 from formpack import FormPack
+from formpack.reporting import AutoReportPartial
 from .fixtures import build_fixture
 
 
@@ -701,3 +705,217 @@ class TestAutoReport(unittest.TestCase):
         ]
         for i, stat in enumerate(stats):
             assert stat == expected[i]
+
+    def test_merged_partials_match_full_report(self):
+        title, schemas, submissions = build_fixture('auto_report')
+        fp = FormPack(schemas, title)
+        report = fp.autoreport()
+
+        for split_by in (None, 'when'):
+            expected = report.get_stats(submissions, split_by=split_by)
+            expected_stats = list(expected)
+
+            partial = report.get_partial(submissions[:2], split_by=split_by)
+            for i in (2, 4):
+                other = report.get_partial(
+                    submissions[i:i + 2], split_by=split_by
+                )
+                # Round-trip through JSON like a cached partial would
+                other = AutoReportPartial.from_dict(
+                    json.loads(json.dumps(other.to_dict()))
+                )
+                partial.merge(other)
+
+            stats = report.get_stats_from_partial(partial)
+            assert stats.submissions_count == expected.submissions_count
+            assert (
+                stats.submission_counts_by_version
+                == expected.submission_counts_by_version
+            )
+            assert list(stats) == expected_stats
+            # Computing the stats does not consume the partial
+            assert list(report.get_stats_from_partial(partial)) == (
+                expected_stats
+            )
+
+    def test_merge_partials_of_different_reports(self):
+        title, schemas, submissions = build_fixture('auto_report')
+        fp = FormPack(schemas, title)
+        report = fp.autoreport()
+
+        partial = report.get_partial(submissions)
+        other = report.get_partial(submissions, fields=['howmany'])
+        with self.assertRaises(ValueError):
+            partial.merge(other)
+
+    def test_parallel_report_matches_serial_report(self):
+        title, schemas, submissions = build_fixture(
+            'auto_report_extended_fields'
+        )
+        fp = FormPack(schemas, title)
+        report = fp.autoreport()
+        # Several chunks per worker
+        report.CHUNK_SIZE = 3
+
+        for split_by in (None, 'when'):
+            expected = report.get_stats(submissions, split_by=split_by)
+            stats = report.get_stats(
+                iter(submissions), split_by=split_by, workers=2
+            )
+            assert stats.submissions_count == expected.submissions_count
+            assert (
+                stats.submission_counts_by_version
+                == expected.submission_counts_by_version
+            )
+            assert list(stats) == list(expected)
+
+    def test_parallel_report_with_spawned_workers(self):
+        title, schemas, submissions = build_fixture('auto_report')
+        fp = FormPack(schemas, title)
+        # Workers get the fields to read, not the form pack
+        fp.unpicklable = lambda: None
+        report = fp.autoreport()
+        report.CHUNK_SIZE = 2
+        report.MP_CONTEXT = multiprocessing.get_context('spawn')
+
+        expected = report.get_stats(submissions)
+        stats = report.get_stats(submissions, workers=2)
+        assert stats.submissions_count == expected.submissions_count
+        assert list(stats) == list(expected)
+
+    def test_approximate_report(self):
+        title, schemas, submissions = build_fixture('auto_report')
+        fp = FormPack(schemas, title)
+        report = fp.autoreport()
+
+        expected = {
+            field.name: stats
+            for field, _, stats in report.get_stats(submissions)
+        }
+        stats = {
+            field.name: stats
+            for field, _, stats in report.get_stats(
+                submissions, approximate=True, sketch_size=2
+            )
+        }
+
+        restaurant_name = stats['restaurant_name']
+        assert restaurant_name['approximate'] is True
+        assert restaurant_name['total_count'] == 6
+        # 'That one' got evicted from the sketch, undercounting the others
+        assert restaurant_name['frequency'] == [
+            ('Felipes', 1),
+            ('The other one', 1),
+        ]
+        assert restaurant_name['frequency_error'] == 1
+
+        howmany = stats['howmany']
+        assert howmany['approximate'] is True
+        # With such a small sketch, the median of 1, 1, 2, 2, 2 may be off
+        assert howmany['median_rank_error'] >= 2
+        assert howmany['median'] in (1, 2)
+        assert howmany['total_count'] == expected['howmany']['total_count']
+        assert howmany['mean'] == pytest.approx(expected['howmany']['mean'])
+        # Fields with a bounded number of values stay exact
+        assert stats['when'] == expected['when']
+
+        with pytest.raises(ValueError):
+            report.get_stats(submissions, split_by='when', approximate=True)
+
+    def test_report_on_fields_inside_repeat_groups(self):
+        title, schemas, submissions = build_fixture(
+            'nested_grouped_repeatable'
+        )
+        fp = FormPack(schemas, title)
+        report = fp.autoreport(versions=fp.versions.keys())
+
+        by_instance = {
+            field.name: stats
+            for field, _, stats in report.get_stats(
+                submissions, fields=['What_kind_of_tree_is_this']
+            )
+        }
+        tree = by_instance['What_kind_of_tree_is_this']
+        assert tree['total_count'] == 6
+        assert tree['frequency'] == [
+            ('pine', 2),
+            ('spruce', 2),
+            ('maple', 1),
+            ('nan', 1),
+        ]
+
+        by_submission = {
+            field.name: stats
+            for field, _, stats in report.get_stats(
+                submissions, repeat_mode='submission'
+            )
+        }
+        tree = by_submission['What_kind_of_tree_is_this']
+        assert tree['total_count'] == 4
+        assert tree['percentage'][0] == ('pine', 50.0)
+        # Fields of nested repeat groups
+        eggs = by_submission['Describe_the_egg']
+        assert eggs['total_count'] == 4
+        assert len(eggs['frequency']) == 7
+
+        with pytest.raises(ValueError):
+            report.get_stats(submissions, repeat_mode='flattened')
+        with pytest.raises(ValueError):
+            report.get_stats(submissions, split_by='Describe_the_egg')
+
+    def test_bucketed_report(self):
+        title, schemas, submissions = build_fixture(
+            'auto_report_extended_fields'
+        )
+        fp = FormPack(schemas, title)
+        report = fp.autoreport()
+        report.CHUNK_SIZE = 3
+
+        buckets = report.get_stats(submissions, bucket_by='when')
+        days = sorted({s['when'] for s in submissions if s.get('when')})
+        expected_buckets = days
+        if any(s.get('when') is None for s in submissions):
+            expected_buckets += [None]
+        assert list(buckets) == expected_buckets
+
+        for day, stats in buckets.items():
+            expected = report.get_stats(
+                [s for s in submissions if s.get('when') == day]
+            )
+            assert stats.submissions_count == expected.submissions_count
+            assert list(stats) == list(expected)
+
+        # 2001-01-01 is a Monday
+        weeks = report.get_stats(
+            submissions, bucket_by='when', bucket_interval='week', workers=2
+        )
+        assert [b for b in weeks if b is not None] == ['2001-01-01']
+
+        with pytest.raises(ValueError):
+            report.get_stats(submissions, bucket_by='restaurant_name')
+        with pytest.raises(ValueError):
+            report.get_stats(
+                submissions, bucket_by='when', bucket_interval='fortnight'
+            )
+
+    def test_report_bucketed_by_submission_time(self):
+        title, schemas, submissions = build_fixture('auto_report')
+        fp = FormPack(schemas, title)
+        report = fp.autoreport()
+
+        submission_times = [
+            '2017-12-27T20:58:25',
+            '2017-12-31T23:59:59.999+02:00',
+            '2018-01-01T00:00:00Z',
+            'not a date',
+        ]
+        submissions = [
+            dict(submission, _submission_time=submission_times[i % 4])
+            for i, submission in enumerate(submissions)
+        ]
+
+        buckets = report.get_partial(
+            submissions, bucket_by='_submission_time', bucket_interval='month'
+        )
+        assert list(buckets) == ['2017-12', '2018-01', None]
+        assert [p.submissions_count for p in buckets.values()] == [4, 1, 1]
@@ -38,6 +38,48 @@ def test_expand_select_x_from_file():
     assert row_type_dict.get('file') == 'file.csv'
 
 
+def test_expand_select_aliases():
+    assert _expand_type_to_dict('select one from dogs') == {
+        'type': 'select_one',
+        'select_from_list_name': 'dogs',
+    }
+    assert _expand_type_to_dict('select all that apply  dogs') == {
+        'type': 'select_multiple',
+        'select_from_list_name': 'dogs',
+    }
+    assert _expand_type_to_dict('select1 dogs')['type'] == 'select_one'
+    assert _expand_type_to_dict('rank dogs') == {
+        'type': 'rank',
+        'select_from_list_name': 'dogs',
+    }
+    # Not aliases
+    assert _expand_type_to_dict(' select_one dogs') == {
+        'type': ' select_one dogs'
+    }
+    assert _expand_type_to_dict('select  one dogs') == {
+        'type': 'select  one dogs'
+    }
+
+
+def test_expand_moves_metas_first():
+    s1 = {
+        'survey': [
+            {'type': 'text', 'name': 'q1'},
+            {'type': 'start', 'name': 'start'},
+            {'type': 'select_one dogs', 'name': 'q2'},
+            {'type': 'end', 'name': 'end'},
+        ]
+    }
+    expand_content(s1, in_place=True)
+    assert [row['name'] for row in s1['survey']] == [
+        'start',
+        'end',
+        'q1',
+        'q2',
+    ]
+    assert s1['survey'][3]['select_from_list_name'] == 'dogs'
+
+
 def test_expand_select_one():
     s1 = {'survey': [{'type': 'select_one dogs'}]}
     expand_content(s1, in_place=True)
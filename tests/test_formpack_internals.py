@@ -1,12 +1,20 @@
 # coding: utf-8
 import json
+import operator
+import pickle
 from copy import deepcopy
 
 import pytest
 import pyxform
 
 from formpack import FormPack, constants
+from formpack.schema.datadef import FormChoice
+from formpack.schema.fields import (
+    FormChoiceField,
+    FormChoiceFieldWithMultipleSelect,
+)
 from formpack.utils.iterator import get_first_occurrence
+from formpack.utils.xform_tools import XFormCache
 from .fixtures import build_fixture
 
 
@@ -512,9 +520,323 @@ def test_fields_for_versions_list_index_out_of_range():
     all_fields = fp.get_fields_for_versions(fp.versions.keys())
     expected = [
         'one',
-        'third',
         'first_but_not_one',
+        'third',
     ]
     field_names = [field.name for field in all_fields]
     assert len(all_fields) == 3
     assert field_names == expected
+
+
+def _survey_version(version, survey):
+    return {
+        'version': version,
+        'content': {
+            'survey': [
+                {'type': 'text', 'name': row} if isinstance(row, str) else row
+                for row in survey
+            ]
+        },
+    }
+
+
+def test_fields_for_versions_follow_their_predecessors():
+    fp = FormPack(
+        [
+            _survey_version('v1', ['a', 'y', 'b', 'e']),
+            _survey_version('v2', ['a', 'x', 'b', 'w', 'e']),
+            _survey_version('v3', ['a', 'b', 'c']),
+        ]
+    )
+    fields = fp.get_fields_for_versions(fp.versions)
+    field_names = [field.name for field in fields]
+    # Fields of the newest version first, then older fields after the field
+    # preceding them, from the newest version to the oldest
+    assert field_names == ['a', 'b', 'c', 'x', 'y', 'w', 'e']
+
+
+def test_fields_for_versions_with_colliding_names():
+    fp = FormPack(
+        [
+            _survey_version(
+                'v1',
+                [
+                    {'type': 'begin_repeat', 'name': 'x_y'},
+                    'z',
+                    {'type': 'end_repeat'},
+                    'other',
+                ],
+            ),
+            _survey_version(
+                'v2',
+                [
+                    {'type': 'begin_repeat', 'name': 'x'},
+                    'y_z',
+                    {'type': 'end_repeat'},
+                ],
+            ),
+        ]
+    )
+    fields = fp.get_fields_for_versions(fp.versions)
+    assert [(field.section.name, field.name) for field in fields] == [
+        ('x', 'y_z'),
+        ('Submissions', 'other'),
+        ('x_y', 'z'),
+    ]
+
+
+def test_fields_for_versions_are_merged_incrementally():
+    schemas = [
+        _survey_version('v1', ['a', 'y', 'b']),
+        _survey_version('v2', ['a', 'x', 'b']),
+        _survey_version('v3', ['b', 'y', 'c']),
+    ]
+    fp = FormPack(schemas[:2])
+    fp.get_fields_for_versions(fp.versions)
+    fp.load_version(deepcopy(schemas[2]))
+    fields = fp.get_fields_for_versions(fp.versions)
+    assert [f.name for f in fields] == [
+        f.name
+        for f in FormPack(schemas).get_fields_for_versions(['v1', 'v2', 'v3'])
+    ]
+    assert [f.name for f in fields] == ['b', 'y', 'c', 'a', 'x']
+
+
+def test_choice_translations_follow_merged_choices():
+    choice = FormChoice('colors')
+    choice.options['red'] = {'name': 'red', 'labels': {'English': 'Red'}}
+    field = FormChoiceField(
+        'color', {'English': 'Color'}, 'select_one', choice=choice
+    )
+    assert field.get_translation('red', 'English') == 'Red'
+    assert field.get_translation('red', 'French') == 'red'
+    assert field.get_translation('blue', 'English') == 'blue'
+
+    old_choice = FormChoice('colors')
+    old_choice.options['blue'] = {
+        'name': 'blue',
+        'labels': {'English': 'Blue'},
+    }
+    field.merge_choice(old_choice)
+    assert field.get_translation('blue', 'English') == 'Blue'
+
+
+def test_select_multiple_cells_follow_merged_choices():
+    choice = FormChoice('colors')
+    choice.options['red'] = {'name': 'red', 'labels': {'English': 'Red'}}
+    field = FormChoiceFieldWithMultipleSelect(
+        'colors', {'English': 'Colors'}, 'select_multiple', choice=choice
+    )
+    assert field.format('red', 'English') == {
+        'colors': 'Red',
+        'colors/red': '1',
+    }
+    assert field.format(None) == {'colors': '', 'colors/red': ''}
+
+    old_choice = FormChoice('colors')
+    old_choice.options['blue'] = {
+        'name': 'blue',
+        'labels': {'English': 'Blue'},
+    }
+    field.merge_choice(old_choice)
+    cells = field.format('blue yellow', 'English', xls_types_as_text=False)
+    assert cells == {
+        'colors': 'Blue yellow',
+        'colors/blue': 1,
+        'colors/red': 0,
+        'colors/yellow': 1,
+    }
+    # Templates are not altered by formatting
+    assert field.format('red', multiple_select='details') == {
+        'colors/blue': '0',
+        'colors/red': '1',
+    }
+
+
+def test_fields_share_their_hierarchy():
+    title, schemas, submissions = build_fixture('nested_grouped_repeatable')
+    fp = FormPack(schemas, title)
+    section = fp[0].sections['group_nest']
+    height, eggs = list(section.fields.values())[:2]
+
+    assert not hasattr(height, '__dict__')
+    assert not hasattr(section, '__dict__')
+    assert height._hierarchy is eggs._hierarchy
+    assert height.hierarchy[-2:] == (section, height)
+    assert eggs.path == 'group_tree/group_nest/How_many_eggs_are_in_the_nest'
+    # Paths of other versions are the very same strings
+    assert eggs.path is fp[1].sections['group_nest'].fields[eggs.name].path
+
+
+def test_versions_share_identical_choice_lists():
+    title, schemas, submissions = build_fixture('restaurant_profile')
+    fp = FormPack(schemas, title)
+    v3_field = fp[2].sections['Restaurant profile'].fields['eatery_type']
+    v4_field = fp[3].sections['Restaurant profile'].fields['eatery_type']
+    shared_choice = v4_field.choice
+    assert v3_field.choice is shared_choice
+
+    # Merging copies the choice list instead of altering the shared one
+    old_choice = FormChoice(shared_choice.name)
+    old_choice.options['food_truck'] = {
+        'name': 'food_truck',
+        'labels': {'English (en)': 'Food truck'},
+    }
+    v4_field.merge_choice(old_choice)
+    assert 'food_truck' in v4_field.choice.options
+    assert 'food_truck' not in shared_choice.options
+    assert v3_field.choice is shared_choice
+
+
+def test_load_version_keeps_merged_fields():
+    title, schemas, submissions = build_fixture('restaurant_profile')
+    fp = FormPack(schemas[:-1], title)
+    fields = fp.get_fields_for_versions(fp.versions)
+    # The same fields are returned, in new lists
+    same_fields = fp.get_fields_for_versions(fp.versions)
+    assert same_fields is not fields
+    assert all(map(operator.is_, same_fields, fields))
+    assert len(same_fields) == len(fields)
+
+    # New versions are available at once
+    fp.load_version(deepcopy(schemas[-1]))
+    assert fp[-1] is fp.versions[schemas[-1]['version']]
+    old_fields = fp.get_fields_for_versions(list(fp.versions)[:-1])
+    assert [f.name for f in old_fields] == [f.name for f in fields]
+    latest_fields = fp.get_fields_for_versions()
+    assert [f.name for f in latest_fields] == [
+        f.name for f in FormPack(schemas, title).get_fields_for_versions()
+    ]
+    assert fp.version_id_keys() == FormPack(schemas, title).version_id_keys()
+    assert fp.available_translations == FormPack(
+        schemas, title
+    ).available_translations
+
+
+def test_xforms_are_cached():
+    title, schemas, submissions = build_fixture('restaurant_profile')
+    xform_cache = XFormCache()
+    fp = FormPack(schemas, title, xform_cache=xform_cache)
+    xml = fp[0].to_xml()
+    assert len(xform_cache) == 1
+    assert fp[0].to_xml() is xml
+    # Identical versions of other form packs share the compiled XForm
+    other_fp = FormPack(schemas, title, xform_cache=xform_cache)
+    assert other_fp[0].to_xml() is xml
+    assert len(xform_cache) == 1
+
+    # Any setting changing the XForm changes the key
+    other_fp = FormPack(schemas, 'Other title', xform_cache=xform_cache)
+    assert 'Other title' in other_fp[0].to_xml()
+    assert len(xform_cache) == 2
+    image_schema = {
+        'version': 'v1',
+        'id_string': 'photos',
+        'content': {
+            'survey': [{'type': 'image', 'name': 'photo', 'label': 'Photo'}]
+        },
+    }
+    xml = FormPack(image_schema, title, xform_cache=xform_cache)[0].to_xml()
+    other_xml = FormPack(
+        image_schema,
+        title,
+        xform_cache=xform_cache,
+        default_image_max_pixels=640,
+    )[0].to_xml()
+    assert '640' in other_xml
+    assert '640' not in xml
+    assert len(xform_cache) == 4
+
+    # Versions without a title never get a cached XForm
+    fp.title = fp[0].title = None
+    with pytest.raises(ValueError):
+        fp[0].to_xml()
+    fp.title = fp[0].title = title
+
+    # Form packs do not share their XForms unless given the same cache
+    xml = FormPack(schemas, title)[0].to_xml()
+    assert FormPack(schemas, title)[0].to_xml() is not xml
+
+    # Form packs without a cache compile every time
+    fp = FormPack(schemas, title)
+    fp.xform_cache = None
+    xml = fp[0].to_xml()
+    assert fp[0].to_xml() == xml
+    assert fp[0].to_xml() is not xml
+
+    small_cache = XFormCache(maxsize=1)
+    fp = FormPack(schemas, title, xform_cache=small_cache)
+    fp[0].to_xml()
+    fp[1].to_xml()
+    assert len(small_cache) == 1
+
+
+def test_merged_fields_share_merged_choice_lists():
+    def _version(version, choice_names):
+        return {
+            'version': version,
+            'content': {
+                'survey': [
+                    {'type': 'select_one colors', 'name': name, 'label': name}
+                    for name in ('first', 'second', 'third')
+                ],
+                'choices': [
+                    {'list_name': 'colors', 'name': name, 'label': name}
+                    for name in choice_names
+                ],
+            },
+        }
+
+    fp = FormPack(
+        [
+            _version('v1', ['red']),
+            _version('v2', ['red', 'blue']),
+            _version('v3', ['red', 'blue']),
+        ]
+    )
+    shared_choice = fp['v3'].sections['Submissions'].fields['first'].choice
+    # Identical lists are not merged at all
+    fields = fp.get_fields_for_versions(['v2', 'v3'])
+    assert {id(field.choice) for field in fields} == {id(shared_choice)}
+
+    fields = fp.get_fields_for_versions(fp.versions)
+    merged_choice = fields[0].choice
+    assert list(merged_choice.options) == ['red', 'blue']
+    assert all(field.choice is merged_choice for field in fields)
+    assert merged_choice is not shared_choice
+    assert list(shared_choice.options) == ['red', 'blue']
+
+
+def test_cached_form_packs_can_be_pickled():
+    def _version(version, choice_names):
+        return {
+            'version': version,
+            'content': {
+                'survey': [
+                    {'type': 'select_one colors', 'name': 'q1', 'label': 'Q1'}
+                ],
+                'choices': [
+                    {'list_name': 'colors', 'name': name, 'label': name}
+                    for name in choice_names
+                ],
+            },
+        }
+
+    fp = FormPack([_version('v1', ['red']), _version('v2', ['blue'])])
+    fields = fp.get_fields_for_versions(fp.versions)
+    assert fp._merged_choices
+
+    fp_copy = pickle.loads(pickle.dumps(fp))
+    fields_copy = fp_copy.get_fields_for_versions(fp_copy.versions)
+    assert list(fields_copy[0].choice.options) == ['red', 'blue']
+    assert fp_copy._fields_cache.maxsize == fp._fields_cache.maxsize
+
+    # Merged choice lists are forgotten along with the merged fields
+    fp.load_version(_version('v3', ['green']))
+    assert not fp._merged_choices
+    assert list(fp.get_fields_for_versions(fp.versions)[0].choice.options) == [
+        'red',
+        'blue',
+        'green',
+    ]
+    assert list(fields[0].choice.options) == ['red', 'blue']
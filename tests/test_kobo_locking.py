@@ -125,6 +125,15 @@ class TestKoboLocking(TestCase):
             ][0]
             assert expected_restrictions == actual_restrictions
 
+    def test_get_kobo_locking_profiles_from_xls_and_xlsx(self):
+        path = 'tests/fixtures/xlsforms/library-locking-example.{}'
+        with open(path.format('xls'), 'rb') as f:
+            xls_locking_profiles = get_kobo_locking_profiles(f)
+        with open(path.format('xlsx'), 'rb') as f:
+            xlsx_locking_profiles = get_kobo_locking_profiles(f)
+        assert xls_locking_profiles
+        assert xls_locking_profiles == xlsx_locking_profiles
+
     def test_revert_kobo_lock_structure(self):
         expected_reverted_locking_profiles = [
             {'restriction': 'choice_add', 'core': 'locked', 'flex': 'locked'},
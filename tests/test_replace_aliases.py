@@ -186,3 +186,22 @@ def test_kobo_specific_names_handle_n_and_m_dash():
     assert kobo_specific_sub('kobo—something') == 'kobo--something'
     # normal
     assert kobo_specific_sub('kobo--something') == 'kobo--something'
+
+
+def test_survey_headers_replaced_in_order():
+    row = {
+        'kobo–score_choices': 'x',
+        'type': 'integer',
+        'bind::relevant': '${a}',
+        'name': 'b',
+        'bind::required': 'yes',
+    }
+    surv = {'survey': [row]}
+    replace_aliases(surv, in_place=True)
+    assert list(row.items()) == [
+        ('type', 'integer'),
+        ('name', 'b'),
+        ('required', 'yes'),
+        ('relevant', '${a}'),
+        ('kobo--score_choices', 'x'),
+    ]
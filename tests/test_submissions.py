@@ -1,7 +1,29 @@
 # coding: utf-8
+from io import BytesIO
+
+import pytest
+
 from formpack import FormPack
+from formpack.utils import iter_xml_submissions, parse_xmljson_to_data
 from .fixtures import build_fixture
 
+NESTED_REPEATS_XML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<data xmlns:jr="http://openrosa.org/javarosa" id="bird_nests" version="{}">
+  <start>2017-12-27T15:53:26.000-05:00</start>
+  <group_tree>
+    <What_kind_of_tree_is_this>pine</What_kind_of_tree_is_this>
+    <group_nest>
+      <How_high_above_the_ground_is_the_nest>13</How_high_above_the_ground_is_the_nest>
+      <group_egg><Describe_the_egg>brown</Describe_the_egg></group_egg>
+      <group_egg><Describe_the_egg>tan</Describe_the_egg></group_egg>
+    </group_nest>
+  </group_tree>
+  <group_tree>
+    <What_kind_of_tree_is_this/>
+  </group_tree>
+  <meta><instanceID>uuid:f16d9a3f</instanceID></meta>
+</data>'''
+
 
 def test_submission_counts_match():
     title, schemas, submissions = build_fixture('restaurant_profile')
@@ -16,3 +38,105 @@ def test_submission_counts_match():
         'rpV3': 2,
         'rpV4': 4,
     }
+
+
+def test_load_submissions_from_xml():
+    title, schemas, submissions = build_fixture('nested_grouped_repeatable')
+    fp = FormPack(schemas, title, id_string='bird_nests')
+    version = fp[0]
+    xml = NESTED_REPEATS_XML.replace(b'{}', version.id.encode())
+    (submission,) = version.load_submissions_xml(BytesIO(xml))
+    assert submission == {
+        'start': '2017-12-27T15:53:26.000-05:00',
+        'group_tree': [
+            {
+                'group_tree/What_kind_of_tree_is_this': 'pine',
+                'group_tree/group_nest': [
+                    {
+                        'group_tree/group_nest/'
+                        'How_high_above_the_ground_is_the_nest': '13',
+                        'group_tree/group_nest/group_egg': [
+                            {
+                                'group_tree/group_nest/group_egg/'
+                                'Describe_the_egg': 'brown'
+                            },
+                            {
+                                'group_tree/group_nest/group_egg/'
+                                'Describe_the_egg': 'tan'
+                            },
+                        ],
+                    }
+                ],
+            },
+            {},
+        ],
+        'meta/instanceID': 'uuid:f16d9a3f',
+        '__version__': version.id,
+    }
+
+    # Submissions can be exported as they are read
+    export = fp.export(versions=version.id).to_dict(
+        fp.load_submissions_xml(xml, version=version.id)
+    )
+    assert export['group_egg']['data'] == [
+        ['brown', 'group_nest', 1],
+        ['tan', 'group_nest', 1],
+    ]
+
+    with pytest.raises(ValueError):
+        list(version.load_submissions_xml(xml.replace(b'bird_nests', b'x')))
+    with pytest.raises(ValueError):
+        list(fp[1].load_submissions_xml(xml))
+
+
+def test_iter_xml_submissions_of_several_instances():
+    instances = b''.join(
+        b'<data id="x"><q>%d</q><r><s>%d</s></r></data>' % (i, i)
+        for i in range(3)
+    )
+    submissions = iter_xml_submissions(
+        b'<instances>%s</instances>' % instances,
+        repeat_paths=['r'],
+        instance_tag='data',
+    )
+    assert list(submissions) == [
+        ({'id': 'x'}, {'q': str(i), 'r': [{'r/s': str(i)}]}) for i in range(3)
+    ]
+
+
+def test_parse_xmljson_to_data():
+    xmljson = {
+        'tag': 'data',
+        'children': [
+            {'tag': 'q1', 'text': 'a'},
+            {
+                'tag': 'grp',
+                'children': [{'tag': 'q2', 'text': 'b'}, {'tag': 'q3'}],
+            },
+            {'tag': 'q4', 'text': 'c', 'children': []},
+        ],
+    }
+    expected = [
+        ('/data/q1', 'a'),
+        ('/data/grp/q2', 'b'),
+        ('/data/grp/q3', None),
+        ('/data/q4', 'c'),
+    ]
+    assert list(parse_xmljson_to_data(xmljson)) == expected
+    # Nothing is accumulated from one call to the next
+    assert list(parse_xmljson_to_data(xmljson)) == expected
+    assert list(parse_xmljson_to_data(xmljson, ['root'])) == [
+        ('/root/' + path[1:], value) for path, value in expected
+    ]
+
+
+def test_parse_deeply_nested_xmljson_to_data():
+    depth = 5000
+    xmljson = {'tag': 'leaf', 'text': 'deep'}
+    for i in range(depth):
+        xmljson = {'tag': f'g{i}', 'children': [xmljson]}
+
+    ((path, value),) = parse_xmljson_to_data(xmljson)
+    assert value == 'deep'
+    assert path.count('/') == depth + 1
+    assert path.endswith('/g1/g0/leaf')
@@ -0,0 +1,241 @@
+# coding: utf-8
+import json
+import math
+import random
+import statistics
+from collections import Counter
+
+import pytest
+
+from formpack.utils.accumulators import (
+    ApproximateNumericAccumulator,
+    ChoiceAccumulator,
+    FrequencyAccumulator,
+    HeavyHittersAccumulator,
+    NumericAccumulator,
+    SplitAccumulator,
+    accumulator_from_dict,
+)
+
+DATASETS = [
+    [1, 2, 2, 2, 1],
+    [10, 20, 30],
+    [7],
+    [3, 1, 4, 1, 5, 9, 2, 6],
+    [1.0, 2.0, 3.0],
+    [0.1, 0.2, 0.2, 1.7, -3.25, 12.5],
+]
+
+
+@pytest.mark.parametrize('data', DATASETS)
+def test_numeric_accumulator_matches_statistics_module(data):
+    accumulator = NumericAccumulator()
+    for value in data:
+        accumulator.add((value,))
+
+    mean = statistics.mean(data)
+    assert accumulator.mean() == mean
+    assert type(accumulator.mean()) is type(mean)
+    assert accumulator.median() == statistics.median(data)
+    if len(data) > 1:
+        assert accumulator.stdev(xbar=mean) == statistics.stdev(data, mean)
+    else:
+        with pytest.raises(statistics.StatisticsError):
+            accumulator.stdev(xbar=mean)
+
+
+def test_numeric_accumulator_mode():
+    accumulator = NumericAccumulator()
+    with pytest.raises(statistics.StatisticsError):
+        accumulator.mean()
+
+    for value in (1, 2, 2, 3):
+        accumulator.add((value,))
+    assert accumulator.mode() == 2
+
+    accumulator.add((3,))
+    with pytest.raises(statistics.StatisticsError):
+        accumulator.mode()
+
+
+def test_choice_accumulator_keeps_first_appearance_order():
+    choice = ChoiceAccumulator(['a', 'b', 'c'])
+    frequency = FrequencyAccumulator()
+    for values in (('c',), ('b', 'c'), ('unknown',), ('b',), ('a',)):
+        choice.add(values)
+        frequency.add(values)
+    choice.add_missing()
+
+    assert choice.provided == 5
+    assert choice.not_provided == 1
+    assert choice.items() == list(frequency.items())
+    assert choice.most_common() == frequency.most_common()
+    assert choice.most_common(3) == [('c', 2), ('b', 2), ('unknown', 1)]
+
+
+@pytest.mark.parametrize(
+    'accumulator_class',
+    [FrequencyAccumulator, ChoiceAccumulator, NumericAccumulator],
+)
+def test_merged_accumulators_match_single_accumulator(accumulator_class):
+    answers = [(3,), (1, 2), (2,), (5,), (1,), (2,), (4, 3)]
+
+    single = accumulator_class()
+    for values in answers:
+        single.add(values)
+
+    first = accumulator_class()
+    second = accumulator_class()
+    for values in answers[:3]:
+        first.add(values)
+    for values in answers[3:]:
+        second.add(values)
+    second.add_missing()
+    single.add_missing()
+
+    second = accumulator_from_dict(json.loads(json.dumps(second.to_dict())))
+    merged = first.merge(second)
+
+    assert merged.provided == single.provided
+    assert merged.not_provided == single.not_provided
+    assert list(merged.items()) == list(single.items())
+
+
+def test_merged_numeric_accumulators_match_single_accumulator():
+    random.seed(42)
+    data = [round(random.uniform(-100, 100), 2) for _ in range(1000)]
+    data += [random.randint(-100, 100) for _ in range(1000)]
+
+    single = NumericAccumulator()
+    first = NumericAccumulator()
+    second = NumericAccumulator()
+    for i, value in enumerate(data):
+        single.add((value,))
+        (first if i < 1500 else second).add((value,))
+    second = accumulator_from_dict(json.loads(json.dumps(second.to_dict())))
+    merged = first.merge(second)
+
+    mean = statistics.mean(data)
+    for accumulator in (single, merged):
+        assert accumulator.mean() == mean
+        assert accumulator.stdev() == pytest.approx(
+            statistics.stdev(data), rel=1e-15
+        )
+
+
+def test_numeric_accumulator_non_finite_values():
+    accumulator = NumericAccumulator()
+    for value in (1.5, float('inf'), 2):
+        accumulator.add((value,))
+
+    assert accumulator.mean() == float('inf')
+    assert math.isnan(accumulator.stdev())
+
+
+def test_merge_accumulators_of_different_types():
+    with pytest.raises(TypeError):
+        FrequencyAccumulator().merge(NumericAccumulator())
+
+
+def test_heavy_hitters_accumulator_error_bounds():
+    random.seed(42)
+    data = [int(random.paretovariate(1.2)) for _ in range(20000)]
+    counts = Counter(data)
+
+    single = HeavyHittersAccumulator(sketch_size=20)
+    first = HeavyHittersAccumulator(sketch_size=20)
+    second = HeavyHittersAccumulator(sketch_size=20)
+    for i, value in enumerate(data):
+        single.add((value,))
+        (first if i < 12000 else second).add((value,))
+    merged = first.merge(second)
+
+    for accumulator in (single, merged):
+        error = accumulator.get_error_bounds()['frequency_error']
+        assert error <= len(data) / 21
+        assert len(accumulator.items()) <= 20
+        for value, count in accumulator.items():
+            assert counts[value] - error <= count <= counts[value]
+        assert accumulator.most_common(1)[0][0] == counts.most_common(1)[0][0]
+
+
+def test_approximate_numeric_accumulator_error_bounds():
+    random.seed(42)
+    data = [random.gauss(0, 1) for _ in range(20000)]
+    ranks = {value: rank for rank, value in enumerate(sorted(data))}
+
+    single = ApproximateNumericAccumulator(sketch_size=50)
+    first = ApproximateNumericAccumulator(sketch_size=50)
+    second = ApproximateNumericAccumulator(sketch_size=50)
+    for i, value in enumerate(data):
+        single.add((value,))
+        (first if i < 7000 else second).add((value,))
+    merged = first.merge(second)
+
+    for accumulator in (single, merged):
+        rank_error = accumulator.get_error_bounds()['median_rank_error']
+        assert abs(ranks[accumulator.median()] - len(data) // 2) <= rank_error
+        assert accumulator.mean() == pytest.approx(statistics.mean(data))
+        assert accumulator.stdev() == pytest.approx(statistics.stdev(data))
+        with pytest.raises(statistics.StatisticsError):
+            # All values are distinct
+            accumulator.mode()
+
+    restored = accumulator_from_dict(json.loads(json.dumps(single.to_dict())))
+    assert restored.median() == single.median()
+
+
+def test_approximate_numeric_accumulator_rank_error_is_capped():
+    random.seed(42)
+    data = [random.gauss(0, 1) for _ in range(5000)]
+
+    single = ApproximateNumericAccumulator(sketch_size=3)
+    first = ApproximateNumericAccumulator(sketch_size=3)
+    second = ApproximateNumericAccumulator(sketch_size=3)
+    for i, value in enumerate(data):
+        single.add((value,))
+        (first if i < 2000 else second).add((value,))
+    merged = first.merge(second)
+
+    for accumulator in (single, merged):
+        rank_error = accumulator.get_error_bounds()['median_rank_error']
+        assert 0 < rank_error <= len(data)
+
+
+def test_merged_split_accumulators_share_splitters():
+    first = SplitAccumulator()
+    get_index = first.splitter_index.get_index
+    first.add(('a',), get_index('x'))
+    first.add(('b',), get_index(None))
+
+    second = SplitAccumulator()
+    get_index = second.splitter_index.get_index
+    second.add(('b',), get_index('y'))
+    second.add(('a',), get_index('x'))
+    second.add_missing(get_index(None))
+    second = accumulator_from_dict(json.loads(json.dumps(second.to_dict())))
+
+    merged = first.merge(second)
+    assert merged.provided == 4
+    assert merged.not_provided == 2
+    assert list(merged.items()) == [
+        ('a', {'x': 2}),
+        ('b', {'y': 1}),
+        (None, {}),
+    ]
+
+
+def test_split_accumulator_numeric_accumulators():
+    accumulator = SplitAccumulator()
+    get_index = accumulator.splitter_index.get_index
+    for value, splitter in ((3, 'y'), (1, 'x'), (3, 'x'), (2, None), (5, 'y')):
+        accumulator.add((value,), get_index(splitter))
+    accumulator.add_missing(get_index('z'))
+
+    numeric = accumulator.get_numeric_accumulators()
+    assert [splitter for splitter, _ in numeric] == ['y', 'x']
+    assert [dict(acc.items()) for _, acc in numeric] == [
+        {3: 1, 5: 1},
+        {1: 1, 3: 1},
+    ]
+    assert [acc.mean() for _, acc in numeric] == [4, 2]
@@ -0,0 +1,47 @@
+# coding: utf-8
+from datetime import date, datetime
+
+import pytest
+from dateutil import parser, tz
+
+from formpack.utils.dates import parse_datetime, parse_iso8601
+
+VALUES = [
+    '2016-03-14',
+    '2016-03-14T14:15:48.000-04:00',
+    '2016-03-14T14:15:48.123+05:30',
+    '2017-12-27T20:58:25',
+    '2017-12-27T20:58:25.1234567',
+    '2017-12-27 20:58',
+    '2018-01-01T00:00:00Z',
+    '2018-01-01T00:00:00+00:00',
+    '2018-01-01T10:11:12,5-0300',
+    '2018-01-01T10:11:12-03',
+    'March 14, 2016',
+    '14/03/2016',
+]
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_parse_datetime_matches_dateutil(value):
+    expected = parser.parse(value)
+    parsed = parse_datetime(value)
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+    # Memoized
+    assert parse_datetime(value) is parsed
+
+
+@pytest.mark.parametrize('value', ['', 'not a date', '2021-02-30'])
+def test_parse_datetime_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_datetime(value)
+
+
+def test_parse_iso8601():
+    assert parse_iso8601('2016-03-14') == date(2016, 3, 14)
+    assert parse_iso8601('2016-03-14T14:15:48.000-04:00') == datetime(
+        2016, 3, 14, 14, 15, 48, tzinfo=tz.tzoffset(None, -4 * 3600)
+    )
+    with pytest.raises(ValueError):
+        parse_iso8601('14/03/2016')
@@ -1,5 +1,6 @@
 # coding: utf-8
 from collections import OrderedDict
+from copy import deepcopy
 
 import pytest
 
@@ -420,6 +421,10 @@ def test_translated_col_list():
         ['c1', 'c2', 'c3'], [None], ['c3']
     )
 
+    assert ['c1::l1', 'c1::l2', 'c2', 'c3::l1', 'c3::l2'] == (
+        translated_col_list(['c1', 'c2', 'c3'], ['l1', 'l2'], ['c1', 'c3'])
+    )
+
     with pytest.raises(ValueError) as err:
         translated_col_list(['c1', 'c2', 'c3'], [], ['c3'])
 
@@ -449,6 +454,51 @@ def test_flatten_to_spreadsheet_content():
     assert list(_c) == ['survey', 'choices', 'settings']
 
 
+def test_flatten_leaves_content_untouched():
+    content = {
+        'survey': [
+            {
+                'type': 'select_one',
+                'select_from_list_name': 'xyz',
+                'name': 'q1',
+                'label': ['lang1'],
+                'tags': ['hxl:#tag', 'other'],
+            },
+        ],
+        'choices': [{'list_name': 'xyz', 'name': 'x', 'label': ['X']}],
+        'settings': {'xyz': 'abc'},
+        'translated': ['label'],
+        'translations': ['lang1'],
+    }
+    content_copy = deepcopy(content)
+    flattened = flatten_content(content)
+    assert flattened['survey'][0]['type'] == 'select_one xyz'
+    spreadsheet = flatten_to_spreadsheet_content(content)
+    assert spreadsheet['choices'][0]['label::lang1'] == 'X'
+    assert spreadsheet['settings'][0]['xyz'] == 'abc'
+    assert content == content_copy
+
+
+def test_flatten_case_leaves_content_untouched():
+    content = {
+        'survey': [
+            {
+                'type': 'calculate',
+                'name': 'c1',
+                'calculation': [
+                    {'@case': [[{'@lookup': 'q1'}, "'yes'"], "'no'"]}
+                ],
+            },
+        ],
+    }
+    content_copy = deepcopy(content)
+    flattened = flatten_content(content)
+    assert flattened['survey'][0]['calculation'] == "if(${q1}, 'yes', 'no')"
+    assert content == content_copy
+    assert flatten_content(content) == flattened
+    assert content == content_copy
+
+
 def test_flatten_tags_util_method():
     assert _flatten_tags({'tags': ['a']})['tags'] == 'a'
     assert _flatten_tags({'tags': ['a', 'b']})['tags'] == 'a b'
@@ -517,6 +567,16 @@ def test_col_order():
         ]
     ) == ['type', 'name', 'label']
 
+    # Consecutive matching columns are all ordered
+    assert _order_cols(
+        ['hint', 'label', 'label::en', 'relevant', 'name', 'type']
+    ) == ['type', 'name', 'label', 'label::en', 'hint', 'relevant']
+    assert _order_cols(['label', 'name', 'list_name'], 'choices') == [
+        'list_name',
+        'name',
+        'label',
+    ]
+
 
 def test_flatten_translated_label_with_xpath():
     _c = flatten_content(
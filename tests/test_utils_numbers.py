@@ -0,0 +1,44 @@
+# coding: utf-8
+import pytest
+
+from formpack.utils.numbers import _get_number, try_get_number, try_get_numbers
+
+VALUES = [
+    '0',
+    '-12',
+    '+7',
+    '0012',
+    '1' * 30,
+    '9' * 5000,
+    '3.14',
+    '-.5',
+    '2.',
+    '1e5',
+    '-1.5E-3',
+    '1e400',
+    'inf',
+    '-Infinity',
+    'nan',
+    ' 42 ',
+    '1_000',
+    '١٢',
+    '²',
+    '',
+    'yes',
+    '12 13',
+    '1.2.3',
+    5,
+    2.5,
+]
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_try_get_number_matches_int_then_float(value):
+    expected = _get_number(value)
+    number = try_get_number(value)
+    assert number == expected
+    assert type(number) is type(expected)
+
+
+def test_try_get_numbers():
+    assert try_get_numbers(['45.5', '-73', 'x', '']) == [45.5, -73, 'x', '']
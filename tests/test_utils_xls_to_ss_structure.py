@@ -1,6 +1,12 @@
 from collections import OrderedDict
 
-from formpack.utils.xls_to_ss_structure import xls_to_dicts, xlsx_to_dicts
+from formpack.utils.xls_to_ss_structure import (
+    iter_xls_sheets,
+    iter_xlsx_sheets,
+    xls_to_lists,
+    xls_to_dicts,
+    xlsx_to_dicts,
+)
 
 
 def test_xls_to_dicts():
@@ -261,3 +267,57 @@ def test_xlsx_to_dicts():
         ]
     )
     assert data == expected_result
+
+
+def test_dicts_of_some_sheets():
+    sheet_names = ['settings', 'kobo--locking-profiles']
+    with open(
+        'tests/fixtures/xlsforms/library-locking-example.xls', 'rb'
+    ) as f:
+        xls_data = xls_to_dicts(f, sheet_names=sheet_names)
+    with open(
+        'tests/fixtures/xlsforms/library-locking-example.xlsx', 'rb'
+    ) as f:
+        xlsx_data = xlsx_to_dicts(f, sheet_names=sheet_names)
+    assert list(xls_data) == list(xlsx_data) == sheet_names
+    assert xls_data == xlsx_data
+
+
+def test_iter_xlsx_sheets():
+    with open(
+        'tests/fixtures/xlsforms/library-locking-example.xlsx', 'rb'
+    ) as f:
+        expected = xlsx_to_dicts(f)
+        f.seek(0)
+        sheets = iter_xlsx_sheets(f)
+        sheet_name, rows = next(sheets)
+        assert sheet_name == 'survey'
+        assert next(rows) == expected['survey'][0]
+        assert list(rows) == expected['survey'][1:]
+        assert [name for name, rows in sheets] == list(expected)[1:]
+
+
+def test_xlsx_to_dicts_ignores_stale_dimensions():
+    # The survey sheet of this file declares a `<dimension ref="A1"/>`
+    with open('tests/fixtures/xlsforms/stale-dimension.xlsx', 'rb') as f:
+        data = xlsx_to_dicts(f)
+    assert data == {
+        'survey': [
+            {'type': 'text', 'name': 'q1', 'label': 'Q1'},
+            {'type': 'integer', 'name': 'q2', 'label': 'Q2'},
+        ]
+    }
+
+
+def test_iter_xls_sheets():
+    with open(
+        'tests/fixtures/xlsforms/library-locking-example.xls', 'rb'
+    ) as f:
+        expected = xls_to_lists(f)
+        f.seek(0)
+        sheet_names = ['settings', 'survey']
+        sheets = list(iter_xls_sheets(f, sheet_names=sheet_names))
+        assert sheets == [
+            (name, rows) for name, rows in expected.items()
+            if name in sheet_names
+        ]
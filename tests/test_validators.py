@@ -1,7 +1,12 @@
 # coding: utf-8
 import json
 
-from formpack.validators import validate_row
+import jsonschema
+
+import pytest
+
+from formpack.errors import ContentValidationError, SchemaError
+from formpack.validators import ROW_SCHEMA, validate_content, validate_row
 
 
 def test_row_validator():
@@ -61,3 +66,43 @@ def test_row_validator_fails():
             raise AssertionError(
                 'row passed validator: {}'.format(json.dumps(row))
             )
+
+
+def test_content_validator_reports_all_rows():
+    content = {
+        'survey': [
+            {'type': 'text', 'name': 'x', 'label': 'z'},
+            {'type': 'select_one', 'name': 'x', 'label': 'z'},
+            {'type': 'end_group'},
+            {'type': 'text', 'label': 'x'},
+            {'type': 'unknown_type', 'name': 'x'},
+        ]
+    }
+    with pytest.raises(ContentValidationError) as err:
+        validate_content(content)
+    assert [row_number for row_number, _ in err.value.errors] == [1, 3, 4]
+    assert str(err.value).startswith('row 1: ')
+
+    valid_rows = [content['survey'][0], content['survey'][2]]
+    validate_content({'survey': valid_rows})
+
+
+def test_content_validator_raises_jsonschema_errors():
+    rows = [
+        {'type': 'text', 'name': 'x', 'label': 'z'},
+        {'type': 'text', 'name': 'y', 'label': 1},
+        {'type': 'select_one', 'name': 'x', 'label': 'z'},
+    ]
+    with pytest.raises(jsonschema.ValidationError) as err:
+        validate_content({'survey': rows})
+    with pytest.raises(jsonschema.ValidationError) as expected:
+        jsonschema.validate(rows[1], ROW_SCHEMA)
+
+    assert isinstance(err.value, ContentValidationError)
+    assert err.value.message == expected.value.message
+    assert err.value.path == expected.value.path
+    assert err.value.validator == expected.value.validator
+    assert err.value.instance == rows[1]
+    assert err.value.schema_path == expected.value.schema_path
+    assert err.value.validator_value == expected.value.validator_value
+    assert not isinstance(err.value, SchemaError)